@@ -8,16 +8,6 @@ from topologic import Vertex, Edge, Wire, Face, Shell, Cell, CellComplex, Cluste
 
 from . import Replication, CellByFaces
 
-# From https://stackabuse.com/python-how-to-flatten-list-of-lists/
-def flatten(element):
-	returnList = []
-	if isinstance(element, list) == True:
-		for anItem in element:
-			returnList = returnList + flatten(anItem)
-	else:
-		returnList = [element]
-	return returnList
-
 def processItem(item):
 	wires, tolerance = item
 	faces = [topologic.Face.ByExternalBoundary(wires[0])]
@@ -81,17 +71,7 @@ class SvCellByLoft(bpy.types.Node, SverchCustomTreeNode):
 		toleranceList = self.inputs['Tolerance'].sv_get(deepcopy=True)
 		toleranceList = Replication.flatten(toleranceList)
 		inputs = [wiresList, toleranceList]
-		if ((self.Replication) == "Trim"):
-			inputs = Replication.trim(inputs)
-			inputs = Replication.transposeList(inputs)
-		elif ((self.Replication) == "Iterate"):
-			inputs = Replication.iterate(inputs)
-			inputs = Replication.transposeList(inputs)
-		elif ((self.Replication) == "Repeat"):
-			inputs = Replication.repeat(inputs)
-			inputs = Replication.transposeList(inputs)
-		elif ((self.Replication) == "Interlace"):
-			inputs = list(Replication.interlace(inputs))
+		inputs = Replication.replicateInputs(inputs, self.Replication)
 		outputs = []
 		for anInput in inputs:
 			outputs.append(processItem(anInput))
@@ -5,16 +5,7 @@ from sverchok.data_structure import updateNode
 
 import topologic
 from topologic import Vertex, Edge, Wire, Face, Shell, Cell, CellComplex, Cluster, Topology
-
-# From https://stackabuse.com/python-how-to-flatten-list-of-lists/
-def flatten(element):
-	returnList = []
-	if isinstance(element, list) == True:
-		for anItem in element:
-			returnList = returnList + flatten(anItem)
-	else:
-		returnList = [element]
-	return returnList
+from . import Replication
 
 def list_level_iter(lst, level, _current_level: int= 1):
     """
@@ -67,11 +58,11 @@ class SvCellByShell(bpy.types.Node, SverchCustomTreeNode):
 		if not any(socket.is_linked for socket in self.outputs):
 			return
 		shellList = self.inputs['Shell'].sv_get(deepcopy=False)
-		level = flatten(self.inputs['Level'].sv_get(deepcopy=False, default= 1))
+		level = Replication.flatten(self.inputs['Level'].sv_get(deepcopy=False, default= 1))
 		if isinstance(level,list):
 			level = int(level[0])
 		shellList = list(list_level_iter(shellList,level))
-		shellList = [flatten(t) for t in shellList]
+		shellList = [Replication.flatten(t) for t in shellList]
 		outputs = []
 		for t in range(len(shellList)):
 			outputs.append(recur(shellList[t]))
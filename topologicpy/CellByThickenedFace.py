@@ -5,16 +5,7 @@ from sverchok.data_structure import updateNode
 
 import topologic
 from topologic import Vertex, Edge, Wire, Face, Shell, Cell, CellComplex, Cluster, Topology
-
-# From https://stackabuse.com/python-how-to-flatten-list-of-lists/
-def flatten(element):
-	returnList = []
-	if isinstance(element, list) == True:
-		for anItem in element:
-			returnList = returnList + flatten(anItem)
-	else:
-		returnList = [element]
-	return returnList
+from . import Replication
 
 def processItem(item):
 	face = item[0]
@@ -83,15 +74,15 @@ class SvCellByThickenedFace(bpy.types.Node, SverchCustomTreeNode):
 		if not any(socket.is_linked for socket in self.outputs):
 			return
 		faceList = self.inputs['Face'].sv_get(deepcopy=False)
-		faceList = flatten(faceList)
+		faceList = Replication.flatten(faceList)
 		thicknessList = self.inputs['Thickness'].sv_get(deepcopy=False)
-		thicknessList = flatten(thicknessList)
+		thicknessList = Replication.flatten(thicknessList)
 		bothSidesList = self.inputs['Both Sides'].sv_get(deepcopy=False)
-		bothSidesList = flatten(bothSidesList)
+		bothSidesList = Replication.flatten(bothSidesList)
 		reverseList = self.inputs['Reverse'].sv_get(deepcopy=False)
-		reverseList = flatten(reverseList)
+		reverseList = Replication.flatten(reverseList)
 		toleranceList = self.inputs['Tolerance'].sv_get(deepcopy=False)
-		toleranceList = flatten(toleranceList)
+		toleranceList = Replication.flatten(toleranceList)
 		matchLengths([faceList, thicknessList, bothSidesList, reverseList, toleranceList])
 		inputs = zip(faceList, thicknessList, bothSidesList, reverseList, toleranceList)
 		outputs = []
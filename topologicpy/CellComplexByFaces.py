@@ -6,16 +6,7 @@ from sverchok.data_structure import updateNode
 import topologic
 import warnings
 import time
-
-# From https://stackabuse.com/python-how-to-flatten-list-of-lists/
-def flatten(element):
-	returnList = []
-	if isinstance(element, list) == True:
-		for anItem in element:
-			returnList = returnList + flatten(anItem)
-	else:
-		returnList = [element]
-	return returnList
+from . import Replication
 
 def list_level_iter(lst, level, _current_level: int= 1):
     """
@@ -85,12 +76,12 @@ class SvCellComplexByFaces(bpy.types.Node, SverchCustomTreeNode):
 			self.outputs['CellComplex'].sv_set([])
 			return
 		faceList = self.inputs['Faces'].sv_get(deepcopy=True)
-		level = flatten(self.inputs['Level'].sv_get(deepcopy=False, default= 1))
+		level = Replication.flatten(self.inputs['Level'].sv_get(deepcopy=False, default= 1))
 		tol = self.inputs['Tol'].sv_get(deepcopy=True, default=0.0001)[0][0]
 		if isinstance(level,list):
 			level = int(level[0])
 		faceList = list(list_level_iter(faceList,level))
-		faceList = [flatten(t) for t in faceList]
+		faceList = [Replication.flatten(t) for t in faceList]
 		outputs = []
 		for t in range(len(faceList)):
 			outputs.append(processItem([faceList[t], tol]))
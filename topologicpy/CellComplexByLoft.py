@@ -7,16 +7,6 @@ import topologic
 from topologic import Vertex, Edge, Wire, Face, Shell, Cell, CellComplex, Cluster, Topology
 from . import Replication, CellComplexByFaces
 
-# From https://stackabuse.com/python-how-to-flatten-list-of-lists/
-def flatten(element):
-	returnList = []
-	if isinstance(element, list) == True:
-		for anItem in element:
-			returnList = returnList + flatten(anItem)
-	else:
-		returnList = [element]
-	return returnList
-
 def processItem(item):
 	wires, tolerance = item 
 	faces = [topologic.Face.ByExternalBoundary(wires[0])]
@@ -82,17 +72,7 @@ class SvCellComplexByLoft(bpy.types.Node, SverchCustomTreeNode):
 			wiresList = [wiresList]
 		toleranceList = Replication.flatten(toleranceList)
 		inputs = [wiresList, toleranceList]
-		if ((self.Replication) == "Trim"):
-			inputs = Replication.trim(inputs)
-			inputs = Replication.transposeList(inputs)
-		elif ((self.Replication) == "Iterate"):
-			inputs = Replication.iterate(inputs)
-			inputs = Replication.transposeList(inputs)
-		elif ((self.Replication) == "Repeat"):
-			inputs = Replication.repeat(inputs)
-			inputs = Replication.transposeList(inputs)
-		elif ((self.Replication) == "Interlace"):
-			inputs = list(Replication.interlace(inputs))
+		inputs = Replication.replicateInputs(inputs, self.Replication)
 		outputs = []
 		for anInput in inputs:
 			outputs.append(processItem(anInput))
@@ -1,16 +1,7 @@
 import topologic
+import numpy as np
 from numpy import arctan, pi, signbit, arctan2, rad2deg
-from topologicpy import FaceNormalAtParameters, FaceAngle
-
-# From https://stackabuse.com/python-how-to-flatten-list-of-lists/
-def flatten(element):
-	returnList = []
-	if isinstance(element, list) == True:
-		for anItem in element:
-			returnList = returnList + flatten(anItem)
-	else:
-		returnList = [element]
-	return returnList
+from topologicpy import FaceNormalAtParameters, FaceAngle, TopologyAttributeCache
 
 # DEFINITIONS
 def compass_angle(p1, p2):
@@ -45,118 +36,106 @@ def getApertures(topology):
 		apTopologies.append(topologic.Aperture.Topology(aperture))
 	return apTopologies
 
-def processItem(item):
-	externalVerticalFaces = []
-	internalVerticalFaces = []
-	topHorizontalFaces = []
-	bottomHorizontalFaces = []
-	internalHorizontalFaces = []
-	externalInclinedFaces = []
-	internalInclinedFaces = []
-	externalVerticalApertures = []
-	internalVerticalApertures = []
-	topHorizontalApertures = []
-	bottomHorizontalApertures = []
-	internalHorizontalApertures = []
-	externalInclinedApertures = []
-	internalInclinedApertures = []
+CATEGORIES = ["externalVertical", "internalVertical", "topHorizontal", "bottomHorizontal", "internalHorizontal", "externalInclined", "internalInclined"]
+COMPASS_EDGES = [22.5, 67.5, 112.5, 157.5, 202.5, 247.5, 292.5, 337.5]
+COMPASS_NAMES = np.array(["N", "NW", "W", "SW", "S", "SE", "E", "NE", "N"])
+RECORD_DTYPE = [("category", "i1"), ("compass", "U2"), ("compassAngle", "f8"), ("upAngle", "f8"), ("cells", "i4"), ("area", "f8"), ("apertureArea", "f8")]
 
+def faceData(item, computeAreas=True, cache=None):
+	"""
+	Extracts the normal, centroid height, number of adjacent cells, apertures and (optionally)
+	the face and aperture areas of every face of the input in a single pass. Normals, centroids,
+	apertures and areas are read through the input TopologyAttributeCache.AttributeCache when one
+	is given (e.g. TopologyAttributeCache.session).
+	"""
 	faces = []
 	_ = item.Faces(None, faces)
-	zList = []
-	for f in faces:
-		zList.append(f.Centroid().Z())
-	zMin = min(zList)
-	zMax = max(zList)
-	up = [0,0,1]
-	for aFace in faces:
-		ang, ang_str, color_str = faceAngleFromUp(aFace, up)
+	normals = np.empty((len(faces), 3))
+	zList = np.empty(len(faces))
+	cellCounts = np.empty(len(faces), dtype=np.int32)
+	areas = np.zeros(len(faces))
+	apertureAreas = np.zeros(len(faces))
+	faceApertures = []
+	for i, aFace in enumerate(faces):
+		# Hash the BREP once per face and reuse the key for every attribute
+		key = (TopologyAttributeCache.topologyKey(aFace) if cache is not None else None)
+		normals[i] = TopologyAttributeCache.normal(aFace, cache, key)
+		zList[i] = TopologyAttributeCache.centroid(aFace, cache, key).Z()
 		cells = []
-		aFace.Cells(item, cells)
-		n = len(cells)
-		if ang_str == "E" or ang_str == "W":
-			if n == 1:
-				externalVerticalFaces.append(aFace)
-				externalVerticalApertures.append(getApertures(aFace))
-			else:
-				internalVerticalFaces.append(aFace)
-				internalVerticalApertures.append(getApertures(aFace))
-		elif ang_str == "N":
-			if n == 1:
-				if abs(aFace.Centroid().Z() - zMin) < 0.0001:
-					bottomHorizontalFaces.append(aFace)
-					bottomHorizontalApertures.append(getApertures(aFace))
-				else:
-					topHorizontalFaces.append(aFace)
-					topHorizontalApertures.append(getApertures(aFace))
-			else:
-				internalHorizontalFaces.append(aFace)
-				internalHorizontalApertures.append(getApertures(aFace))
-		elif ang_str == "S":
-			if n == 1:
-				if abs(aFace.Centroid().Z() - zMax) < 0.0001:
-					topHorizontalFaces.append(aFace)
-					topHorizontalApertures.append(getApertures(aFace))
-				else:
-					bottomHorizontalFaces.append(aFace)
-					bottomHorizontalApertures.append(getApertures(aFace))
-			else:
-				internalHorizontalFaces.append(aFace)
-				internalHorizontalApertures.append(getApertures(aFace))
-		elif ang_str == "NW" or ang_str == "NE" or ang_str == "SW" or ang_str == "SE":
-			if n == 1:
-				externalInclinedFaces.append(aFace)
-				externalInclinedApertures.append(getApertures(aFace))
-			else:
-				internalInclinedFaces.append(aFace)
-				internalInclinedApertures.append(getApertures(aFace))
-	
+		_ = aFace.Cells(item, cells)
+		cellCounts[i] = len(cells)
+		apertures = TopologyAttributeCache.apertures(aFace, cache, key)
+		faceApertures.append(apertures)
+		if computeAreas:
+			areas[i] = TopologyAttributeCache.area(aFace, cache, key)
+			apertureAreas[i] = sum(TopologyAttributeCache.area(aperture, cache) for aperture in apertures)
+	return [faces, np.round(normals, 3), zList, cellCounts, faceApertures, areas, apertureAreas]
 
-	ex_ve_f = []
-	in_ve_f = []
-	to_ho_f = []
-	bo_ho_f = []
-	in_ho_f = []
-	ex_in_f = []
-	in_in_f = []
+def upAngles(normals, up):
+	# Vectorized FaceAngle.angle_between, in degrees rounded to 2 decimals
+	up = np.asarray(up, dtype=np.float64)
+	u1 = normals / np.linalg.norm(normals, axis=1)[:, None]
+	u2 = up / np.linalg.norm(up)
+	y = np.linalg.norm(u1 - u2, axis=1)
+	x = np.linalg.norm(u1 + u2, axis=1)
+	with np.errstate(divide="ignore", invalid="ignore"):
+		a0 = np.where(x == 0, 0, 2 * arctan(y / x))
+	return np.round(a0 * 180 / pi, 2)
 
-	ex_ve_a = []
-	in_ve_a = []
-	to_ho_a = []
-	bo_ho_a = []
-	in_ho_a = []
-	ex_in_a = []
-	in_in_a = []
+def compassAngles(normals, north):
+	# Vectorized compass_angle of the XY projection of the normals against north, in degrees
+	ang1 = arctan2(normals[:, 1], normals[:, 0])
+	ang2 = arctan2(north[1], north[0])
+	return rad2deg((ang1 - ang2) % (2 * pi))
 
-	if len(externalVerticalFaces) > 0:
-		ex_ve_f = flatten(externalVerticalFaces)
-	if len(internalVerticalFaces) > 0:
-		in_ve_f = flatten(internalVerticalFaces)
-	if len(topHorizontalFaces) > 0:
-		to_ho_f = flatten(topHorizontalFaces)
-	if len(bottomHorizontalFaces) > 0:
-		bo_ho_f = flatten(bottomHorizontalFaces)
-	if len(internalHorizontalFaces) > 0:
-		in_ho_f = flatten(internalHorizontalFaces)
-	if len(externalInclinedFaces) > 0:
-		ex_in_f = flatten(externalInclinedFaces)
-	if len(internalInclinedFaces) > 0:
-		in_in_f = flatten(internalInclinedFaces)
-
-	if len(externalVerticalApertures) > 0:
-		ex_ve_a = flatten(externalVerticalApertures)
-	if len(internalVerticalApertures) > 0:
-		in_ve_a = flatten(internalVerticalApertures)
-	if len(topHorizontalApertures) > 0:
-		to_ho_a = flatten(topHorizontalApertures)
-	if len(bottomHorizontalApertures) > 0:
-		bo_ho_a = flatten(bottomHorizontalApertures)
-	if len(internalHorizontalApertures) > 0:
-		in_ho_a = flatten(internalHorizontalApertures)
-	if len(externalInclinedFaces) > 0:
-		ex_in_a = flatten(externalInclinedApertures)
-	if len(internalInclinedApertures) > 0:
-		in_in_a = flatten(internalInclinedApertures)
-	return [ex_ve_f, in_ve_f, to_ho_f, bo_ho_f, in_ho_f, ex_in_f, in_in_f, ex_ve_a, in_ve_a, to_ho_a, bo_ho_a, in_ho_a, ex_in_a, in_in_a]
+def classify(normals, zList, cellCounts, up=[0,0,1]):
+	ang = upAngles(normals, up)
+	upward = np.abs(ang) < 11.25
+	downward = (~upward) & (np.abs(ang - 180) < 11.25)
+	vertical = (~upward) & (~downward) & (np.abs(ang - 90) < 11.25)
+	inclined = ~(upward | downward | vertical)
+	external = cellCounts == 1
+	if len(zList) > 0:
+		atBottom = np.abs(zList - zList.min()) < 0.0001
+		atTop = np.abs(zList - zList.max()) < 0.0001
+	else:
+		atBottom = atTop = np.zeros(0, dtype=bool)
+	category = np.full(len(zList), 6, dtype=np.int8)
+	category[vertical & external] = 0
+	category[vertical & ~external] = 1
+	category[(upward | downward) & ~external] = 4
+	category[upward & external & atBottom] = 3
+	category[upward & external & ~atBottom] = 2
+	category[downward & external & atTop] = 2
+	category[downward & external & ~atTop] = 3
+	category[inclined & external] = 5
+	return [category, ang]
 
+def processItemBatch(item, north=[0,1,0], computeAreas=True, cache=None):
+	"""
+	Decomposes the input in one extraction pass. Returns the same 14 lists as processItem, the
+	faces, the apertures of each face and a per-face record array aligned with the faces holding
+	the category index (into CATEGORIES), the compass bin, the angles, the number of adjacent
+	cells and the face and aperture areas.
+	"""
+	faces, normals, zList, cellCounts, faceApertures, areas, apertureAreas = faceData(item, computeAreas, cache)
+	category, upAngle = classify(normals, zList, cellCounts)
+	compassAngle = compassAngles(normals, north)
+	records = np.zeros(len(faces), dtype=RECORD_DTYPE)
+	records["category"] = category
+	records["compass"] = COMPASS_NAMES[np.searchsorted(COMPASS_EDGES, compassAngle, side="left")]
+	records["compassAngle"] = compassAngle
+	records["upAngle"] = upAngle
+	records["cells"] = cellCounts
+	records["area"] = areas
+	records["apertureArea"] = apertureAreas
+	faceLists = []
+	apertureLists = []
+	for c in range(len(CATEGORIES)):
+		indices = np.nonzero(category == c)[0]
+		faceLists.append([faces[i] for i in indices])
+		apertureLists.append([aperture for i in indices for aperture in faceApertures[i]])
+	return [faceLists + apertureLists, faces, faceApertures, records]
 
+def processItem(item):
+	return processItemBatch(item, computeAreas=False, cache=TopologyAttributeCache.session)[0]
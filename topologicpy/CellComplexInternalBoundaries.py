@@ -5,16 +5,7 @@ from sverchok.data_structure import updateNode
 
 import topologic
 import time
-
-# From https://stackabuse.com/python-how-to-flatten-list-of-lists/
-def flatten(element):
-	returnList = []
-	if isinstance(element, list) == True:
-		for anItem in element:
-			returnList = returnList + flatten(anItem)
-	else:
-		returnList = [element]
-	return returnList
+from . import Replication
 
 def processItem(item):
 	faces = []
@@ -40,11 +31,11 @@ class SvCellComplexInternalBoundaries(bpy.types.Node, SverchCustomTreeNode):
 			self.outputs['CellComplex'].sv_set([])
 			return
 		inputs = self.inputs['CellComplex'].sv_get(deepcopy=False)
-		inputs = flatten(inputs)
+		inputs = Replication.flatten(inputs)
 		outputs = []
 		for anInput in inputs:
 			outputs.append(processItem(anInput))
-		self.outputs['Faces'].sv_set(flatten(outputs))
+		self.outputs['Faces'].sv_set(Replication.flatten(outputs))
 
 def register():
 	bpy.utils.register_class(SvCellComplexInternalBoundaries)
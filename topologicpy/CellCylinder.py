@@ -147,17 +147,7 @@ class SvCellCylinder(bpy.types.Node, SverchCustomTreeNode):
 		dirZList = Replication.flatten(dirZList)
 		toleranceList = Replication.flatten(toleranceList)
 		inputs = [originList, radiusList, heightList, uSidesList, vSidesList, dirXList, dirYList, dirZList, toleranceList]
-		if ((self.Replication) == "Trim"):
-			inputs = Replication.trim(inputs)
-			inputs = Replication.transposeList(inputs)
-		elif ((self.Replication) == "Iterate"):
-			inputs = Replication.iterate(inputs)
-			inputs = Replication.transposeList(inputs)
-		elif ((self.Replication) == "Repeat"):
-			inputs = Replication.repeat(inputs)
-			inputs = Replication.transposeList(inputs)
-		elif ((self.Replication) == "Interlace"):
-			inputs = list(Replication.interlace(inputs))
+		inputs = Replication.replicateInputs(inputs, self.Replication)
 		outputs = []
 		for anInput in inputs:
 			outputs.append(processItem(anInput, self.originLocation))
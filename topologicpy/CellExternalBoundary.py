@@ -4,16 +4,7 @@ from sverchok.node_tree import SverchCustomTreeNode
 from sverchok.data_structure import updateNode
 
 import topologic
-
-# From https://stackabuse.com/python-how-to-flatten-list-of-lists/
-def flatten(element):
-	returnList = []
-	if isinstance(element, list) == True:
-		for anItem in element:
-			returnList = returnList + flatten(anItem)
-	else:
-		returnList = [element]
-	return returnList
+from . import Replication
 
 def processItem(item):
 	return item.ExternalBoundary()
@@ -36,7 +27,7 @@ class SvCellExternalBoundary(bpy.types.Node, SverchCustomTreeNode):
 			self.outputs['Shell'].sv_set([])
 			return
 		inputs = self.inputs['Cell'].sv_get(deepcopy=False)
-		inputs = flatten(inputs)
+		inputs = Replication.flatten(inputs)
 		outputs = []
 		for anInput in inputs:
 			outputs.append(processItem(anInput))
@@ -22,91 +22,7 @@ from sverchok.data_structure import updateNode
 import topologic
 from topologic import Vertex, Edge, Wire, Face, Shell, Cell, CellComplex, Cluster, Topology
 import math
-
-# From https://stackabuse.com/python-how-to-flatten-list-of-lists/
-def flatten(element):
-	returnList = []
-	if isinstance(element, list) == True:
-		for anItem in element:
-			returnList = returnList + flatten(anItem)
-	else:
-		returnList = [element]
-	return returnList
-
-def repeat(list):
-	maxLength = len(list[0])
-	for aSubList in list:
-		newLength = len(aSubList)
-		if newLength > maxLength:
-			maxLength = newLength
-	for anItem in list:
-		if (len(anItem) > 0):
-			itemToAppend = anItem[-1]
-		else:
-			itemToAppend = None
-		for i in range(len(anItem), maxLength):
-			anItem.append(itemToAppend)
-	return list
-
-# From https://stackoverflow.com/questions/34432056/repeat-elements-of-list-between-each-other-until-we-reach-a-certain-length
-def onestep(cur,y,base):
-    # one step of the iteration
-    if cur is not None:
-        y.append(cur)
-        base.append(cur)
-    else:
-        y.append(base[0])  # append is simplest, for now
-        base = base[1:]+[base[0]]  # rotate
-    return base
-
-def iterate(list):
-	maxLength = len(list[0])
-	returnList = []
-	for aSubList in list:
-		newLength = len(aSubList)
-		if newLength > maxLength:
-			maxLength = newLength
-	for anItem in list:
-		for i in range(len(anItem), maxLength):
-			anItem.append(None)
-		y=[]
-		base=[]
-		for cur in anItem:
-			base = onestep(cur,y,base)
-			# print(base,y)
-		returnList.append(y)
-	return returnList
-
-def trim(list):
-	minLength = len(list[0])
-	returnList = []
-	for aSubList in list:
-		newLength = len(aSubList)
-		if newLength < minLength:
-			minLength = newLength
-	for anItem in list:
-		anItem = anItem[:minLength]
-		returnList.append(anItem)
-	return returnList
-
-# Adapted from https://stackoverflow.com/questions/533905/get-the-cartesian-product-of-a-series-of-lists
-def interlace(ar_list):
-    if not ar_list:
-        yield []
-    else:
-        for a in ar_list[0]:
-            for prod in interlace(ar_list[1:]):
-                yield [a,]+prod
-
-def transposeList(l):
-	length = len(l[0])
-	returnList = []
-	for i in range(length):
-		tempRow = []
-		for j in range(len(l)):
-			tempRow.append(l[j][i])
-		returnList.append(tempRow)
-	return returnList
+from . import Replication
 
 def wireByVertices(vList):
 	edges = []
@@ -269,31 +185,18 @@ class SvCellHyperboloid(bpy.types.Node, SverchCustomTreeNode):
 		dirZList = self.inputs['Dir Z'].sv_get(deepcopy=True)
 		twistList = self.inputs['Twist'].sv_get(deepcopy=True)
 		tolList = self.inputs['Tol'].sv_get(deepcopy=True)
-		originList = flatten(originList)
-		baseRadiusList = flatten(baseRadiusList)
-		topRadiusList = flatten(topRadiusList)
-		heightList = flatten(heightList)
-		sidesList = flatten(sidesList)
-		dirXList = flatten(dirXList)
-		dirYList = flatten(dirYList)
-		dirZList = flatten(dirZList)
-		twistList = flatten(twistList)
-		tolList = flatten(tolList)
+		originList = Replication.flatten(originList)
+		baseRadiusList = Replication.flatten(baseRadiusList)
+		topRadiusList = Replication.flatten(topRadiusList)
+		heightList = Replication.flatten(heightList)
+		sidesList = Replication.flatten(sidesList)
+		dirXList = Replication.flatten(dirXList)
+		dirYList = Replication.flatten(dirYList)
+		dirZList = Replication.flatten(dirZList)
+		twistList = Replication.flatten(twistList)
+		tolList = Replication.flatten(tolList)
 		inputs = [originList, baseRadiusList, topRadiusList, heightList, sidesList, dirXList, dirYList, dirZList, twistList, tolList]
-		if ((self.Replication) == "Default"):
-			inputs = iterate(inputs)
-			inputs = transposeList(inputs)
-		elif ((self.Replication) == "Trim"):
-			inputs = trim(inputs)
-			inputs = transposeList(inputs)
-		elif ((self.Replication) == "Iterate"):
-			inputs = iterate(inputs)
-			inputs = transposeList(inputs)
-		elif ((self.Replication) == "Repeat"):
-			inputs = repeat(inputs)
-			inputs = transposeList(inputs)
-		elif ((self.Replication) == "Interlace"):
-			inputs = list(interlace(inputs))
+		inputs = Replication.replicateInputs(inputs, self.Replication)
 		outputs = []
 		for anInput in inputs:
 			outputs.append(processItem(anInput, self.originLocation))
@@ -5,17 +5,6 @@ from sverchok.data_structure import updateNode
 
 import topologic
 
-# From https://stackabuse.com/python-how-to-flatten-list-of-lists/
-def flatten(element):
-	returnList = []
-	if isinstance(element, list) == True:
-		for anItem in element:
-			returnList = returnList + flatten(anItem)
-	else:
-		returnList = [element]
-	return returnList
-
-
 def processItem(item, tolerance):
 	vert = None
 	if item.Type() == topologic.Cell.Type():
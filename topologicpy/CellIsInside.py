@@ -4,16 +4,7 @@ from sverchok.node_tree import SverchCustomTreeNode
 from sverchok.data_structure import updateNode
 
 import topologic
-
-# From https://stackabuse.com/python-how-to-flatten-list-of-lists/
-def flatten(element):
-	returnList = []
-	if isinstance(element, list) == True:
-		for anItem in element:
-			returnList = returnList + flatten(anItem)
-	else:
-		returnList = [element]
-	return returnList
+from . import Replication
 
 def processItem(item):
 	topology = item[0]
@@ -42,9 +33,9 @@ class SvCellIsInside(bpy.types.Node, SverchCustomTreeNode):
 		if not any(socket.is_linked for socket in self.outputs):
 			return
 		cells = self.inputs['Cell'].sv_get(deepcopy=False)
-		cells = flatten(cells)
+		cells = Replication.flatten(cells)
 		vertices = self.inputs['Vertex'].sv_get(deepcopy=False)
-		vertices = flatten(vertices)
+		vertices = Replication.flatten(vertices)
 		toleranceList = self.inputs['Tolerance'].sv_get(deepcopy=False)[0]
 		outputs = []
 		maxLength = max([len(cells), len(vertices), len(toleranceList)])
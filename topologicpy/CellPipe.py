@@ -22,90 +22,7 @@ from sverchok.data_structure import updateNode
 import topologic
 from topologic import Vertex, Edge, Wire, Face, Shell, Cell, CellComplex, Cluster, Topology
 import math
-
-# From https://stackabuse.com/python-how-to-flatten-list-of-lists/
-def flatten(element):
-	returnList = []
-	if isinstance(element, list) == True:
-		for anItem in element:
-			returnList = returnList + flatten(anItem)
-	else:
-		returnList = [element]
-	return returnList
-
-def repeat(list):
-	maxLength = len(list[0])
-	for aSubList in list:
-		newLength = len(aSubList)
-		if newLength > maxLength:
-			maxLength = newLength
-	for anItem in list:
-		if (len(anItem) > 0):
-			itemToAppend = anItem[-1]
-		else:
-			itemToAppend = None
-		for i in range(len(anItem), maxLength):
-			anItem.append(itemToAppend)
-	return list
-
-# From https://stackoverflow.com/questions/34432056/repeat-elements-of-list-between-each-other-until-we-reach-a-certain-length
-def onestep(cur,y,base):
-    # one step of the iteration
-    if cur is not None:
-        y.append(cur)
-        base.append(cur)
-    else:
-        y.append(base[0])  # append is simplest, for now
-        base = base[1:]+[base[0]]  # rotate
-    return base
-
-def iterate(list):
-	maxLength = len(list[0])
-	returnList = []
-	for aSubList in list:
-		newLength = len(aSubList)
-		if newLength > maxLength:
-			maxLength = newLength
-	for anItem in list:
-		for i in range(len(anItem), maxLength):
-			anItem.append(None)
-		y=[]
-		base=[]
-		for cur in anItem:
-			base = onestep(cur,y,base)
-		returnList.append(y)
-	return returnList
-
-def trim(list):
-	minLength = len(list[0])
-	returnList = []
-	for aSubList in list:
-		newLength = len(aSubList)
-		if newLength < minLength:
-			minLength = newLength
-	for anItem in list:
-		anItem = anItem[:minLength]
-		returnList.append(anItem)
-	return returnList
-
-# Adapted from https://stackoverflow.com/questions/533905/get-the-cartesian-product-of-a-series-of-lists
-def interlace(ar_list):
-    if not ar_list:
-        yield []
-    else:
-        for a in ar_list[0]:
-            for prod in interlace(ar_list[1:]):
-                yield [a,]+prod
-
-def transposeList(l):
-	length = len(l[0])
-	returnList = []
-	for i in range(length):
-		tempRow = []
-		for j in range(len(l)):
-			tempRow.append(l[j][i])
-		returnList.append(tempRow)
-	return returnList
+from . import Replication
 
 def wireByVertices(vList):
 	edges = []
@@ -248,38 +165,38 @@ class SvCellPipe(bpy.types.Node, SverchCustomTreeNode):
 		startOffsetList = self.inputs['Start Offset'].sv_get(deepcopy=True)
 		endOffsetList = self.inputs['End Offset'].sv_get(deepcopy=True)
 
-		edgeList = flatten(edgeList)
-		radiusList = flatten(radiusList)
-		sidesList = flatten(sidesList)
-		startOffsetList = flatten(startOffsetList)
-		endOffsetList = flatten(endOffsetList)
+		edgeList = Replication.flatten(edgeList)
+		radiusList = Replication.flatten(radiusList)
+		sidesList = Replication.flatten(sidesList)
+		startOffsetList = Replication.flatten(startOffsetList)
+		endOffsetList = Replication.flatten(endOffsetList)
 
 		if self.inputs['Endcap A'].is_linked:
 			endcapAList = self.inputs['Endcap A'].sv_get(deepcopy=True)
-			endcapAList = flatten(endcapAList)
+			endcapAList = Replication.flatten(endcapAList)
 		else:
 			endcapAList = [None]
 		if self.inputs['Endcap B'].is_linked:
 			endcapBList = self.inputs['Endcap B'].sv_get(deepcopy=True)
-			endcapBList = flatten(endcapBList)
+			endcapBList = Replication.flatten(endcapBList)
 		else:
 			endcapBList = [None]
 		inputs = [edgeList, radiusList, sidesList, startOffsetList, endOffsetList, endcapAList, endcapBList]
 		outputs = []
 		if ((self.Replication) == "Default"):
-			inputs = repeat(inputs)
-			inputs = transposeList(inputs)
+			inputs = Replication.repeat(inputs)
+			inputs = Replication.transposeList(inputs)
 		elif ((self.Replication) == "Trim"):
-			inputs = trim(inputs)
-			inputs = transposeList(inputs)
+			inputs = Replication.trim(inputs)
+			inputs = Replication.transposeList(inputs)
 		elif ((self.Replication) == "Iterate"):
-			inputs = iterate(inputs)
-			inputs = transposeList(inputs)
+			inputs = Replication.iterate(inputs)
+			inputs = Replication.transposeList(inputs)
 		elif ((self.Replication) == "Repeat"):
-			inputs = repeat(inputs)
-			inputs = transposeList(inputs)
+			inputs = Replication.repeat(inputs)
+			inputs = Replication.transposeList(inputs)
 		elif ((self.Replication) == "Interlace"):
-			inputs = list(interlace(inputs))
+			inputs = Replication.interlace(inputs)
 		for anInput in inputs:
 			outputs.append(processItem(anInput))
 		self.outputs['Pipe'].sv_set(outputs)
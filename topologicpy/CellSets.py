@@ -5,16 +5,7 @@ from sverchok.data_structure import updateNode
 
 import topologic
 import time
-
-# From https://stackabuse.com/python-how-to-flatten-list-of-lists/
-def flatten(element):
-	returnList = []
-	if isinstance(element, list) == True:
-		for anItem in element:
-			returnList = returnList + flatten(anItem)
-	else:
-		returnList = [element]
-	return returnList
+from . import Replication
 
 def gcClear(item):
 	gc = topologic.GlobalCluster.GetInstance()
@@ -69,12 +60,12 @@ class SvCellSets(bpy.types.Node, SverchCustomTreeNode):
 		if not any(socket.is_linked for socket in self.outputs):
 			return
 		cellList = self.inputs['Cells'].sv_get(deepcopy=False)
-		cellList = flatten(cellList)
+		cellList = Replication.flatten(cellList)
 		if not (self.inputs['SuperCells'].is_linked):
 			superCellList = []
 		else:
 			superCellList = self.inputs['SuperCells'].sv_get(deepcopy=True)
-			superCellList = flatten(superCellList)
+			superCellList = Replication.flatten(superCellList)
 		tolerance = self.inputs['Tolerance'].sv_get(deepcopy=False)[0][0]
 		sets = processItem(cellList, superCellList, tolerance)
 		self.outputs['Sets'].sv_set(sets)
@@ -6,16 +6,6 @@ from sverchok.data_structure import updateNode
 import topologic
 import time
 
-# From https://stackabuse.com/python-how-to-flatten-list-of-lists/
-def flatten(element):
-	returnList = []
-	if isinstance(element, list) == True:
-		for anItem in element:
-			returnList = returnList + flatten(anItem)
-	else:
-		returnList = [element]
-	return returnList
-
 def gcClear(item):
 	gc = topologic.GlobalCluster.GetInstance()
 	subTopologies = []
@@ -5,19 +5,7 @@ from sverchok.data_structure import updateNode, list_match_func, list_match_mode
 
 import topologic
 import math
-
-# From https://stackabuse.com/python-how-to-flatten-list-of-lists/
-def flatten(element):
-	returnList = []
-	if isinstance(element, list) == True:
-		for anItem in element:
-			returnList = returnList + flatten(anItem)
-	else:
-		returnList = [element]
-	return returnList
-
-
-
+from . import Replication
 
 def processItem(bObject):
 	color = bObject.color
@@ -40,7 +28,7 @@ class SvColorByObjectColor(bpy.types.Node, SverchCustomTreeNode):
 		if not any(socket.is_linked for socket in self.outputs):
 			return
 		inputs = self.inputs['Object'].sv_get(deepcopy=True)
-		inputs = flatten(inputs)
+		inputs = Replication.flatten(inputs)
 		outputs = []
 		for anInput in inputs:
 			outputs.append(processItem(anInput))
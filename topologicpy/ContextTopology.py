@@ -4,16 +4,7 @@ from sverchok.node_tree import SverchCustomTreeNode
 from sverchok.data_structure import updateNode, list_match_func, list_match_modes
 
 import topologic
-
-# From https://stackabuse.com/python-how-to-flatten-list-of-lists/
-def flatten(element):
-	returnList = []
-	if isinstance(element, list) == True:
-		for anItem in element:
-			returnList = returnList + flatten(anItem)
-	else:
-		returnList = [element]
-	return returnList
+from . import Replication
 
 def processItem(item):
 	context = item
@@ -40,7 +31,7 @@ class SvContextTopology(bpy.types.Node, SverchCustomTreeNode):
 		if not any(socket.is_linked for socket in self.outputs):
 			return
 		contextList = self.inputs['Context'].sv_get(deepcopy=True)
-		contextList = flatten(contextList)
+		contextList = Replication.flatten(contextList)
 		outputs = []
 		for anInput in contextList:
 			outputs.append(processItem(anInput))
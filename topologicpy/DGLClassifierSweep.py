@@ -0,0 +1,408 @@
+import torch
+import torch.nn as nn
+import torch.nn.functional as F
+from torch.utils.data.sampler import SubsetRandomSampler
+from sklearn.model_selection import KFold
+
+import dgl
+from dgl.dataloading import GraphDataLoader
+from dgl.nn import GINConv, GraphConv, SAGEConv, TAGConv
+
+import time
+import types
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+
+import pandas as pd
+import numpy as np
+
+from . import DGLGraphStream
+
+# Graph classifier models and the process-pool hyperparameter sweep used by DGL.TrainClassifier.
+# This module does not import bpy or sverchok: with the spawn start method (Windows and macOS) each
+# worker process imports it from scratch, so everything sent to the workers (functions, models,
+# hyperparameters and datasets) must be importable outside Blender.
+
+class GCN_Classic(nn.Module):
+	def __init__(self, in_feats, h_feats, num_classes):
+		"""
+
+        Parameters
+        ----------
+        in_feats : int
+            Input dimension in the form of integer
+        h_feats : list
+            List of hidden neurons for each hidden layer
+        num_classes : int
+            Number of output classes
+
+        Returns
+        -------
+        None.
+
+		"""
+		super(GCN_Classic, self).__init__()
+		assert isinstance(h_feats, list), "h_feats must be a list"
+		h_feats = [x for x in h_feats if x is not None]
+		assert len(h_feats) !=0, "h_feats is empty. unable to add hidden layers"
+		self.list_of_layers = []
+		dim = [in_feats] + h_feats
+		for i in range(1, len(dim)):
+			self.list_of_layers.append(GraphConv(dim[i-1], dim[i]))
+		self.final = GraphConv(dim[-1], num_classes)
+
+	def forward(self, g, in_feat):
+		h = in_feat
+		for i in range(len(self.list_of_layers)):
+			h = self.list_of_layers[i](g, h)
+			h = F.relu(h)
+		h = self.final(g, h)
+		g.ndata['h'] = h
+		return dgl.mean_nodes(g, 'h')
+
+class GCN_GINConv(nn.Module):
+	def __init__(self, in_feats, h_feats, num_classes, pooling):
+		super(GCN_GINConv, self).__init__()
+		assert isinstance(h_feats, list), "h_feats must be a list"
+		h_feats = [x for x in h_feats if x is not None]
+		assert len(h_feats) !=0, "h_feats is empty. unable to add hidden layers"
+		self.list_of_layers = []
+		dim = [in_feats] + h_feats
+
+		# Convolution (Hidden) Layers
+		for i in range(1, len(dim)):
+			lin = nn.Linear(dim[i-1], dim[i])
+			self.list_of_layers.append(GINConv(lin, 'sum'))
+
+		# Final Layer
+		self.final = nn.Linear(dim[-1], num_classes)
+
+		# Pooling layer
+		if pooling == "AvgPooling":
+			self.pooling_layer = dgl.nn.AvgPooling()
+		elif pooling == "MaxPooling":
+			self.pooling_layer = dgl.nn.MaxPooling()
+		elif pooling == "SumPooling":
+			self.pooling_layer = dgl.nn.SumPooling()
+		else:
+			raise NotImplementedError
+
+	def forward(self, g, in_feat):
+		h = in_feat
+		# Generate node features
+		for i in range(len(self.list_of_layers)): # Aim for 2 about 3 layers
+			h = self.list_of_layers[i](g, h)
+			h = F.relu(h)
+		# h will now be matrix of dimension num_nodes by h_feats[-1]
+		h = self.final(h)
+		g.ndata['h'] = h
+		# Go from node level features to graph level features by pooling
+		h = self.pooling_layer(g, h)
+		# h will now be vector of dimension num_classes
+		return h
+
+class GCN_GraphConv(nn.Module):
+	def __init__(self, in_feats, h_feats, num_classes, pooling):
+		super(GCN_GraphConv, self).__init__()
+		assert isinstance(h_feats, list), "h_feats must be a list"
+		h_feats = [x for x in h_feats if x is not None]
+		assert len(h_feats) !=0, "h_feats is empty. unable to add hidden layers"
+		self.list_of_layers = []
+		dim = [in_feats] + h_feats
+
+		# Convolution (Hidden) Layers
+		for i in range(1, len(dim)):
+			self.list_of_layers.append(GraphConv(dim[i-1], dim[i]))
+
+		# Final Layer
+		# Followed example at: https://docs.dgl.ai/tutorials/blitz/5_graph_classification.html#sphx-glr-tutorials-blitz-5-graph-classification-py
+		self.final = GraphConv(dim[-1], num_classes)
+
+		# Pooling layer
+		if pooling == "AvgPooling":
+			self.pooling_layer = dgl.nn.AvgPooling()
+		elif pooling == "MaxPooling":
+			self.pooling_layer = dgl.nn.MaxPooling()
+		elif pooling == "SumPooling":
+			self.pooling_layer = dgl.nn.SumPooling()
+		else:
+			raise NotImplementedError
+
+	def forward(self, g, in_feat):
+		h = in_feat
+		# Generate node features
+		for i in range(len(self.list_of_layers)): # Aim for 2 about 3 layers
+			h = self.list_of_layers[i](g, h)
+			h = F.relu(h)
+		# h will now be matrix of dimension num_nodes by h_feats[-1]
+		h = self.final(g,h)
+		g.ndata['h'] = h
+		# Go from node level features to graph level features by pooling
+		h = self.pooling_layer(g, h)
+		# h will now be vector of dimension num_classes
+		return h
+
+class GCN_SAGEConv(nn.Module):
+	def __init__(self, in_feats, h_feats, num_classes, pooling):
+		super(GCN_SAGEConv, self).__init__()
+		assert isinstance(h_feats, list), "h_feats must be a list"
+		h_feats = [x for x in h_feats if x is not None]
+		assert len(h_feats) !=0, "h_feats is empty. unable to add hidden layers"
+		self.list_of_layers = []
+		dim = [in_feats] + h_feats
+
+		# Convolution (Hidden) Layers
+		for i in range(1, len(dim)):
+			self.list_of_layers.append(SAGEConv(dim[i-1], dim[i], aggregator_type='pool'))
+
+		# Final Layer
+		self.final = nn.Linear(dim[-1], num_classes)
+
+		# Pooling layer
+		if pooling == "AvgPooling":
+			self.pooling_layer = dgl.nn.AvgPooling()
+		elif pooling == "MaxPooling":
+			self.pooling_layer = dgl.nn.MaxPooling()
+		elif pooling == "SumPooling":
+			self.pooling_layer = dgl.nn.SumPooling()
+		else:
+			raise NotImplementedError
+
+	def forward(self, g, in_feat):
+		h = in_feat
+		# Generate node features
+		for i in range(len(self.list_of_layers)): # Aim for 2 about 3 layers
+			h = self.list_of_layers[i](g, h)
+			h = F.relu(h)
+		# h will now be matrix of dimension num_nodes by h_feats[-1]
+		h = self.final(h)
+		g.ndata['h'] = h
+		# Go from node level features to graph level features by pooling
+		h = self.pooling_layer(g, h)
+		# h will now be vector of dimension num_classes
+		return h
+
+class GCN_TAGConv(nn.Module):
+	def __init__(self, in_feats, h_feats, num_classes, pooling):
+		super(GCN_TAGConv, self).__init__()
+		assert isinstance(h_feats, list), "h_feats must be a list"
+		h_feats = [x for x in h_feats if x is not None]
+		assert len(h_feats) !=0, "h_feats is empty. unable to add hidden layers"
+		self.list_of_layers = []
+		dim = [in_feats] + h_feats
+
+		# Convolution (Hidden) Layers
+		for i in range(1, len(dim)):
+			self.list_of_layers.append(TAGConv(dim[i-1], dim[i], k=2))
+
+		# Final Layer
+		self.final = nn.Linear(dim[-1], num_classes)
+
+		# Pooling layer
+		if pooling == "AvgPooling":
+			self.pooling_layer = dgl.nn.AvgPooling()
+		elif pooling == "MaxPooling":
+			self.pooling_layer = dgl.nn.MaxPooling()
+		elif pooling == "SumPooling":
+			self.pooling_layer = dgl.nn.SumPooling()
+		else:
+			raise NotImplementedError
+
+	def forward(self, g, in_feat):
+		h = in_feat
+		# Generate node features
+		for i in range(len(self.list_of_layers)): # Aim for 2 about 3 layers
+			h = self.list_of_layers[i](g, h)
+			h = F.relu(h)
+		# h will now be matrix of dimension num_nodes by h_feats[-1]
+		h = self.final(h)
+		g.ndata['h'] = h
+		# Go from node level features to graph level features by pooling
+		h = self.pooling_layer(g, h)
+		# h will now be vector of dimension num_classes
+		return h
+
+def reset_weights(self):
+	'''
+	Try resetting model weights to avoid
+	weight leakage.
+	'''
+	for layer in self.children():
+		if hasattr(layer, 'reset_parameters'):
+			layer.reset_parameters()
+
+
+def buildModel(hparams, dataset):
+	if hparams.conv_layer_type == 'Classic':
+		return GCN_Classic(dataset.dim_nfeats, hparams.hidden_layers, dataset.gclasses)
+	elif hparams.conv_layer_type == 'GINConv':
+		return GCN_GINConv(dataset.dim_nfeats, hparams.hidden_layers, dataset.gclasses, hparams.pooling)
+	elif hparams.conv_layer_type == 'GraphConv':
+		return GCN_GraphConv(dataset.dim_nfeats, hparams.hidden_layers, dataset.gclasses, hparams.pooling)
+	elif hparams.conv_layer_type == 'SAGEConv':
+		return GCN_SAGEConv(dataset.dim_nfeats, hparams.hidden_layers, dataset.gclasses, hparams.pooling)
+	elif hparams.conv_layer_type == 'TAGConv':
+		return GCN_TAGConv(dataset.dim_nfeats, hparams.hidden_layers, dataset.gclasses, hparams.pooling)
+	else:
+		raise NotImplementedError
+
+def buildOptimizer(hparams, model):
+	if hparams.optimizer_str == "Adadelta":
+		return torch.optim.Adadelta(model.parameters(), eps=hparams.eps, 
+                                            lr=hparams.lr, rho=hparams.rho, weight_decay=hparams.weight_decay)
+	elif hparams.optimizer_str == "Adagrad":
+		return torch.optim.Adagrad(model.parameters(), eps=hparams.eps, 
+                                            lr=hparams.lr, lr_decay=hparams.lr_decay, weight_decay=hparams.weight_decay)
+	elif hparams.optimizer_str == "Adam":
+		return torch.optim.Adam(model.parameters(), amsgrad=hparams.amsgrad, betas=hparams.betas, eps=hparams.eps, 
+                                            lr=hparams.lr, maximize=hparams.maximize, weight_decay=hparams.weight_decay)
+	return None
+
+class GraphList:
+	"""
+	Picklable in-memory copy of a graph classification dataset whose class lives in a node module.
+	"""
+	def __init__(self, dataset):
+		self.graphs = []
+		labels = []
+		for i in range(len(dataset)):
+			graph, label = dataset[i]
+			self.graphs.append(graph)
+			labels.append(label)
+		self.labels = torch.stack([torch.as_tensor(label) for label in labels]) if len(labels) > 0 else torch.LongTensor([])
+		self.dim_nfeats = dataset.dim_nfeats
+		self.gclasses = dataset.gclasses
+		self.node_attr_key = dataset.node_attr_key
+
+	def __getitem__(self, i):
+		return self.graphs[i], self.labels[i]
+
+	def __len__(self):
+		return len(self.graphs)
+
+def workerConfigs(configs):
+	"""
+	Returns the (hparams, trainingDataset) configurations in a form the workers can unpickle without
+	bpy: hparams become a SimpleNamespace and datasets other than GraphStream become a GraphList.
+	A dataset shared by several configurations is converted once.
+	"""
+	datasets = {}
+	converted = []
+	for hparams, trainingDataset in configs:
+		key = id(trainingDataset)
+		if key not in datasets:
+			if isinstance(trainingDataset, (DGLGraphStream.GraphStream, GraphList)):
+				datasets[key] = trainingDataset
+			else:
+				datasets[key] = GraphList(trainingDataset)
+		converted.append((types.SimpleNamespace(**vars(hparams)), datasets[key]))
+	return converted
+
+# The configurations of the worker process, set once by initWorker
+workerState = []
+
+def initWorker(threads, configs):
+	# Each worker gets its own share of the cores instead of every process spawning one thread per core
+	torch.set_num_threads(threads)
+	workerState[:] = configs
+
+def runEpoch(model, optimizer, dataloader, hparams, node_attr_key, train):
+	num_correct = 0
+	num_tests = 0
+	temp_loss_list = []
+	for batched_graph, labels in dataloader:
+		if train:
+			optimizer.zero_grad()
+		pred = model(batched_graph, batched_graph.ndata[node_attr_key].float())
+		if hparams.loss_function == "Negative Log Likelihood":
+			logp = F.log_softmax(pred, 1)
+			loss = F.nll_loss(logp, labels)
+		elif hparams.loss_function == "Cross Entropy":
+			loss = F.cross_entropy(pred, labels)
+		temp_loss_list.append(loss.item())
+		num_correct += (pred.argmax(1) == labels).sum().item()
+		num_tests += len(labels)
+		if train:
+			loss.backward()
+			optimizer.step()
+	return [num_correct / num_tests, sum(temp_loss_list) / len(temp_loss_list)]
+
+def trainFold(config, fold, train_ids, test_ids):
+	"""
+	Trains a fresh model on one fold of a configuration of the worker and returns its per-epoch
+	accuracy and loss curves.
+	"""
+	start = time.time()
+	hparams, trainingDataset = workerState[config]
+	torch.manual_seed(42+fold)
+	model = buildModel(hparams, trainingDataset)
+	optimizer = buildOptimizer(hparams, model)
+	train_dataloader = GraphDataLoader(trainingDataset, sampler=SubsetRandomSampler(train_ids), batch_size=hparams.batch_size, drop_last=False)
+	test_dataloader = GraphDataLoader(trainingDataset, sampler=SubsetRandomSampler(test_ids), batch_size=hparams.batch_size, drop_last=False)
+	curves = [[], [], [], []]
+	for _ in range(hparams.epochs):
+		training_accuracy, training_loss = runEpoch(model, optimizer, train_dataloader, hparams, trainingDataset.node_attr_key, True)
+		with torch.no_grad():
+			testing_accuracy, testing_loss = runEpoch(model, optimizer, test_dataloader, hparams, trainingDataset.node_attr_key, False)
+		for curve, value in zip(curves, [training_accuracy, testing_accuracy, training_loss, testing_loss]):
+			curve.append(value)
+	return {'config': config, 'fold': fold, 'model': model, 'duration': round(time.time() - start, 3),
+			'training_accuracy': curves[0], 'testing_accuracy': curves[1], 'training_loss': curves[2], 'testing_loss': curves[3]}
+
+def foldSplits(hparams, trainingDataset):
+	if hparams.cv_type == "K-Fold":
+		kfold = KFold(n_splits=hparams.k_folds, shuffle=True, random_state=42)
+		return list(kfold.split(np.arange(len(trainingDataset))))
+	idx = torch.randperm(len(trainingDataset), generator=torch.Generator().manual_seed(42)).numpy()
+	num_train = int(len(trainingDataset) * hparams.split)
+	return [(idx[:num_train], idx[num_train:])]
+
+def meanAccuracy(folds):
+	return sum(r['testing_accuracy'][-1] for r in folds) / len(folds)
+
+def sweep(configs, processes=1, threads=1, margin=None):
+	"""
+	Trains every fold of every (hparams, trainingDataset) configuration on a pool of processes
+	with threads torch threads each. The configurations are sent to each worker once, when it
+	starts; a task only carries the configuration index and the fold ids. All folds are queued at
+	once, first folds of every configuration first, so the pool stays full even for a single
+	configuration. When margin is set, a configuration whose mean final testing accuracy falls more
+	than margin below the best configuration so far has its queued folds cancelled. Returns
+	[results, table, pruned] where results holds the fold dictionaries of each configuration, table
+	has one row per fold and pruned flags the stopped configurations.
+	"""
+	splits = [foldSplits(hparams, trainingDataset) for hparams, trainingDataset in configs]
+	results = [[] for config in configs]
+	pruned = [False for config in configs]
+	queued = [[] for config in configs]
+
+	with ProcessPoolExecutor(max_workers=max(1, processes), initializer=initWorker, initargs=(threads, workerConfigs(configs))) as executor:
+		pending = set()
+		for fold in range(max([len(split) for split in splits] + [0])):
+			for i in range(len(configs)):
+				if fold < len(splits[i]):
+					train_ids, test_ids = splits[i][fold]
+					future = executor.submit(trainFold, i, fold, train_ids, test_ids)
+					queued[i].append(future)
+					pending.add(future)
+		while pending:
+			done, pending = wait(pending, return_when=FIRST_COMPLETED)
+			for future in done:
+				if future.cancelled():
+					continue
+				result = future.result()
+				i = result['config']
+				results[i].append(result)
+				if margin is not None and not pruned[i]:
+					best = max(meanAccuracy(results[j]) for j in range(len(configs)) if len(results[j]) > 0 and not pruned[j])
+					if meanAccuracy(results[i]) < best - margin:
+						pruned[i] = True
+						for other in queued[i]:
+							if other.cancel():
+								pending.discard(other)
+	rows = []
+	for i, (hparams, trainingDataset) in enumerate(configs):
+		results[i].sort(key=lambda r: r['fold'])
+		for r in results[i]:
+			rows.append([i, r['fold'], hparams.optimizer_str, hparams.cv_type, hparams.hidden_layers, hparams.conv_layer_type, hparams.pooling, hparams.lr, hparams.batch_size, hparams.epochs, r['duration'], r['training_accuracy'][-1], r['testing_accuracy'][-1], r['training_loss'][-1], r['testing_loss'][-1], pruned[i]])
+	table = pd.DataFrame(rows, columns=['Config', 'Fold', 'Optimizer', 'CV Type', 'HL Widths', 'Conv Layer Type', 'Pooling', 'Learning Rate', 'Batch Size', 'Epochs', 'Duration', 'Training Accuracy', 'Testing Accuracy', 'Training Loss', 'Testing Loss', 'Stopped Early'])
+	return [results, table, pruned]
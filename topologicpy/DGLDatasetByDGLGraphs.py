@@ -96,7 +96,7 @@ class SvDGLDatasetByDGLGraphs(bpy.types.Node, SverchCustomTreeNode):
 			inputs = Replication.repeat(inputs)
 			inputs = Replication.transposeList(inputs)
 		elif ((self.Replication) == "Interlace"):
-			inputs = list(Replication.interlace(inputs))
+			inputs = Replication.interlace(inputs)
 		outputs = []
 		for anInput in inputs:
 			outputs.append(processItem(anInput))
@@ -9,11 +9,27 @@ import dgl
 from dgl.data import DGLDataset
 import torch
 import numpy as np
+import pandas as pd
+import os
 
 from . import Replication
 
+def convertParquetTables(folder_path):
+	# DGL's CSVDataset only parses CSV, so Parquet tables written by Graph.ExportToCSV are
+	# converted to CSV files of the same name unless an up to date CSV already exists
+	for name in os.listdir(folder_path):
+		root, ext = os.path.splitext(name)
+		if ext.lower() != ".parquet":
+			continue
+		parquet_path = os.path.join(folder_path, name)
+		csv_path = os.path.join(folder_path, root+".csv")
+		if os.path.exists(csv_path) and os.path.getmtime(csv_path) >= os.path.getmtime(parquet_path):
+			continue
+		pd.read_parquet(parquet_path).to_csv(csv_path, index=False)
+
 def processItem(item):
 	graphs_folder_path = item
+	convertParquetTables(graphs_folder_path)
 	return dgl.data.CSVDataset(graphs_folder_path, force_reload=True)
 
 class SvDGLDatasetByImportedCSV_NC(bpy.types.Node, SverchCustomTreeNode):
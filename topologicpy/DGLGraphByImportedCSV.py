@@ -21,12 +21,17 @@ def oneHotEncode(item, categories):
 			returnList.append(0)
 	return returnList
 
+def readTable(file_path):
+	if file_path.lower().endswith(".parquet"):
+		return pd.read_parquet(file_path)
+	return pd.read_csv(file_path)
+
 def processItem(item):
 	graphs_file_path, edges_file_path, nodes_file_path, graph_id_header, graph_label_header, num_nodes_header, src_header, dst_header, node_label_header, node_attr_key, categories, bidirectional = item
 
-	graphs = pd.read_csv(graphs_file_path)
-	edges = pd.read_csv(edges_file_path)
-	nodes = pd.read_csv(nodes_file_path)
+	graphs = readTable(graphs_file_path)
+	edges = readTable(edges_file_path)
+	nodes = readTable(nodes_file_path)
 	dgl_graphs = []
 	labels = []
 
@@ -181,7 +186,7 @@ class SvDGLGraphByImportedCSV(bpy.types.Node, SverchCustomTreeNode):
 			inputs = Replication.repeat(inputs)
 			inputs = Replication.transposeList(inputs)
 		elif ((self.Replication) == "Interlace"):
-			inputs = list(Replication.interlace(inputs))
+			inputs = Replication.interlace(inputs)
 		outputs = []
 		graphs = []
 		labels = []
@@ -110,7 +110,7 @@ class SvDGLGraphByImportedDGCNN(bpy.types.Node, SverchCustomTreeNode):
 			inputs = Replication.repeat(inputs)
 			inputs = Replication.transposeList(inputs)
 		elif ((self.Replication) == "Interlace"):
-			inputs = list(Replication.interlace(inputs))
+			inputs = Replication.interlace(inputs)
 		outputs = []
 		graphs = []
 		labels = []
@@ -0,0 +1,208 @@
+import io
+import csv
+import numpy as np
+import pandas as pd
+import torch
+import dgl
+from dgl.data import DGLDataset
+from collections import OrderedDict
+
+# Streaming graph classification dataset. It does not import bpy so that worker processes (see
+# DGLClassifierSweep) can unpickle it under the spawn start method.
+
+def oneHotEncode(labels, categories):
+	lookup = {category: i for i, category in enumerate(categories)}
+	encoded = np.zeros((len(labels), len(categories)), dtype=np.float32)
+	for row, label in enumerate(labels):
+		if (label in lookup) == False:
+			raise Exception("Error: DGLDataset - One Hot Encoding - Node Label not in categories")
+		encoded[row, lookup[label]] = 1
+	return encoded
+
+def csvRecords(f):
+	"""
+	Yields [offset, record] for every CSV record of the binary file f from its current position. A
+	record spans several physical lines when a quoted field holds a newline: it only ends on a line
+	that leaves an even number of quote characters (escaped quotes come in pairs).
+	"""
+	offset = f.tell()
+	lines = []
+	quotes = 0
+	for line in f:
+		lines.append(line)
+		quotes += line.count(b'"')
+		if quotes % 2 == 0:
+			record = b"".join(lines)
+			yield [offset, record]
+			offset += len(record)
+			lines = []
+			quotes = 0
+	if len(lines) > 0:
+		yield [offset, b"".join(lines)]
+
+def csvField(record, column):
+	if b'"' not in record:
+		return record.split(b",", column+1)[column]
+	return next(csv.reader(io.StringIO(record.decode("utf-8"), newline="")))[column]
+
+class CSVTableIndex:
+	"""
+	Offset index of a CSV table whose rows are grouped by graph id. One pass over the file records
+	the byte span of every run of rows that share a graph id, so the rows of a graph are read back
+	with a single seek. Quoted fields, including ones holding commas or newlines, are parsed with
+	the csv module.
+	"""
+	def __init__(self, file_path, graph_id_header):
+		self.file_path = file_path
+		self.segments = {}
+		with open(file_path, "rb") as f:
+			records = csvRecords(f)
+			header = next(records, [0, b""])[1]
+			self.columns = pd.read_csv(io.BytesIO(header)).columns.tolist()
+			column = self.columns.index(graph_id_header)
+			current = None
+			start = None
+			end = None
+			for offset, record in records:
+				if len(record.strip()) == 0:
+					continue
+				graph_id = int(csvField(record, column))
+				if graph_id != current:
+					if start != None:
+						self.segments.setdefault(current, []).append((start, end-start))
+					current = graph_id
+					start = offset
+				end = offset+len(record)
+			if start != None:
+				self.segments.setdefault(current, []).append((start, end-start))
+
+	def rows(self, graph_id, usecols):
+		segments = self.segments.get(graph_id, [])
+		if len(segments) == 0:
+			return pd.DataFrame(columns=usecols)
+		chunks = []
+		with open(self.file_path, "rb") as f:
+			for start, length in segments:
+				f.seek(start)
+				chunk = f.read(length)
+				if not chunk.endswith(b"\n"):
+					chunk += b"\n" # The last row of the file may have no line break
+				chunks.append(chunk)
+		return pd.read_csv(io.BytesIO(b"".join(chunks)), header=None, names=self.columns, usecols=usecols)
+
+class ParquetTableIndex:
+	"""
+	Offset index of a Parquet table whose rows are grouped by graph id. Only the graph id column is
+	read to build the index; the rows of a graph are read from the row groups that hold them.
+	"""
+	def __init__(self, file_path, graph_id_header):
+		import pyarrow.parquet as pq
+		self.file_path = file_path
+		self.file = pq.ParquetFile(file_path)
+		ids = self.file.read(columns=[graph_id_header]).column(0).to_numpy()
+		self.groupStarts = np.concatenate([[0], np.cumsum([self.file.metadata.row_group(i).num_rows for i in range(self.file.num_row_groups)])])
+		self.segments = {}
+		if len(ids) == 0:
+			return
+		breaks = np.flatnonzero(ids[1:] != ids[:-1])+1
+		starts = np.concatenate([[0], breaks])
+		ends = np.concatenate([breaks, [len(ids)]])
+		for start, end in zip(starts.tolist(), ends.tolist()):
+			self.segments.setdefault(int(ids[start]), []).append((start, end-start))
+
+	def __getstate__(self):
+		# The open file cannot be pickled; it is reopened on first use
+		state = self.__dict__.copy()
+		state['file'] = None
+		return state
+
+	def rows(self, graph_id, usecols):
+		if self.file is None:
+			import pyarrow.parquet as pq
+			self.file = pq.ParquetFile(self.file_path)
+		frames = []
+		for start, count in self.segments.get(graph_id, []):
+			first = int(np.searchsorted(self.groupStarts, start, side="right"))-1
+			last = int(np.searchsorted(self.groupStarts, start+count-1, side="right"))-1
+			table = self.file.read_row_groups(list(range(first, last+1)), columns=usecols)
+			offset = start-int(self.groupStarts[first])
+			frames.append(table.slice(offset, count).to_pandas())
+		if len(frames) == 0:
+			return pd.DataFrame(columns=usecols)
+		return pd.concat(frames, ignore_index=True)
+
+def tableIndex(file_path, graph_id_header):
+	if file_path.lower().endswith(".parquet"):
+		return ParquetTableIndex(file_path, graph_id_header)
+	return CSVTableIndex(file_path, graph_id_header)
+
+class GraphStream(DGLDataset):
+	"""
+	Graph classification dataset over graphs, edges and nodes tables (CSV or Parquet) that are too
+	large to load at once. Only the graphs table is read up front. The edges and nodes tables are
+	indexed by graph id and each DGLGraph is built on demand in __getitem__, keeping the cacheSize
+	most recently used graphs in memory.
+	"""
+	def __init__(self, graphs_file_path, edges_file_path, nodes_file_path, graph_id_header, graph_label_header, num_nodes_header, src_header, dst_header, node_label_header, node_attr_key, categories, bidirectional, cacheSize=256):
+		self.graphs_file_path = graphs_file_path
+		self.edges_file_path = edges_file_path
+		self.nodes_file_path = nodes_file_path
+		self.graph_id_header = graph_id_header
+		self.graph_label_header = graph_label_header
+		self.num_nodes_header = num_nodes_header
+		self.src_header = src_header
+		self.dst_header = dst_header
+		self.node_label_header = node_label_header
+		self.node_attr_key = node_attr_key
+		self.categories = categories
+		self.bidirectional = bidirectional
+		self.cacheSize = cacheSize
+		self.cache = OrderedDict()
+		super().__init__(name='GraphStream')
+
+	def process(self):
+		if self.graphs_file_path.lower().endswith(".parquet"):
+			graphs = pd.read_parquet(self.graphs_file_path, columns=[self.graph_id_header, self.graph_label_header, self.num_nodes_header])
+		else:
+			graphs = pd.read_csv(self.graphs_file_path, usecols=[self.graph_id_header, self.graph_label_header, self.num_nodes_header])
+		self.graph_ids = graphs[self.graph_id_header].to_numpy()
+		self.num_nodes = graphs[self.num_nodes_header].to_numpy()
+		labels = graphs[self.graph_label_header].tolist()
+		self.labels = torch.LongTensor(labels)
+		self.edges = tableIndex(self.edges_file_path, self.graph_id_header)
+		self.nodes = tableIndex(self.nodes_file_path, self.graph_id_header)
+		self.dim_nfeats = len(self.categories)
+		self.gclasses = len(set(labels))
+
+	def graph(self, i):
+		graph_id = int(self.graph_ids[i])
+		edges = self.edges.rows(graph_id, [self.src_header, self.dst_header])
+		nodes = self.nodes.rows(graph_id, [self.node_label_header])
+		src = edges[self.src_header].to_numpy(dtype=np.int64)
+		dst = edges[self.dst_header].to_numpy(dtype=np.int64)
+		dgl_graph = dgl.graph((src, dst), num_nodes=int(self.num_nodes[i]))
+		dgl_graph.ndata[self.node_attr_key] = torch.from_numpy(oneHotEncode(nodes[self.node_label_header].tolist(), self.categories))
+		if self.bidirectional:
+			dgl_graph = dgl.add_reverse_edges(dgl_graph)
+		return dgl_graph
+
+	def __getitem__(self, i):
+		i = int(i)
+		if i in self.cache:
+			self.cache.move_to_end(i)
+			dgl_graph = self.cache[i]
+		else:
+			dgl_graph = self.graph(i)
+			self.cache[i] = dgl_graph
+			while len(self.cache) > self.cacheSize:
+				self.cache.popitem(last=False)
+		return dgl_graph, self.labels[i]
+
+	def __len__(self):
+		return len(self.graph_ids)
+
+	def __getstate__(self):
+		# Pickle the indexes only, not the cached graphs
+		state = self.__dict__.copy()
+		state['cache'] = OrderedDict()
+		return state
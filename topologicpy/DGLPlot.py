@@ -74,7 +74,7 @@ def sv_execute(node):
 		inputs = Replication.repeat(inputs)
 		inputs = Replication.transposeList(inputs)
 	elif ((node.Replication) == "Interlace"):
-		inputs = list(Replication.interlace(inputs))
+		inputs = Replication.interlace(inputs)
 	for anInput in inputs:
 		processItem(anInput)
 
@@ -23,219 +23,19 @@ from datetime import datetime
 
 import pandas as pd
 import numpy as np
+import os
 
 from . import Replication
+from . import DGLClassifierSweep
 replication = [("Default", "Default", "", 1),("Trim", "Trim", "", 2),("Iterate", "Iterate", "", 3),("Repeat", "Repeat", "", 4),("Interlace", "Interlace", "", 5)]
 
-
-class GCN_Classic(nn.Module):
-	def __init__(self, in_feats, h_feats, num_classes):
-		"""
-
-        Parameters
-        ----------
-        in_feats : int
-            Input dimension in the form of integer
-        h_feats : list
-            List of hidden neurons for each hidden layer
-        num_classes : int
-            Number of output classes
-
-        Returns
-        -------
-        None.
-
-		"""
-		super(GCN_Classic, self).__init__()
-		assert isinstance(h_feats, list), "h_feats must be a list"
-		h_feats = [x for x in h_feats if x is not None]
-		assert len(h_feats) !=0, "h_feats is empty. unable to add hidden layers"
-		self.list_of_layers = []
-		dim = [in_feats] + h_feats
-		for i in range(1, len(dim)):
-			self.list_of_layers.append(GraphConv(dim[i-1], dim[i]))
-		self.final = GraphConv(dim[-1], num_classes)
-
-	def forward(self, g, in_feat):
-		h = in_feat
-		for i in range(len(self.list_of_layers)):
-			h = self.list_of_layers[i](g, h)
-			h = F.relu(h)
-		h = self.final(g, h)
-		g.ndata['h'] = h
-		return dgl.mean_nodes(g, 'h')
-
-class GCN_GINConv(nn.Module):
-	def __init__(self, in_feats, h_feats, num_classes, pooling):
-		super(GCN_GINConv, self).__init__()
-		assert isinstance(h_feats, list), "h_feats must be a list"
-		h_feats = [x for x in h_feats if x is not None]
-		assert len(h_feats) !=0, "h_feats is empty. unable to add hidden layers"
-		self.list_of_layers = []
-		dim = [in_feats] + h_feats
-
-		# Convolution (Hidden) Layers
-		for i in range(1, len(dim)):
-			lin = nn.Linear(dim[i-1], dim[i])
-			self.list_of_layers.append(GINConv(lin, 'sum'))
-
-		# Final Layer
-		self.final = nn.Linear(dim[-1], num_classes)
-
-		# Pooling layer
-		if pooling == "AvgPooling":
-			self.pooling_layer = dgl.nn.AvgPooling()
-		elif pooling == "MaxPooling":
-			self.pooling_layer = dgl.nn.MaxPooling()
-		elif pooling == "SumPooling":
-			self.pooling_layer = dgl.nn.SumPooling()
-		else:
-			raise NotImplementedError
-
-	def forward(self, g, in_feat):
-		h = in_feat
-		# Generate node features
-		for i in range(len(self.list_of_layers)): # Aim for 2 about 3 layers
-			h = self.list_of_layers[i](g, h)
-			h = F.relu(h)
-		# h will now be matrix of dimension num_nodes by h_feats[-1]
-		h = self.final(h)
-		g.ndata['h'] = h
-		# Go from node level features to graph level features by pooling
-		h = self.pooling_layer(g, h)
-		# h will now be vector of dimension num_classes
-		return h
-
-class GCN_GraphConv(nn.Module):
-	def __init__(self, in_feats, h_feats, num_classes, pooling):
-		super(GCN_GraphConv, self).__init__()
-		assert isinstance(h_feats, list), "h_feats must be a list"
-		h_feats = [x for x in h_feats if x is not None]
-		assert len(h_feats) !=0, "h_feats is empty. unable to add hidden layers"
-		self.list_of_layers = []
-		dim = [in_feats] + h_feats
-
-		# Convolution (Hidden) Layers
-		for i in range(1, len(dim)):
-			self.list_of_layers.append(GraphConv(dim[i-1], dim[i]))
-
-		# Final Layer
-		# Followed example at: https://docs.dgl.ai/tutorials/blitz/5_graph_classification.html#sphx-glr-tutorials-blitz-5-graph-classification-py
-		self.final = GraphConv(dim[-1], num_classes)
-
-		# Pooling layer
-		if pooling == "AvgPooling":
-			self.pooling_layer = dgl.nn.AvgPooling()
-		elif pooling == "MaxPooling":
-			self.pooling_layer = dgl.nn.MaxPooling()
-		elif pooling == "SumPooling":
-			self.pooling_layer = dgl.nn.SumPooling()
-		else:
-			raise NotImplementedError
-
-	def forward(self, g, in_feat):
-		h = in_feat
-		# Generate node features
-		for i in range(len(self.list_of_layers)): # Aim for 2 about 3 layers
-			h = self.list_of_layers[i](g, h)
-			h = F.relu(h)
-		# h will now be matrix of dimension num_nodes by h_feats[-1]
-		h = self.final(g,h)
-		g.ndata['h'] = h
-		# Go from node level features to graph level features by pooling
-		h = self.pooling_layer(g, h)
-		# h will now be vector of dimension num_classes
-		return h
-
-class GCN_SAGEConv(nn.Module):
-	def __init__(self, in_feats, h_feats, num_classes, pooling):
-		super(GCN_SAGEConv, self).__init__()
-		assert isinstance(h_feats, list), "h_feats must be a list"
-		h_feats = [x for x in h_feats if x is not None]
-		assert len(h_feats) !=0, "h_feats is empty. unable to add hidden layers"
-		self.list_of_layers = []
-		dim = [in_feats] + h_feats
-
-		# Convolution (Hidden) Layers
-		for i in range(1, len(dim)):
-			self.list_of_layers.append(SAGEConv(dim[i-1], dim[i], aggregator_type='pool'))
-
-		# Final Layer
-		self.final = nn.Linear(dim[-1], num_classes)
-
-		# Pooling layer
-		if pooling == "AvgPooling":
-			self.pooling_layer = dgl.nn.AvgPooling()
-		elif pooling == "MaxPooling":
-			self.pooling_layer = dgl.nn.MaxPooling()
-		elif pooling == "SumPooling":
-			self.pooling_layer = dgl.nn.SumPooling()
-		else:
-			raise NotImplementedError
-
-	def forward(self, g, in_feat):
-		h = in_feat
-		# Generate node features
-		for i in range(len(self.list_of_layers)): # Aim for 2 about 3 layers
-			h = self.list_of_layers[i](g, h)
-			h = F.relu(h)
-		# h will now be matrix of dimension num_nodes by h_feats[-1]
-		h = self.final(h)
-		g.ndata['h'] = h
-		# Go from node level features to graph level features by pooling
-		h = self.pooling_layer(g, h)
-		# h will now be vector of dimension num_classes
-		return h
-
-class GCN_TAGConv(nn.Module):
-	def __init__(self, in_feats, h_feats, num_classes, pooling):
-		super(GCN_TAGConv, self).__init__()
-		assert isinstance(h_feats, list), "h_feats must be a list"
-		h_feats = [x for x in h_feats if x is not None]
-		assert len(h_feats) !=0, "h_feats is empty. unable to add hidden layers"
-		self.list_of_layers = []
-		dim = [in_feats] + h_feats
-
-		# Convolution (Hidden) Layers
-		for i in range(1, len(dim)):
-			self.list_of_layers.append(TAGConv(dim[i-1], dim[i], k=2))
-
-		# Final Layer
-		self.final = nn.Linear(dim[-1], num_classes)
-
-		# Pooling layer
-		if pooling == "AvgPooling":
-			self.pooling_layer = dgl.nn.AvgPooling()
-		elif pooling == "MaxPooling":
-			self.pooling_layer = dgl.nn.MaxPooling()
-		elif pooling == "SumPooling":
-			self.pooling_layer = dgl.nn.SumPooling()
-		else:
-			raise NotImplementedError
-
-	def forward(self, g, in_feat):
-		h = in_feat
-		# Generate node features
-		for i in range(len(self.list_of_layers)): # Aim for 2 about 3 layers
-			h = self.list_of_layers[i](g, h)
-			h = F.relu(h)
-		# h will now be matrix of dimension num_nodes by h_feats[-1]
-		h = self.final(h)
-		g.ndata['h'] = h
-		# Go from node level features to graph level features by pooling
-		h = self.pooling_layer(g, h)
-		# h will now be vector of dimension num_classes
-		return h
-
-def reset_weights(self):
-	'''
-	Try resetting model weights to avoid
-	weight leakage.
-	'''
-	for layer in self.children():
-		if hasattr(layer, 'reset_parameters'):
-			layer.reset_parameters()
-
+# The models live in DGLClassifierSweep so that worker processes can import them without bpy.
+# Classifiers saved before the move are unpickled through these names.
+GCN_Classic = DGLClassifierSweep.GCN_Classic
+GCN_GINConv = DGLClassifierSweep.GCN_GINConv
+GCN_GraphConv = DGLClassifierSweep.GCN_GraphConv
+GCN_SAGEConv = DGLClassifierSweep.GCN_SAGEConv
+GCN_TAGConv = DGLClassifierSweep.GCN_TAGConv
 
 class ClassifierSplit:
 	def __init__(self, hparams, trainingDataset):
@@ -243,36 +43,8 @@ class ClassifierSplit:
 		device = torch.device("cpu")
 		self.trainingDataset = trainingDataset
 		self.hparams = hparams
-		if hparams.conv_layer_type == 'Classic':
-			self.model = GCN_Classic(trainingDataset.dim_nfeats, hparams.hidden_layers, 
-                            trainingDataset.gclasses).to(device)
-		elif hparams.conv_layer_type == 'GINConv':
-			self.model = GCN_GINConv(trainingDataset.dim_nfeats, hparams.hidden_layers, 
-                            trainingDataset.gclasses, hparams.pooling).to(device)
-		elif hparams.conv_layer_type == 'GraphConv':
-			self.model = GCN_GraphConv(trainingDataset.dim_nfeats, hparams.hidden_layers, 
-                            trainingDataset.gclasses, hparams.pooling).to(device)
-		elif hparams.conv_layer_type == 'SAGEConv':
-			self.model = GCN_SAGEConv(trainingDataset.dim_nfeats, hparams.hidden_layers, 
-                            trainingDataset.gclasses, hparams.pooling).to(device)
-		elif hparams.conv_layer_type == 'TAGConv':
-			self.model = GCN_TAGConv(trainingDataset.dim_nfeats, hparams.hidden_layers, 
-                            trainingDataset.gclasses, hparams.pooling).to(device)
-		elif hparams.conv_layer_type == 'GCN':
-			self.model = GCN(trainingDataset.dim_nfeats, hparams.hidden_layers, 
-                            trainingDataset.gclasses).to(device)
-		else:
-			raise NotImplementedError
-
-		if hparams.optimizer_str == "Adadelta":
-			self.optimizer = torch.optim.Adadelta(self.model.parameters(), eps=hparams.eps, 
-                                            lr=hparams.lr, rho=hparams.rho, weight_decay=hparams.weight_decay)
-		elif hparams.optimizer_str == "Adagrad":
-			self.optimizer = torch.optim.Adagrad(self.model.parameters(), eps=hparams.eps, 
-                                            lr=hparams.lr, lr_decay=hparams.lr_decay, weight_decay=hparams.weight_decay)
-		elif hparams.optimizer_str == "Adam":
-			self.optimizer = torch.optim.Adam(self.model.parameters(), amsgrad=hparams.amsgrad, betas=hparams.betas, eps=hparams.eps, 
-                                            lr=hparams.lr, maximize=hparams.maximize, weight_decay=hparams.weight_decay)
+		self.model = DGLClassifierSweep.buildModel(hparams, trainingDataset).to(device)
+		self.optimizer = DGLClassifierSweep.buildOptimizer(hparams, self.model)
 		self.use_gpu = hparams.use_gpu
 		self.training_loss_list = []
 		self.testing_loss_list = []
@@ -371,33 +143,8 @@ class ClassifierKFold:
 		# at beginning of the script
 		#device = torch.device("cuda:0" if torch.cuda.is_available() else "cpu")
 		device = torch.device("cpu")
-		if hparams.conv_layer_type == 'Classic':
-			self.model = GCN_Classic(trainingDataset.dim_nfeats, hparams.hidden_layers, 
-                            trainingDataset.gclasses).to(device)
-		elif hparams.conv_layer_type == 'GINConv':
-			self.model = GCN_GINConv(trainingDataset.dim_nfeats, hparams.hidden_layers, 
-                            trainingDataset.gclasses, hparams.pooling).to(device)
-		elif hparams.conv_layer_type == 'GraphConv':
-			self.model = GCN_GraphConv(trainingDataset.dim_nfeats, hparams.hidden_layers, 
-                            trainingDataset.gclasses, hparams.pooling).to(device)
-		elif hparams.conv_layer_type == 'SAGEConv':
-			self.model = GCN_SAGEConv(trainingDataset.dim_nfeats, hparams.hidden_layers, 
-                            trainingDataset.gclasses, hparams.pooling).to(device)
-		elif hparams.conv_layer_type == 'TAGConv':
-			self.model = GCN_TAGConv(trainingDataset.dim_nfeats, hparams.hidden_layers, 
-                            trainingDataset.gclasses, hparams.pooling).to(device)
-		else:
-			raise NotImplementedError
-
-		if hparams.optimizer_str == "Adadelta":
-			self.optimizer = torch.optim.Adadelta(self.model.parameters(), eps=hparams.eps, 
-                                            lr=hparams.lr, rho=hparams.rho, weight_decay=hparams.weight_decay)
-		elif hparams.optimizer_str == "Adagrad":
-			self.optimizer = torch.optim.Adagrad(self.model.parameters(), eps=hparams.eps, 
-                                            lr=hparams.lr, lr_decay=hparams.lr_decay, weight_decay=hparams.weight_decay)
-		elif hparams.optimizer_str == "Adam":
-			self.optimizer = torch.optim.Adam(self.model.parameters(), amsgrad=hparams.amsgrad, betas=hparams.betas, eps=hparams.eps, 
-                                            lr=hparams.lr, maximize=hparams.maximize, weight_decay=hparams.weight_decay)
+		self.model = DGLClassifierSweep.buildModel(hparams, trainingDataset).to(device)
+		self.optimizer = DGLClassifierSweep.buildOptimizer(hparams, self.model)
 		self.use_gpu = hparams.use_gpu
 		self.training_loss_list = []
 		self.testing_loss_list = []
@@ -439,7 +186,7 @@ class ClassifierKFold:
 												batch_size=self.hparams.batch_size,
 												drop_last=False)
 			# Init the neural network
-			self.model.apply(reset_weights)
+			self.model.apply(DGLClassifierSweep.reset_weights)
 
 			# Run the training loop for defined number of epochs
 			for _ in range(self.hparams.epochs):
@@ -571,6 +318,70 @@ class ClassifierKFold:
 			# Save the entire model
 			torch.save(self.model, self.hparams.checkpoint_path)
 
+def meanCurve(curves):
+	return [sum(l) / len(l) for l in Replication.transposeList(curves)]
+
+def writeResults(i, results_path, data_list):
+	if not results_path:
+		return
+	timestamp_str, duration, model, optimizer_str, cv_type, split, k_folds, hidden_layers, conv_layer_type, pooling, lr, batch_size, epoch_list, training_accuracy, testing_accuracy, training_loss, testing_loss = data_list
+	d2 = [[timestamp_str], [duration], [optimizer_str], [cv_type], [split], [k_folds], hidden_layers, [conv_layer_type], [pooling], [lr], [batch_size], epoch_list, training_accuracy, testing_accuracy, training_loss, testing_loss]
+	d2 = Replication.iterate(d2)
+	d2 = Replication.transposeList(d2)
+	df = pd.DataFrame(d2, columns= ['TimeStamp', 'Duration', 'Optimizer', 'CV Type', 'Split', 'K-Folds', 'HL Widths', 'Conv Layer Type', 'Pooling', 'Learning Rate', 'Batch Size', 'Epochs', 'Training Accuracy', 'Testing Accuracy', 'Training Loss', 'Testing Loss'])
+	if i == 0:
+		df.to_csv(results_path, mode='w+', index = False, header=True)
+	else:
+		df.to_csv(results_path, mode='a', index = False, header=False)
+
+def finalModel(hparams, trainingDataset, validationDataset, folds):
+	"""
+	Finishes a configuration of a sweep the way runItem does. For K-Fold the fold models are
+	checkpointed and the best one is trained on all the data by ClassifierKFold.validate(), which
+	checks it against the validation dataset and saves the final checkpoint. For Holdout the fold
+	model is saved as is. Returns the final model.
+	"""
+	best = max(folds, key=lambda r: r['testing_accuracy'][-1])
+	if hparams.cv_type == "K-Fold":
+		if hparams.checkpoint_path is not None:
+			for r in folds:
+				torch.save(r['model'], hparams.checkpoint_path+"-fold_"+str(r['fold']))
+		classifier = ClassifierKFold(hparams, trainingDataset, validationDataset)
+		classifier.model = best['model']
+		classifier.optimizer = DGLClassifierSweep.buildOptimizer(hparams, classifier.model)
+		classifier.validate()
+		return classifier.model
+	if hparams.checkpoint_path is not None:
+		torch.save(best['model'], hparams.checkpoint_path)
+	return best['model']
+
+def sweepOutputs(inputs, results, pruned):
+	"""
+	Converts the sweep results into the per-configuration outputs of runItem and writes them to the
+	results CSV. As in the sequential path, every configuration is finished with finalModel() in
+	input order, so configurations sharing a checkpoint path overwrite each other's checkpoints.
+	The exception is a configuration stopped early: its classifier is the model of its best
+	completed fold and no checkpoint is saved for it.
+	"""
+	outputs = []
+	for i, ((hparams, trainingDataset, validationDataset), folds) in enumerate(zip(inputs, results)):
+		if len(folds) == 0:
+			continue
+		duration = sum(r['duration'] for r in folds)
+		if not pruned[i]:
+			start = time.time()
+			model = finalModel(hparams, trainingDataset, validationDataset, folds)
+			duration += time.time() - start
+		else:
+			model = max(folds, key=lambda r: r['testing_accuracy'][-1])['model']
+		utcnow = datetime.utcnow()
+		timestamp_str = "UTC-"+str(utcnow.year)+"-"+str(utcnow.month)+"-"+str(utcnow.day)+"-"+str(utcnow.hour)+"-"+str(utcnow.minute)+"-"+str(utcnow.second)
+		data_list = [timestamp_str, round(duration, 3), model, hparams.optimizer_str, hparams.cv_type, hparams.split, hparams.k_folds, hparams.hidden_layers, hparams.conv_layer_type, hparams.pooling, hparams.lr, hparams.batch_size, list(range(1,hparams.epochs+1)),
+			meanCurve([r['training_accuracy'] for r in folds]), meanCurve([r['testing_accuracy'] for r in folds]), meanCurve([r['training_loss'] for r in folds]), meanCurve([r['testing_loss'] for r in folds])]
+		writeResults(len(outputs), hparams.results_path, data_list)
+		outputs.append(data_list)
+	return outputs
+
 def runItem(i, item):
 	start = time.time()
 	hparams, trainingDataset, validationDataset = item
@@ -610,12 +421,7 @@ def runItem(i, item):
 	duration = round(end - start,3)
 	utcnow = datetime.utcnow()
 	timestamp_str = "UTC-"+str(utcnow.year)+"-"+str(utcnow.month)+"-"+str(utcnow.day)+"-"+str(utcnow.hour)+"-"+str(utcnow.minute)+"-"+str(utcnow.second)
-	epoch_list = list(range(1,classifier.hparams.epochs+1))
 	data_list = [timestamp_str, duration, classifier.model, classifier.hparams.optimizer_str, classifier.hparams.cv_type, classifier.hparams.split, classifier.hparams.k_folds, classifier.hparams.hidden_layers, classifier.hparams.conv_layer_type, classifier.hparams.pooling, classifier.hparams.lr, classifier.hparams.batch_size, list(range(1,classifier.hparams.epochs+1)), classifier.training_accuracy_list, classifier.testing_accuracy_list, classifier.training_loss_list, classifier.testing_loss_list]
-	d2 = [[timestamp_str], [duration], [classifier.hparams.optimizer_str], [classifier.hparams.cv_type], [classifier.hparams.split], [classifier.hparams.k_folds], classifier.hparams.hidden_layers, [classifier.hparams.conv_layer_type], [classifier.hparams.pooling], [classifier.hparams.lr], [classifier.hparams.batch_size], epoch_list, classifier.training_accuracy_list, classifier.testing_accuracy_list, classifier.training_loss_list, classifier.testing_loss_list]
-	d2 = Replication.iterate(d2)
-	d2 = Replication.transposeList(d2)
-	
 	data = {'TimeStamp': "UTC-"+str(utcnow.year)+"-"+str(utcnow.month)+"-"+str(utcnow.day)+"-"+str(utcnow.hour)+"-"+str(utcnow.minute)+"-"+str(utcnow.second),
 			'Duration': [duration],
 	        'Optimizer': [classifier.hparams.optimizer_str],
@@ -633,14 +439,7 @@ def runItem(i, item):
 			'Training Loss': [classifier.training_loss_list],
 			'Testing Loss': [classifier.testing_loss_list]
         }
-	if classifier.hparams.results_path:
-		df = pd.DataFrame(d2, columns= ['TimeStamp', 'Duration', 'Optimizer', 'CV Type', 'Split', 'K-Folds', 'HL Widths', 'Conv Layer Type', 'Pooling', 'Learning Rate', 'Batch Size', 'Epochs', 'Training Accuracy', 'Testing Accuracy', 'Training Loss', 'Testing Loss'])
-		if i == 0:
-			df.to_csv(classifier.hparams.results_path, mode='w+', index = False, header=True)
-		else:
-			df.to_csv(classifier.hparams.results_path, mode='a', index = False, header=False)
-
-
+	writeResults(i, classifier.hparams.results_path, data_list)
 	return data_list
 
 def sv_execute(node):
@@ -656,17 +455,8 @@ def sv_execute(node):
 	trainingDatasetList = Replication.flatten(trainingDatasetList)
 	validationDatasetList = Replication.flatten(validationDatasetList)
 	inputs = [hyperparametersList, trainingDatasetList, validationDatasetList]
-	if ((node.Replication) == "Trim"):
-		inputs = Replication.trim(inputs)
-		inputs = Replication.transposeList(inputs)
-	elif ((node.Replication) == "Default") or ((node.Replication) == "Iterate"):
-		inputs = Replication.iterate(inputs)
-		inputs = Replication.transposeList(inputs)
-	elif ((node.Replication) == "Repeat"):
-		inputs = Replication.repeat(inputs)
-		inputs = Replication.transposeList(inputs)
-	elif ((node.Replication) == "Interlace"):
-		inputs = list(Replication.interlace(inputs))
+	# The sweep reads the replicated inputs more than once
+	inputs = list(Replication.replicateInputs(inputs, node.Replication))
 	outputs = []
 	timestampList = []
 	classifierList = []
@@ -685,8 +475,25 @@ def sv_execute(node):
 	testing_accuracyList = []
 	training_lossList = []
 	testing_lossList = []
-	for i, anInput in enumerate(inputs):
-		output = runItem(i, anInput)
+	processesList = Replication.flatten(node.inputs['Processes'].sv_get(deepcopy=True))
+	threadsList = Replication.flatten(node.inputs['Threads'].sv_get(deepcopy=True))
+	marginList = Replication.flatten(node.inputs['Early Stopping Margin'].sv_get(deepcopy=True))
+	processes = int(processesList[0])
+	if processes > 1:
+		configs = [(anInput[0], anInput[1]) for anInput in inputs]
+		margin = None
+		if node.EarlyStoppingProp:
+			margin = float(marginList[0])
+		results, table, pruned = DGLClassifierSweep.sweep(configs, processes, int(threadsList[0]), margin)
+		runOutputs = sweepOutputs(inputs, results, pruned)
+		if len(configs) > 0 and configs[0][0].results_path:
+			root, ext = os.path.splitext(configs[0][0].results_path)
+			table.to_csv(root+"_folds"+ext, mode='w+', index = False, header=True)
+		node.outputs['Fold Results'].sv_set([table])
+	else:
+		runOutputs = [runItem(i, anInput) for i, anInput in enumerate(inputs)]
+		node.outputs['Fold Results'].sv_set([])
+	for output in runOutputs:
 		timestamp, duration, classifier, optimizer_str, cv_type, split, k_folds, hidden_layers, conv_layer_type, pooling, learning_rate, batch_size, epochs, training_accuracy, testing_accuracy, training_loss, testing_loss = output
 		timestampList.append(timestamp)
 		durationList.append(duration)
@@ -767,6 +574,10 @@ class SvDGLTrainClassifier(bpy.types.Node, SverchCustomTreeNode):
 	TrainingDatasetProp: StringProperty(name="Training Dataset", update=updateNode)
 	ValidationDatasetProp: StringProperty(name="Validation Dataset", update=updateNode)
 	AutoRunProp: BoolProperty(name="Auto Run", description="Automatically train and test the classifier", default=False, update=updateNode)
+	ProcessesProp: IntProperty(name="Processes", description="The number of worker processes used to train folds and configurations in parallel (1 trains them one after another)", default=1, min=1, update=updateNode)
+	ThreadsProp: IntProperty(name="Threads", description="The number of torch threads used by each worker process", default=1, min=1, update=updateNode)
+	EarlyStoppingProp: BoolProperty(name="Early Stopping", description="Cancel the remaining folds of configurations that clearly underperform (parallel runs only)", default=False, update=updateNode)
+	EarlyStoppingMarginProp: FloatProperty(name="Early Stopping Margin", description="The testing accuracy margin below the best configuration at which a configuration is stopped", default=0.1, min=0, max=1, update=updateNode)
 
 	def sv_init(self, context):
 		self.width = 200
@@ -774,6 +585,9 @@ class SvDGLTrainClassifier(bpy.types.Node, SverchCustomTreeNode):
 		self.inputs.new('SvStringsSocket', 'Training Dataset').prop_name="TrainingDatasetProp"
 		self.inputs.new('SvStringsSocket', 'Validation Dataset').prop_name="ValidationDatasetProp"
 		self.inputs.new('SvStringsSocket', 'Auto-Run').prop_name="AutoRunProp"
+		self.inputs.new('SvStringsSocket', 'Processes').prop_name="ProcessesProp"
+		self.inputs.new('SvStringsSocket', 'Threads').prop_name="ThreadsProp"
+		self.inputs.new('SvStringsSocket', 'Early Stopping Margin').prop_name="EarlyStoppingMarginProp"
 		self.outputs.new('SvStringsSocket', 'Timestamp')
 		self.outputs.new('SvStringsSocket', 'Duration')
 		self.outputs.new('SvStringsSocket', 'Classifier')
@@ -791,6 +605,7 @@ class SvDGLTrainClassifier(bpy.types.Node, SverchCustomTreeNode):
 		self.outputs.new('SvStringsSocket', 'Testing Accuracy')
 		self.outputs.new('SvStringsSocket', 'Training Loss')
 		self.outputs.new('SvStringsSocket', 'Testing Loss')
+		self.outputs.new('SvStringsSocket', 'Fold Results')
 		for socket in self.inputs:
 			if socket.prop_name != '':
 				socket.custom_draw = "SvDGLTrainClassifier_draw_socket"
@@ -804,6 +619,7 @@ class SvDGLTrainClassifier(bpy.types.Node, SverchCustomTreeNode):
 
 	def draw_buttons(self, context, layout):
 		layout.prop(self, "Replication",text="")
+		layout.prop(self, "EarlyStoppingProp")
 		#row = layout.row(align=True)
 		#row.scale_y = 2
 		#self.wrapper_tracked_ui_draw_op(row, "dgl.trainclassifierrun", icon='PLAY', text="RUN")
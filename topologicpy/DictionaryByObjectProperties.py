@@ -101,20 +101,7 @@ class SvDictionaryByObjectProperties(bpy.types.Node, SverchCustomTreeNode):
 		importAllList = self.inputs['Import All'].sv_get(deepcopy=True)
 		importAllList = Replication.flatten(importAllList)
 		inputs = [objectList, keyList, importAllList]
-		if ((self.Replication) == "Default"):
-			inputs = Replication.iterate(inputs)
-			inputs = Replication.transposeList(inputs)
-		elif ((self.Replication) == "Trim"):
-			inputs = Replication.trim(inputs)
-			inputs = Replication.transposeList(inputs)
-		elif ((self.Replication) == "Iterate"):
-			inputs = Replication.iterate(inputs)
-			inputs = Replication.transposeList(inputs)
-		elif ((self.Replication) == "Repeat"):
-			inputs = Replication.repeat(inputs)
-			inputs = Replication.transposeList(inputs)
-		elif ((self.Replication) == "Interlace"):
-			inputs = list(Replication.interlace(inputs))
+		inputs = Replication.replicateInputs(inputs, self.Replication)
 		outputs = []
 		for anInput in inputs:
 			outputs.append(processItem(anInput))
@@ -7,16 +7,7 @@ from sverchok.data_structure import updateNode
 from topologic import Dictionary, IntAttribute, DoubleAttribute, StringAttribute, ListAttribute
 
 from . import DictionaryByKeysValues, DictionaryValueAtKey
-
-# From https://stackabuse.com/python-how-to-flatten-list-of-lists/
-def flatten(element):
-	returnList = []
-	if isinstance(element, list) == True:
-		for anItem in element:
-			returnList = returnList + flatten(anItem)
-	else:
-		returnList = [element]
-	return returnList
+from . import Replication
 
 def listAttributeValues(listAttribute):
 	listAttributes = listAttribute.ListValue()
@@ -77,9 +68,9 @@ class SvDictionarySetValueAtKey(bpy.types.Node, SverchCustomTreeNode):
 		if not any(socket.is_linked for socket in self.inputs):
 			return
 		
-		DictionaryList = flatten(self.inputs['Dictionary'].sv_get(deepcopy=True))
-		key = flatten(self.inputs['Key'].sv_get(deepcopy=True))[0]
-		value = flatten(self.inputs['Value'].sv_get(deepcopy=True))[0]
+		DictionaryList = Replication.flatten(self.inputs['Dictionary'].sv_get(deepcopy=True))
+		key = Replication.flatten(self.inputs['Key'].sv_get(deepcopy=True))[0]
+		value = Replication.flatten(self.inputs['Value'].sv_get(deepcopy=True))[0]
 		outputs = []
 		for aDict in DictionaryList:
 			outputs.append(processItem(aDict, key, value))
@@ -0,0 +1,195 @@
+import topologic
+import math
+
+# Shared engine for transferring dictionaries between topologies. Containment tests against
+# faces and cells are expensive OCCT calls, so candidates are first bucketed in a uniform grid
+# by bounding box and only the surviving pairs are tested exactly. Topologies that cannot be
+# safely boxed (curved edges, or vertex/edge types whose containment tests are not bounded by
+# their extent) are treated as candidates for every query, which keeps the result identical to
+# testing every pair.
+
+def isStraight(edge, tol):
+	sv = edge.StartVertex()
+	ev = edge.EndVertex()
+	return abs(topologic.EdgeUtility.Length(edge) - topologic.VertexUtility.Distance(sv, ev)) <= tol
+
+def boundingBox(topology, tol):
+	if topology == None:
+		return None
+	if not (topology.Type() == topologic.Face.Type() or topology.Type() == topologic.Cell.Type()):
+		return None
+	edges = []
+	_ = topology.Edges(None, edges)
+	for anEdge in edges:
+		if not isStraight(anEdge, tol):
+			return None
+	vertices = []
+	_ = topology.Vertices(None, vertices)
+	if len(vertices) == 0:
+		return None
+	x = [v.X() for v in vertices]
+	y = [v.Y() for v in vertices]
+	z = [v.Z() for v in vertices]
+	return [min(x)-tol, min(y)-tol, min(z)-tol, max(x)+tol, max(y)+tol, max(z)+tol]
+
+def vertexCoordinates(vertex):
+	if vertex == None:
+		return None
+	return [vertex.X(), vertex.Y(), vertex.Z()]
+
+def cellSizeFromBoxes(boxes):
+	extents = sorted(max(b[3]-b[0], b[4]-b[1], b[5]-b[2]) for b in boxes if b != None)
+	if len(extents) == 0:
+		return 1.0
+	size = extents[len(extents)//2]
+	if size <= 0:
+		return 1.0
+	return size
+
+class UniformGrid:
+	def __init__(self, cellSize):
+		self.cellSize = cellSize
+		self.cells = {}
+
+	def cellIndex(self, x, y, z):
+		return (int(math.floor(x/self.cellSize)), int(math.floor(y/self.cellSize)), int(math.floor(z/self.cellSize)))
+
+	def cellRange(self, box):
+		lo = self.cellIndex(box[0], box[1], box[2])
+		hi = self.cellIndex(box[3], box[4], box[5])
+		for i in range(lo[0], hi[0]+1):
+			for j in range(lo[1], hi[1]+1):
+				for k in range(lo[2], hi[2]+1):
+					yield (i, j, k)
+
+	def cellCount(self, box):
+		lo = self.cellIndex(box[0], box[1], box[2])
+		hi = self.cellIndex(box[3], box[4], box[5])
+		return (hi[0]-lo[0]+1)*(hi[1]-lo[1]+1)*(hi[2]-lo[2]+1)
+
+	def insertPoint(self, index, point):
+		self.cells.setdefault(self.cellIndex(point[0], point[1], point[2]), []).append(index)
+
+	def insertBox(self, index, box):
+		for key in self.cellRange(box):
+			self.cells.setdefault(key, []).append(index)
+
+	def queryPoint(self, point):
+		return self.cells.get(self.cellIndex(point[0], point[1], point[2]), [])
+
+	def queryBox(self, box):
+		found = set()
+		if self.cellCount(box) > len(self.cells):
+			lo = self.cellIndex(box[0], box[1], box[2])
+			hi = self.cellIndex(box[3], box[4], box[5])
+			for key, indices in self.cells.items():
+				if lo[0] <= key[0] <= hi[0] and lo[1] <= key[1] <= hi[1] and lo[2] <= key[2] <= hi[2]:
+					found.update(indices)
+			return found
+		for key in self.cellRange(box):
+			found.update(self.cells.get(key, []))
+		return found
+
+def pointInBox(point, box):
+	return box[0] <= point[0] <= box[3] and box[1] <= point[1] <= box[4] and box[2] <= point[2] <= box[5]
+
+def mergeSourceDictionary(d, sourceKeys, sinkKeys, sinkValues, valueAtKey):
+	for aSourceKey in sourceKeys:
+		if aSourceKey not in sinkKeys:
+			sinkKeys.append(aSourceKey)
+			sinkValues.append("")
+	for i in range(len(sourceKeys)):
+		index = sinkKeys.index(sourceKeys[i])
+		sourceValue = valueAtKey(d, sourceKeys[i])
+		if sourceValue != None:
+			if sinkValues[index] != "":
+				if isinstance(sinkValues[index], list):
+					sinkValues[index].append(sourceValue)
+				else:
+					sinkValues[index] = [sinkValues[index], sourceValue]
+			else:
+				sinkValues[index] = sourceValue
+
+def transferSelectorsToSinks(sources, sinks, tol, relevantSelector, topologyContains, valueAtKey, processKeysValues):
+	"""
+	Each source with a non-empty dictionary is reduced to a selector vertex and transferred to the
+	first sink (in order) that contains it. A source is used at most once.
+	"""
+	selectors = {}
+	dictionaries = {}
+	unboxed = []
+	boxes = [boundingBox(sink, tol) for sink in sinks]
+	grid = UniformGrid(cellSizeFromBoxes(boxes))
+	for j, source in enumerate(sources):
+		d = source.GetDictionary()
+		if not d:
+			continue
+		sourceKeys = d.Keys()
+		if len(sourceKeys) == 0:
+			continue
+		iv = relevantSelector(source)
+		selectors[j] = iv
+		dictionaries[j] = (d, sourceKeys)
+		point = vertexCoordinates(iv)
+		if point == None:
+			unboxed.append(j)
+		else:
+			grid.insertPoint(j, point)
+	used = set()
+	for sink, box in zip(sinks, boxes):
+		if box == None:
+			candidates = sorted(selectors.keys())
+		else:
+			candidates = sorted(grid.queryBox(box).union(unboxed))
+		sinkKeys = []
+		sinkValues = []
+		for j in candidates:
+			if j in used:
+				continue
+			iv = selectors[j]
+			if box != None and iv != None and not pointInBox(vertexCoordinates(iv), box):
+				continue
+			if topologyContains(sink, iv, tol):
+				used.add(j)
+				d, sourceKeys = dictionaries[j]
+				mergeSourceDictionary(d, sourceKeys, sinkKeys, sinkValues, valueAtKey)
+		if len(sinkKeys) > 0 and len(sinkValues) > 0:
+			newDict = processKeysValues(sinkKeys, sinkValues)
+			_ = sink.SetDictionary(newDict)
+
+def transferSourcesToSinks(sources, sinks, tol, relevantSelector, topologyContains, valueAtKey, processKeysValues):
+	"""
+	Each sink is reduced to a selector vertex and receives the merged dictionaries of every
+	source that contains it, in source order.
+	"""
+	boxes = [boundingBox(source, tol) for source in sources]
+	grid = UniformGrid(cellSizeFromBoxes(boxes))
+	unboxed = []
+	for j, box in enumerate(boxes):
+		if box == None or grid.cellCount(box) > 64: # Very large boxes are cheaper to check directly
+			unboxed.append(j)
+		else:
+			grid.insertBox(j, box)
+	for sink in sinks:
+		sinkKeys = []
+		sinkValues = []
+		iv = relevantSelector(sink)
+		point = vertexCoordinates(iv)
+		if point == None:
+			candidates = range(len(sources))
+		else:
+			candidates = sorted(set(grid.queryPoint(point)).union(unboxed))
+		for j in candidates:
+			source = sources[j]
+			if point != None and boxes[j] != None and not pointInBox(point, boxes[j]):
+				continue
+			if topologyContains(source, iv, tol):
+				d = source.GetDictionary()
+				if d == None:
+					continue
+				sourceKeys = d.Keys()
+				if len(sourceKeys) > 0:
+					mergeSourceDictionary(d, sourceKeys, sinkKeys, sinkValues, valueAtKey)
+		if len(sinkKeys) > 0 and len(sinkValues) > 0:
+			newDict = processKeysValues(sinkKeys, sinkValues)
+			_ = sink.SetDictionary(newDict)
@@ -2,22 +2,13 @@ import bpy
 from bpy.props import IntProperty, FloatProperty, StringProperty
 from sverchok.node_tree import SverchCustomTreeNode
 from sverchok.data_structure import updateNode
+from . import Replication
 
 try:
 	import openstudio
 except:
 	raise Exception("Error: Could not import openstudio.")
 
-# From https://stackabuse.com/python-how-to-flatten-list-of-lists/
-def flatten(element):
-	returnList = []
-	if isinstance(element, list) == True:
-		for anItem in element:
-			returnList = returnList + flatten(anItem)
-	else:
-		returnList = [element]
-	return returnList
-
 def processItem(item):
     translator = openstudio.osversion.VersionTranslator()
     osmFile = openstudio.openstudioutilitiescore.toPath(item)
@@ -45,7 +36,7 @@ class SvEnergyModelByImportedOSM(bpy.types.Node, SverchCustomTreeNode):
 	def process(self):
 		try:
 			inputs = self.inputs['File Path'].sv_get(deepcopy=True)
-			inputs = flatten(inputs)
+			inputs = Replication.flatten(inputs)
 		except:
 			self.outputs['Eneregy Model'].sv_set([])
 			return
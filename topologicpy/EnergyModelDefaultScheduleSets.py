@@ -2,23 +2,13 @@ import bpy
 from bpy.props import IntProperty, FloatProperty, StringProperty
 from sverchok.node_tree import SverchCustomTreeNode
 from sverchok.data_structure import updateNode
+from . import Replication
 
 try:
 	import openstudio
 except:
 	raise Exception("Error: Could not import openstudio.")
 
-# From https://stackabuse.com/python-how-to-flatten-list-of-lists/
-def flatten(element):
-	returnList = []
-	if isinstance(element, list) == True:
-		for anItem in element:
-			returnList = returnList + flatten(anItem)
-	else:
-		returnList = [element]
-	return returnList
-
-
 def processItem(item):
     sets = item.getDefaultScheduleSets()
     names = []
@@ -46,7 +36,7 @@ class SvEnergyModelDefaultScheduleSets(bpy.types.Node, SverchCustomTreeNode):
 			self.outputs['Names'].sv_set([])
 			return
 		inputs = self.inputs['Energy Model'].sv_get(deepcopy=False)
-		inputs = flatten(inputs)
+		inputs = Replication.flatten(inputs)
 		setOutputs = []
 		nameOutputs = []
 		for anInput in inputs:
@@ -10,16 +10,7 @@ try:
 except:
 	raise Exception("Error: Could not import openstudio.")
 import os
-
-# From https://stackabuse.com/python-how-to-flatten-list-of-lists/
-def flatten(element):
-	returnList = []
-	if isinstance(element, list) == True:
-		for anItem in element:
-			returnList = returnList + flatten(anItem)
-	else:
-		returnList = [element]
-	return returnList
+from . import Replication
 
 def processItem(item):
 	return openstudio.gbxml.GbXMLForwardTranslator().modelToGbXMLString(item)
@@ -38,7 +29,7 @@ class SvEnergyModelGbXMLString(bpy.types.Node, SverchCustomTreeNode):
 
 	def process(self):
 		modelList = self.inputs['Energy Model'].sv_get(deepcopy=True)
-		modelList = flatten(modelList)
+		modelList = Replication.flatten(modelList)
 		inputs = modelList
 		outputs = []
 		for anInput in inputs:
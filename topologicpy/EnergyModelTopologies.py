@@ -5,21 +5,12 @@ from sverchok.data_structure import updateNode
 
 import topologic
 from topologic import Vertex, Edge, Wire, Face, Shell, Cell, CellComplex, Cluster, Topology, Graph
+from . import Replication, TopologyAttributeCache
 try:
 	import openstudio
 except:
 	raise Exception("Error: Could not import openstudio.")
 
-# From https://stackabuse.com/python-how-to-flatten-list-of-lists/
-def flatten(element):
-	returnList = []
-	if isinstance(element, list) == True:
-		for anItem in element:
-			returnList = returnList + flatten(anItem)
-	else:
-		returnList = [element]
-	return returnList
-
 def surfaceToFace(surface):
     surfaceEdges = []
     surfaceVertices = surface.vertices()
@@ -52,6 +43,7 @@ def addApertures(face, apertures):
 			w = 0.5
 		context = topologic.Context.ByTopologyParameters(face, u, v, w)
 		_ = topologic.Aperture.ByTopologyContext(aperture, context)
+		TopologyAttributeCache.session.invalidate(face, "apertures")
 	return face
 
 def processItem(item):
@@ -149,7 +141,7 @@ class SvEnergyModelTopologies(bpy.types.Node, SverchCustomTreeNode):
 			self.outputs['Apertures'].sv_set([])
 			return
 		inputs = self.inputs['Energy Model'].sv_get(deepcopy=True)
-		inputs = flatten(inputs)
+		inputs = Replication.flatten(inputs)
 		cellOutputs = []
 		apertureOutputs = []
 		shadingFaceOutputs = []
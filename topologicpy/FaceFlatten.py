@@ -5,16 +5,7 @@ from sverchok.data_structure import updateNode
 
 import topologic
 import math
-
-# From https://stackabuse.com/python-how-to-flatten-list-of-lists/
-def flatten(element):
-	returnList = []
-	if isinstance(element, list) == True:
-		for anItem in element:
-			returnList = returnList + flatten(anItem)
-	else:
-		returnList = [element]
-	return returnList
+from . import Replication
 
 def processItem(item):
 	origin = topologic.Vertex.ByCoordinates(0,0,0)
@@ -58,7 +49,7 @@ class SvFaceFlatten(bpy.types.Node, SverchCustomTreeNode):
 			self.outputs['Face'].sv_set([])
 			return
 		inputs = self.inputs['Face'].sv_get(deepcopy=False)
-		inputs = flatten(inputs)
+		inputs = Replication.flatten(inputs)
 		outputs = []
 		for anInput in inputs:
 			outputs.append(processItem(anInput))
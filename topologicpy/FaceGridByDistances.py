@@ -4,90 +4,7 @@ from sverchok.node_tree import SverchCustomTreeNode
 from sverchok.data_structure import updateNode
 
 import topologic
-# From https://stackabuse.com/python-how-to-flatten-list-of-lists/
-def flatten(element):
-	returnList = []
-	if isinstance(element, list) == True:
-		for anItem in element:
-			returnList = returnList + flatten(anItem)
-	else:
-		returnList = [element]
-	return returnList
-
-def repeat(list):
-	maxLength = len(list[0])
-	for aSubList in list:
-		newLength = len(aSubList)
-		if newLength > maxLength:
-			maxLength = newLength
-	for anItem in list:
-		if (len(anItem) > 0):
-			itemToAppend = anItem[-1]
-		else:
-			itemToAppend = None
-		for i in range(len(anItem), maxLength):
-			anItem.append(itemToAppend)
-	return list
-
-# From https://stackoverflow.com/questions/34432056/repeat-elements-of-list-between-each-other-until-we-reach-a-certain-length
-def onestep(cur,y,base):
-    # one step of the iteration
-    if cur is not None:
-        y.append(cur)
-        base.append(cur)
-    else:
-        y.append(base[0])  # append is simplest, for now
-        base = base[1:]+[base[0]]  # rotate
-    return base
-
-def iterate(list):
-	maxLength = len(list[0])
-	returnList = []
-	for aSubList in list:
-		newLength = len(aSubList)
-		if newLength > maxLength:
-			maxLength = newLength
-	for anItem in list:
-		for i in range(len(anItem), maxLength):
-			anItem.append(None)
-		y=[]
-		base=[]
-		for cur in anItem:
-			base = onestep(cur,y,base)
-		returnList.append(y)
-	return returnList
-
-def trim(list):
-	minLength = len(list[0])
-	returnList = []
-	for aSubList in list:
-		newLength = len(aSubList)
-		if newLength < minLength:
-			minLength = newLength
-	for anItem in list:
-		anItem = anItem[:minLength]
-		returnList.append(anItem)
-	return returnList
-
-# Adapted from https://stackoverflow.com/questions/533905/get-the-cartesian-product-of-a-series-of-lists
-def interlace(ar_list):
-    if not ar_list:
-        yield []
-    else:
-        for a in ar_list[0]:
-            for prod in interlace(ar_list[1:]):
-                yield [a,]+prod
-
-def transposeList(l):
-	length = len(l[0])
-	returnList = []
-	for i in range(length):
-		tempRow = []
-		for j in range(len(l)):
-			tempRow.append(l[j][i])
-		returnList.append(tempRow)
-	return returnList
-
+from . import Replication
 replication = [("Default", "Default", "", 1),("Trim", "Trim", "", 2),("Iterate", "Iterate", "", 3),("Repeat", "Repeat", "", 4),("Interlace", "Interlace", "", 5)]
 
 def selfMerge(item):
@@ -258,23 +175,23 @@ class SvFaceGridByDistances(bpy.types.Node, SverchCustomTreeNode):
 			return
 
 		faceList = self.inputs['Face'].sv_get(deepcopy=True)
-		faceList = flatten(faceList)
+		faceList = Replication.flatten(faceList)
 		clipList = self.inputs['Clip'].sv_get(deepcopy=True)
-		clipList = flatten(clipList)
+		clipList = Replication.flatten(clipList)
 		if not (self.inputs['uOrigin'].is_linked):
 			uOriginList = []
 			for aFace in faceList:
 				uOriginList.append(topologic.FaceUtility.VertexAtParameters(aFace, 0, 0))
 		else:
 			uOriginList = self.inputs['uOrigin'].sv_get(deepcopy=True)
-			uOriginList = flatten(uOriginList)
+			uOriginList = Replication.flatten(uOriginList)
 		if not (self.inputs['vOrigin'].is_linked):
 			vOriginList = []
 			for aFace in faceList:
 				vOriginList.append(topologic.FaceUtility.VertexAtParameters(aFace, 0, 0))
 		else:
 			vOriginList = self.inputs['vOrigin'].sv_get(deepcopy=True)
-			vOriginList = flatten(vOriginList)
+			vOriginList = Replication.flatten(vOriginList)
 		if self.inputs['uRange'].is_linked:
 			uRangeList = self.inputs['uRange'].sv_get(deepcopy=False)
 		else:
@@ -284,20 +201,7 @@ class SvFaceGridByDistances(bpy.types.Node, SverchCustomTreeNode):
 		else:
 			vRangeList = []
 		inputs = [faceList, uRangeList, vRangeList, uOriginList, vOriginList, clipList]
-		if ((self.Replication) == "Default"):
-			inputs = iterate(inputs)
-			inputs = transposeList(inputs)
-		elif ((self.Replication) == "Trim"):
-			inputs = trim(inputs)
-			inputs = transposeList(inputs)
-		elif ((self.Replication) == "Iterate"):
-			inputs = iterate(inputs)
-			inputs = transposeList(inputs)
-		elif ((self.Replication) == "Repeat"):
-			inputs = repeat(inputs)
-			inputs = transposeList(inputs)
-		elif ((self.Replication) == "Interlace"):
-			inputs = list(interlace(inputs))
+		inputs = Replication.replicateInputs(inputs, self.Replication)
 		u = []
 		v = []
 		uv = []
@@ -1,9 +1,14 @@
 import topologic
+from topologicpy import TopologyAttributeCache
 
 def processItem(item, outputType, decimals):
 	face, u, v = item
 	try:
-		coords = topologic.FaceUtility.NormalAtParameters(face, u, v)
+		if u == 0.5 and v == 0.5:
+			# The face centre normal is shared by many nodes, so it is read through the session cache
+			coords = TopologyAttributeCache.normal(face, TopologyAttributeCache.session)
+		else:
+			coords = topologic.FaceUtility.NormalAtParameters(face, u, v)
 		x = round(coords[0], decimals)
 		y = round(coords[1], decimals)
 		z = round(coords[2], decimals)
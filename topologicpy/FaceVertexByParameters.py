@@ -4,72 +4,7 @@ from sverchok.node_tree import SverchCustomTreeNode
 from sverchok.data_structure import updateNode
 
 import topologic
-
-# From https://stackabuse.com/python-how-to-flatten-list-of-lists/
-def flatten(element):
-	returnList = []
-	if isinstance(element, list) == True:
-		for anItem in element:
-			returnList = returnList + flatten(anItem)
-	else:
-		returnList = [element]
-	return returnList
-
-def repeat(list):
-	maxLength = len(list[0])
-	for aSubList in list:
-		newLength = len(aSubList)
-		if newLength > maxLength:
-			maxLength = newLength
-	for anItem in list:
-		if (len(anItem) > 0):
-			itemToAppend = anItem[-1]
-		else:
-			itemToAppend = None
-		for i in range(len(anItem), maxLength):
-			anItem.append(itemToAppend)
-	return list
-
-# From https://stackoverflow.com/questions/34432056/repeat-elements-of-list-between-each-other-until-we-reach-a-certain-length
-def onestep(cur,y,base):
-    # one step of the iteration
-    if cur is not None:
-        y.append(cur)
-        base.append(cur)
-    else:
-        y.append(base[0])  # append is simplest, for now
-        base = base[1:]+[base[0]]  # rotate
-    return base
-
-def iterate(list):
-	maxLength = len(list[0])
-	returnList = []
-	for aSubList in list:
-		newLength = len(aSubList)
-		if newLength > maxLength:
-			maxLength = newLength
-	for anItem in list:
-		for i in range(len(anItem), maxLength):
-			anItem.append(None)
-		y=[]
-		base=[]
-		for cur in anItem:
-			base = onestep(cur,y,base)
-			# print(base,y)
-		returnList.append(y)
-	return returnList
-
-def trim(list):
-	minLength = len(list[0])
-	returnList = []
-	for aSubList in list:
-		newLength = len(aSubList)
-		if newLength < minLength:
-			minLength = newLength
-	for anItem in list:
-		anItem = anItem[:minLength]
-		returnList.append(anItem)
-	return returnList
+from . import Replication
 
 # Adapted from https://stackoverflow.com/questions/533905/get-the-cartesian-product-of-a-series-of-lists
 def lace(ar_list):
@@ -80,16 +15,6 @@ def lace(ar_list):
             for prod in lace(ar_list[1:]):
                 yield [a,]+prod
 
-def transposeList(l):
-	length = len(l[0])
-	returnList = []
-	for i in range(length):
-		tempRow = []
-		for j in range(len(l)):
-			tempRow.append(l[j][i])
-		returnList.append(tempRow)
-	return returnList
-
 def processItem(item):
 	face = item[0]
 	u = item[1]
@@ -126,21 +51,21 @@ class SvFaceVertexByParameters(bpy.types.Node, SverchCustomTreeNode):
 			self.outputs['Vertex'].sv_set([])
 			return
 		faceList = self.inputs['Face'].sv_get(deepcopy=True)
-		faceList = flatten(faceList)
+		faceList = Replication.flatten(faceList)
 		uList = self.inputs['U'].sv_get(deepcopy=True)
-		uList = flatten(uList)
+		uList = Replication.flatten(uList)
 		vList = self.inputs['V'].sv_get(deepcopy=True)
-		vList = flatten(vList)
+		vList = Replication.flatten(vList)
 		inputs = []
 		if ((self.Lacing) == "Trim"):
-			inputs = trim([faceList, uList, vList])
-			inputs = transposeList(inputs)
+			inputs = Replication.trim([faceList, uList, vList])
+			inputs = Replication.transposeList(inputs)
 		if ((self.Lacing) == "Iterate"):
-			inputs = iterate([faceList, uList, vList])
-			inputs = transposeList(inputs)
+			inputs = Replication.iterate([faceList, uList, vList])
+			inputs = Replication.transposeList(inputs)
 		if ((self.Lacing) == "Repeat"):
-			inputs = repeat([faceList, uList, vList])
-			inputs = transposeList(inputs)
+			inputs = Replication.repeat([faceList, uList, vList])
+			inputs = Replication.transposeList(inputs)
 		if ((self.Lacing) == "Lace"):
 			inputs = list(lace([faceList, uList, vList]))
 		outputs = []
@@ -249,80 +249,87 @@ def mergeDictionaries2(sources):
 		return processKeysValues(sinkKeys, sinkValues)
 	return None
 
+def cellKey(cell):
+	vertices = []
+	_ = cell.Vertices(None, vertices)
+	return tuple(sorted((v.X(), v.Y(), v.Z()) for v in vertices))
+
+def cellAdjacency(topology, cells):
+	"""
+	Returns a dictionary mapping each pair (i, j), i < j, of adjacent cell indices to the list of
+	faces they share. Built from a single pass over the faces of the topology: adjacent cells are
+	mapped back to their index through a hash of their vertex coordinates, with IsSame only used
+	to separate cells that share the same vertices.
+	"""
+	buckets = {}
+	for i, aCell in enumerate(cells):
+		buckets.setdefault(cellKey(aCell), []).append(i)
+	def cellIndex(aCell):
+		candidates = buckets.get(cellKey(aCell), [])
+		if len(candidates) == 1:
+			return candidates[0]
+		for i in candidates:
+			if topologic.Topology.IsSame(aCell, cells[i]):
+				return i
+		return None
+	adjacency = {}
+	faces = []
+	_ = topology.Faces(None, faces)
+	for aFace in faces:
+		faceCells = []
+		_ = aFace.Cells(topology, faceCells)
+		if len(faceCells) < 2:
+			continue
+		indices = sorted(set(i for i in (cellIndex(aCell) for aCell in faceCells) if i != None))
+		for m in range(len(indices)):
+			for n in range(m+1, len(indices)):
+				adjacency.setdefault((indices[m], indices[n]), []).append(aFace)
+	return adjacency
+
 def processCellComplex(item):
 	topology, direct, directApertures, viaSharedTopologies, viaSharedApertures, toExteriorTopologies, toExteriorApertures, toContents, useInternalVertex, storeBRep, tolerance = item
 	graph = None
 	edges = []
 	vertices = []
-	cellmat = []
-	if direct == True:
+	if direct == True or directApertures == True:
 		cells = []
 		_ = topology.Cells(None, cells)
-		# Create a matrix of zeroes
-		for i in range(len(cells)):
-			cellRow = []
-			for j in range(len(cells)):
-				cellRow.append(0)
-			cellmat.append(cellRow)
-		for i in range(len(cells)):
-			for j in range(len(cells)):
-				if (i != j) and cellmat[i][j] == 0:
-					cellmat[i][j] = 1
-					cellmat[j][i] = 1
-					sharedt = []
-					cells[i].SharedTopologies(cells[j], 8, sharedt)
-					if len(sharedt) > 0:
-						if useInternalVertex == True:
-							v1 = topologic.CellUtility.InternalVertex(cells[i], tolerance)
-							v2 = topologic.CellUtility.InternalVertex(cells[j], tolerance)
-						else:
-							v1 = cells[i].CenterOfMass()
-							v2 = cells[j].CenterOfMass()
-						e = topologic.Edge.ByStartVertexEndVertex(v1, v2)
-						mDict = mergeDictionaries(sharedt)
-						if mDict:
-							e.SetDictionary(mDict)
-						edges.append(e)
+		adjacency = cellAdjacency(topology, cells)
+		cellVertices = {}
+		def cellVertex(i):
+			if i not in cellVertices:
+				if useInternalVertex == True:
+					cellVertices[i] = topologic.CellUtility.InternalVertex(cells[i], tolerance)
+				else:
+					cellVertices[i] = cells[i].CenterOfMass()
+			return cellVertices[i]
+	if direct == True:
+		for i, j in sorted(adjacency.keys()):
+			sharedt = adjacency[(i, j)]
+			e = topologic.Edge.ByStartVertexEndVertex(cellVertex(i), cellVertex(j))
+			mDict = mergeDictionaries(sharedt)
+			if mDict:
+				e.SetDictionary(mDict)
+			edges.append(e)
 	if directApertures == True:
-		cellmat = []
-		cells = []
-		_ = topology.Cells(None, cells)
-		# Create a matrix of zeroes
-		for i in range(len(cells)):
-			cellRow = []
-			for j in range(len(cells)):
-				cellRow.append(0)
-			cellmat.append(cellRow)
-		for i in range(len(cells)):
-			for j in range(len(cells)):
-				if (i != j) and cellmat[i][j] == 0:
-					cellmat[i][j] = 1
-					cellmat[j][i] = 1
-					sharedt = []
-					cells[i].SharedTopologies(cells[j], 8, sharedt)
-					if len(sharedt) > 0:
-						apertureExists = False
-						for x in sharedt:
-							apList = []
-							_ = x.Apertures(apList)
-							if len(apList) > 0:
-								apTopList = []
-								for ap in apList:
-									apTopList.append(ap.Topology())
-								apertureExists = True
-								break
-						if apertureExists:
-							if useInternalVertex == True:
-								v1 = topologic.CellUtility.InternalVertex(cells[i], tolerance)
-								v2 = topologic.CellUtility.InternalVertex(cells[j], tolerance)
-							else:
-								v1 = cells[i].CenterOfMass()
-								v2 = cells[j].CenterOfMass()
-							e = topologic.Edge.ByStartVertexEndVertex(v1, v2)
-							mDict = mergeDictionaries(apTopList)
-							if mDict:
-								e.SetDictionary(mDict)
-							edges.append(e)
+		for i, j in sorted(adjacency.keys()):
+			sharedt = adjacency[(i, j)]
+			apertureExists = False
+			for x in sharedt:
+				apList = []
+				_ = x.Apertures(apList)
+				if len(apList) > 0:
+					apTopList = []
+					for ap in apList:
+						apTopList.append(ap.Topology())
+					apertureExists = True
+					break
+			if apertureExists:
+				e = topologic.Edge.ByStartVertexEndVertex(cellVertex(i), cellVertex(j))
+				mDict = mergeDictionaries(apTopList)
+				if mDict:
+					e.SetDictionary(mDict)
+				edges.append(e)
 
 	cells = []
 	_ = topology.Cells(None, cells)
@@ -1515,7 +1522,7 @@ class SvGraphByTopology(bpy.types.Node, SverchCustomTreeNode):
 			inputs = Replication.repeat(inputs)
 			inputs = Replication.transposeList(inputs)
 		elif ((self.Replication) == "Interlace"):
-			inputs = list(Replication.interlace(inputs))
+			inputs = Replication.interlace(inputs)
 		for anInput in inputs:
 			outputs.append(processItem(anInput))
 		self.outputs['Graph'].sv_set(outputs)
@@ -0,0 +1,127 @@
+import topologic
+import numpy as np
+import math
+from . import GraphSnapshot
+from concurrent.futures import ProcessPoolExecutor
+try:
+	from scipy.sparse import csr_matrix
+	from scipy.sparse.csgraph import shortest_path
+except ImportError:
+	csr_matrix = None
+
+# Space syntax depth and centrality measures computed on the CSR (compressed sparse row)
+# adjacency of a GraphSnapshot. The graph is queried once; every breadth-first search afterwards
+# runs on NumPy arrays, one search per source vertex. When SciPy is available the searches run in its
+# compiled csgraph routines, a block of sources at a time.
+
+def csrAdjacency(graph, tolerance=0.0001):
+	"""
+	Returns [vertices, indptr, indices] where the neighbours of vertex i are indices[indptr[i]:indptr[i+1]].
+	"""
+	snapshot = GraphSnapshot.processItem(graph, None, tolerance)
+	return [snapshot.vertices, snapshot.indptr, snapshot.indices]
+
+def bfsDepths(indptr, indices, source):
+	"""
+	Returns the array of topological distances from source to every vertex (-1 when unreachable).
+	"""
+	depth = np.full(len(indptr)-1, -1, dtype=np.int64)
+	depth[source] = 0
+	frontier = np.array([source], dtype=np.int64)
+	level = 0
+	while len(frontier) > 0:
+		level += 1
+		starts = indptr[frontier]
+		counts = indptr[frontier+1] - starts
+		total = int(counts.sum())
+		if total == 0:
+			break
+		offsets = np.repeat(starts - np.cumsum(counts) + counts, counts)
+		candidates = indices[offsets + np.arange(total)]
+		candidates = np.unique(candidates[depth[candidates] < 0])
+		depth[candidates] = level
+		frontier = candidates
+	return depth
+
+def depthSums(indptr, indices, sources):
+	"""
+	Returns [totalDepth, reachable] arrays for the input sources, where reachable counts the
+	vertices reachable from each source including itself.
+	"""
+	totals = np.zeros(len(sources), dtype=np.int64)
+	reachable = np.zeros(len(sources), dtype=np.int64)
+	if csr_matrix != None and len(sources) > 0:
+		n = len(indptr)-1
+		matrix = csr_matrix((np.ones(len(indices)), indices, indptr), shape=(n, n))
+		for start in range(0, len(sources), 256):
+			block = sources[start:start+256]
+			depth = shortest_path(matrix, method="D", directed=False, unweighted=True, indices=block)
+			reached = np.isfinite(depth)
+			totals[start:start+len(block)] = np.where(reached, depth, 0).sum(axis=1)
+			reachable[start:start+len(block)] = reached.sum(axis=1)
+		return [totals, reachable]
+	for n, source in enumerate(sources):
+		depth = bfsDepths(indptr, indices, source)
+		reached = depth >= 0
+		totals[n] = depth[reached].sum()
+		reachable[n] = reached.sum()
+	return [totals, reachable]
+
+def diamondValue(k):
+	# Hillier and Hanson's D value used to relativise the relative asymmetry of a k-vertex system
+	return 2.0*(k*(math.log2((k+2.0)/3.0) - 1.0) + 1.0)/((k-1.0)*(k-2.0))
+
+def measures(totals, reachable):
+	"""
+	Returns a dictionary of totalDepth, meanDepth, integration and closeness arrays.
+	"""
+	n = len(totals)
+	meanDepth = np.zeros(n)
+	integration = np.zeros(n)
+	closeness = np.zeros(n)
+	for i in range(n):
+		k = reachable[i]
+		if k < 2 or totals[i] == 0:
+			continue
+		meanDepth[i] = totals[i]/(k-1.0)
+		closeness[i] = (k-1.0)/totals[i]
+		if k > 2:
+			ra = 2.0*(meanDepth[i]-1.0)/(k-2.0)
+			rra = ra/diamondValue(k)
+			if rra > 0:
+				integration[i] = 1.0/rra
+	return {"totalDepth": totals, "meanDepth": meanDepth, "integration": integration, "closeness": closeness, "reachable": reachable}
+
+def processAdjacency(indptr, indices, sources=None, processes=None):
+	"""
+	Computes the depth and centrality measures for the input source indices (all vertices by
+	default). With processes > 1 the sources are split across a process pool.
+	"""
+	if sources is None:
+		sources = np.arange(len(indptr)-1)
+	sources = np.asarray(sources, dtype=np.int64)
+	if processes == None or processes < 2 or len(sources) < 2*processes:
+		totals, reachable = depthSums(indptr, indices, sources)
+	else:
+		chunks = np.array_split(sources, processes*4)
+		with ProcessPoolExecutor(max_workers=processes) as executor:
+			results = list(executor.map(depthSums, [indptr]*len(chunks), [indices]*len(chunks), chunks))
+		totals = np.concatenate([r[0] for r in results])
+		reachable = np.concatenate([r[1] for r in results])
+	return measures(totals, reachable)
+
+def processItem(graph, vertexList=None, processes=None, tolerance=0.0001):
+	"""
+	Returns [vertices, measures] where measures holds totalDepth, meanDepth, integration and
+	closeness arrays aligned with vertices (the graph vertices, or the input vertexList).
+	"""
+	snapshot = GraphSnapshot.processItem(graph, None, tolerance)
+	if vertexList == None or len(vertexList) == 0:
+		return [snapshot.vertices, processAdjacency(snapshot.indptr, snapshot.indices, None, processes)]
+	sources = []
+	for aVertex in vertexList:
+		i = snapshot.index(aVertex)
+		if i == None:
+			raise Exception("Graph.DepthMap - Error: The input vertex is not a vertex of the input graph")
+		sources.append(i)
+	return [vertexList, processAdjacency(snapshot.indptr, snapshot.indices, sources, processes)]
@@ -6,118 +6,23 @@ from sverchok.data_structure import updateNode
 import topologic
 from topologic import Vertex, Edge, Wire, Face, Shell, Cell, CellComplex, Cluster, Topology, Graph
 import time
-
-# From https://stackabuse.com/python-how-to-flatten-list-of-lists/
-def flatten(element):
-	returnList = []
-	if isinstance(element, list) == True:
-		for anItem in element:
-			returnList = returnList + flatten(anItem)
-	else:
-		returnList = [element]
-	return returnList
-
-def repeat(list):
-	maxLength = len(list[0])
-	for aSubList in list:
-		newLength = len(aSubList)
-		if newLength > maxLength:
-			maxLength = newLength
-	for anItem in list:
-		if (len(anItem) > 0):
-			itemToAppend = anItem[-1]
-		else:
-			itemToAppend = None
-		for i in range(len(anItem), maxLength):
-			anItem.append(itemToAppend)
-	return list
-
-# From https://stackoverflow.com/questions/34432056/repeat-elements-of-list-between-each-other-until-we-reach-a-certain-length
-def onestep(cur,y,base):
-    # one step of the iteration
-    if cur is not None:
-        y.append(cur)
-        base.append(cur)
-    else:
-        y.append(base[0])  # append is simplest, for now
-        base = base[1:]+[base[0]]  # rotate
-    return base
-
-def iterate(list):
-	maxLength = len(list[0])
-	returnList = []
-	for aSubList in list:
-		newLength = len(aSubList)
-		if newLength > maxLength:
-			maxLength = newLength
-	for anItem in list:
-		for i in range(len(anItem), maxLength):
-			anItem.append(None)
-		y=[]
-		base=[]
-		for cur in anItem:
-			base = onestep(cur,y,base)
-		returnList.append(y)
-	return returnList
-
-def trim(list):
-	minLength = len(list[0])
-	returnList = []
-	for aSubList in list:
-		newLength = len(aSubList)
-		if newLength < minLength:
-			minLength = newLength
-	for anItem in list:
-		anItem = anItem[:minLength]
-		returnList.append(anItem)
-	return returnList
-
-# Adapted from https://stackoverflow.com/questions/533905/get-the-cartesian-product-of-a-series-of-lists
-def interlace(ar_list):
-    if not ar_list:
-        yield []
-    else:
-        for a in ar_list[0]:
-            for prod in interlace(ar_list[1:]):
-                yield [a,]+prod
-
-def transposeList(l):
-	length = len(l[0])
-	returnList = []
-	for i in range(length):
-		tempRow = []
-		for j in range(len(l)):
-			tempRow.append(l[j][i])
-		returnList.append(tempRow)
-	return returnList
+from . import GraphCentrality
+from . import Replication
 
 def processItem(item):
-	print(item)
 	graph = item[0]
 	vertexList = item[1]
 	tolerance = item[2]
-	graphVertices = []
-	_ = graph.Vertices(graphVertices)
-	if len(vertexList) == 0:
-		vertexList = graphVertices
-	depthMap = []
-	for va in vertexList:
-		depth = 0
-		for vb in graphVertices:
-			if topologic.Topology.IsSame(va, vb):
-				dist = 0
-			else:
-				dist = graph.TopologicalDistance(va, vb, tolerance)
-			depth = depth + dist
-		depthMap.append(depth)
-	return depthMap
+	vertices, measures = GraphCentrality.processItem(graph, vertexList, None, tolerance)
+	# Vertices that cannot be reached from a source add nothing to its total depth
+	return [int(depth) for depth in measures["totalDepth"]]
 
 replication = [("Default", "Default", "", 1),("Trim", "Trim", "", 2),("Iterate", "Iterate", "", 3),("Repeat", "Repeat", "", 4),("Interlace", "Interlace", "", 5)]
 
 class SvGraphDepthMap(bpy.types.Node, SverchCustomTreeNode):
 	"""
 	Triggers: Topologic
-	Tooltip: Outputs a depthmap (see https://en.wikipedia.org/wiki/Space_syntax) from an input graph, an input graph vertex, and a list of target graph vertices. If targets are left blank, it will use all vertices in the graph
+	Tooltip: Outputs a depthmap (see https://en.wikipedia.org/wiki/Space_syntax) from an input graph, an input graph vertex, and a list of target graph vertices. If targets are left blank, it will use all vertices in the graph. Unreachable vertices are not counted
 	"""
 	bl_idname = 'SvGraphDepthMap'
 	bl_label = 'Graph.DepthMap'
@@ -139,24 +44,24 @@ class SvGraphDepthMap(bpy.types.Node, SverchCustomTreeNode):
 			return
 		graphList = self.inputs['Graph'].sv_get(deepcopy=True)
 		vertexList = self.inputs['Vertex'].sv_get(deepcopy=True)
-		graphList = flatten(graphList)
+		graphList = Replication.flatten(graphList)
 		toleranceList = self.inputs['Tolerance'].sv_get(deepcopy=True)
-		toleranceList = flatten(toleranceList)
+		toleranceList = Replication.flatten(toleranceList)
 		inputs = [graphList, vertexList, toleranceList]
 		if ((self.Replication) == "Default"):
-			inputs = repeat(inputs)
-			inputs = transposeList(inputs)
+			inputs = Replication.repeat(inputs)
+			inputs = Replication.transposeList(inputs)
 		elif ((self.Replication) == "Trim"):
-			inputs = trim(inputs)
-			inputs = transposeList(inputs)
+			inputs = Replication.trim(inputs)
+			inputs = Replication.transposeList(inputs)
 		elif ((self.Replication) == "Iterate"):
-			inputs = iterate(inputs)
-			inputs = transposeList(inputs)
+			inputs = Replication.iterate(inputs)
+			inputs = Replication.transposeList(inputs)
 		elif ((self.Replication) == "Repeat"):
-			inputs = repeat(inputs)
-			inputs = transposeList(inputs)
+			inputs = Replication.repeat(inputs)
+			inputs = Replication.transposeList(inputs)
 		elif ((self.Replication) == "Interlace"):
-			inputs = list(interlace(inputs))
+			inputs = Replication.interlace(inputs)
 		outputs = []
 		for anInput in inputs:
 			outputs.append(processItem(anInput))
@@ -5,34 +5,275 @@ from sverchok.data_structure import updateNode
 #from sverchok.core.socket_data import SvGetSocketInfo
 
 import topologic
-from . import Replication, DictionaryValueAtKey
+from . import Replication, DictionaryValueAtKey, GraphSnapshot
 import pandas as pd
+import numpy as np
+import os
+import csv
 
-def vertexIndex(vertex, vertices):
-	for i in range(len(vertices)):
-		if topologic.Topology.IsSame(vertex, vertices[i]):
-			return i
-	return None
+class ColumnBuffer:
+	"""
+	Preallocated column arrays that grow by doubling, so rows from many graphs are appended
+	without building a DataFrame per graph.
+	"""
+	def __init__(self, columns, dtypes, capacity=4096):
+		self.columns = columns
+		self.arrays = [np.empty(capacity, dtype=dtype) for dtype in dtypes]
+		self.size = 0
+
+	def append(self, values):
+		n = len(values[0])
+		capacity = len(self.arrays[0])
+		if self.size+n > capacity:
+			while self.size+n > capacity:
+				capacity = capacity*2
+			self.arrays = [np.concatenate([array[:self.size], np.empty(capacity-self.size, dtype=array.dtype)]) for array in self.arrays]
+		for array, column in zip(self.arrays, values):
+			array[self.size:self.size+n] = column
+		self.size += n
+
+	def frame(self):
+		return pd.DataFrame({column: array[:self.size] for column, array in zip(self.columns, self.arrays)}, columns=self.columns)
+
+	def clear(self):
+		self.size = 0
+
+def parquetSchema(df, integerColumns=[]):
+	"""
+	Returns the Parquet schema of a table from its first chunk. Integer and float columns keep
+	their type. Other columns (dictionary values) are stored as float64 when every value is a
+	number or missing ('None'), as int64 for the label columns in integerColumns when the numbers
+	are whole, and as strings otherwise.
+	"""
+	import pyarrow as pa
+	fields = []
+	for column in df.columns:
+		values = df[column]
+		if pd.api.types.is_integer_dtype(values.dtype):
+			fields.append(pa.field(column, pa.int64()))
+			continue
+		if pd.api.types.is_float_dtype(values.dtype):
+			fields.append(pa.field(column, pa.float64()))
+			continue
+		numbers = pd.to_numeric(values, errors="coerce")
+		missing = values.isna() | (values.astype(str) == 'None')
+		if numbers.notna().any() and (numbers.notna() | missing).all():
+			if column in integerColumns and (numbers.dropna() % 1 == 0).all():
+				fields.append(pa.field(column, pa.int64()))
+			else:
+				fields.append(pa.field(column, pa.float64()))
+		else:
+			fields.append(pa.field(column, pa.string()))
+	return pa.schema(fields)
+
+def parquetTable(df, schema):
+	"""
+	Converts a chunk to the fixed schema of its table. Values that do not fit a numeric column
+	(e.g. 'None' placeholders) are stored as nulls.
+	"""
+	import pyarrow as pa
+	arrays = []
+	for field in schema:
+		values = df[field.name]
+		if pa.types.is_string(field.type):
+			arrays.append(pa.array(values.astype(str), type=field.type))
+		else:
+			numbers = pd.to_numeric(values, errors="coerce")
+			if pa.types.is_integer(field.type) and not pd.api.types.is_integer_dtype(numbers.dtype):
+				numbers = numbers.round()
+			arrays.append(pa.array(numbers, type=field.type, from_pandas=True))
+	return pa.Table.from_arrays(arrays, schema=schema)
 
-def graphVertices(graph):
-	vertices = []
-	if graph:
+class GraphTableWriter:
+	"""
+	Batched writer of the graphs, edges and nodes tables read by DGL. Rows are accumulated in
+	column buffers and flushed every chunkRows rows. The running graph id is kept in memory and in a
+	sidecar file next to the graphs table, checked against the last id of the table when appending.
+	With fileFormat="Parquet" the same columns are written to .parquet files (requires pyarrow)
+	with a schema fixed by the existing file or the first chunk.
+	"""
+	def __init__(self, graphs_file_path, edges_file_path, nodes_file_path, graph_id_header, graph_label_header, graph_num_nodes_header, edge_src_header, edge_dst_header, node_label_header, node_label_key, default_node_label, overwrite, fileFormat="CSV", chunkRows=100000):
+		self.fileFormat = fileFormat
+		self.paths = [self.tablePath(path) for path in [graphs_file_path, edges_file_path, nodes_file_path]]
+		self.graph_id_header = graph_id_header
+		self.graph_label_header = graph_label_header
+		self.node_label_header = node_label_header
+		self.node_label_key = node_label_key
+		self.default_node_label = default_node_label
+		self.overwrite = overwrite
+		self.chunkRows = chunkRows
+		self.sidecarPath = self.paths[0]+".next_id"
+		self.graphs = ColumnBuffer([graph_id_header, graph_label_header, graph_num_nodes_header], [np.int64, object, np.int64])
+		self.edges = ColumnBuffer([graph_id_header, edge_src_header, edge_dst_header], [np.int64, np.int64, np.int64])
+		self.nodes = None
+		self.nodeKeys = None
+		self.started = [False, False, False]
+		self.parquetWriters = [None, None, None]
+		self.schemas = [None, None, None]
+		self.tempPaths = [None, None, None]
+		if overwrite:
+			self.nextGraphId = 0
+		else:
+			self.nextGraphId = self.readNextGraphId()
+
+	def tablePath(self, path):
+		if self.fileFormat == "Parquet":
+			root, ext = os.path.splitext(path)
+			return root+".parquet"
+		return path
+
+	def readNextGraphId(self):
+		"""
+		Returns the next graph id from the sidecar file, unless it disagrees with the last graph id
+		of the graphs table, in which case the table wins.
+		"""
+		lastId = self.lastGraphId()
 		try:
-			_ = graph.Vertices(vertices)
-		except:
-			print("ERROR: (Topologic>Graph.Vertices) operation failed.")
-			vertices = None
-	if vertices:
-		return vertices
-	else:
-		return []
-
-def adjacentVertices(graph, vertex):
-	vertices = []
-	_ = graph.AdjacentVertices(vertex, vertices)
-	return list(vertices)
-
-def processItem(item):
+			with open(self.sidecarPath) as f:
+				nextId = int(f.read().strip())
+		except (OSError, ValueError):
+			nextId = None
+		if lastId == None:
+			return 0
+		if nextId != lastId+1:
+			return lastId+1
+		return nextId
+
+	def lastGraphId(self):
+		# Graph ids only grow, so the last id is read from the Parquet statistics or the last CSV row
+		path = self.paths[0]
+		if not os.path.exists(path):
+			return None
+		if self.fileFormat == "Parquet":
+			import pyarrow.parquet as pq
+			parquetFile = pq.ParquetFile(path)
+			metadata = parquetFile.metadata
+			column = metadata.schema.to_arrow_schema().get_field_index(self.graph_id_header)
+			lastId = None
+			for i in range(metadata.num_row_groups):
+				chunk = metadata.row_group(i).column(column)
+				statistics = chunk.statistics
+				if statistics is None or not statistics.has_min_max:
+					ids = pd.read_parquet(path, columns=[self.graph_id_header])[self.graph_id_header]
+					return int(ids.max()) if len(ids) > 0 else None
+				lastId = int(statistics.max) if lastId == None else max(lastId, int(statistics.max))
+			return lastId
+		with open(path, "rb") as f:
+			header = next(csv.reader([f.readline().decode("utf-8")]), [])
+			f.seek(0, os.SEEK_END)
+			position = f.tell()
+			tail = b""
+			while position > 0 and tail.strip().count(b"\n") < 1:
+				step = min(4096, position)
+				position -= step
+				f.seek(position)
+				tail = f.read(step)+tail
+		lines = tail.strip().split(b"\n")
+		if self.graph_id_header not in header or len(lines) == 0:
+			return None
+		row = next(csv.reader([lines[-1].decode("utf-8")]), [])
+		try:
+			return int(row[header.index(self.graph_id_header)])
+		except (IndexError, ValueError):
+			return None
+
+	def addGraph(self, graph, graph_label):
+		snapshot = GraphSnapshot.processItem(graph)
+		vertices = snapshot.vertices
+		n = len(vertices)
+		graph_id = self.nextGraphId
+		self.nextGraphId += 1
+		self.graphs.append([[graph_id], [graph_label], [n]])
+		degrees = snapshot.degrees()
+		self.edges.append([np.full(len(snapshot.indices), graph_id, dtype=np.int64), np.repeat(np.arange(n), degrees), snapshot.indices])
+		if n == 0:
+			return graph_id
+		if self.nodeKeys == None:
+			# All keys should be the same for all vertices, so we can get them from the first vertex
+			self.nodeKeys = [key for key in vertices[0].GetDictionary().Keys() if key != self.node_label_key]
+			columns = [self.graph_id_header, self.node_label_header, "X", "Y", "Z"]+self.nodeKeys
+			self.nodes = ColumnBuffer(columns, [np.int64, object, np.float64, np.float64, np.float64]+[object]*len(self.nodeKeys))
+		labels = []
+		extras = [[] for key in self.nodeKeys]
+		for v in vertices:
+			d = v.GetDictionary()
+			vLabel = DictionaryValueAtKey.processItem([d, self.node_label_key])
+			if not(vLabel):
+				vLabel = self.default_node_label
+			labels.append(vLabel)
+			keys = d.Keys()
+			for column, key in zip(extras, self.nodeKeys):
+				value = None
+				if key in keys:
+					value = DictionaryValueAtKey.processItem([d, key])
+				if not value:
+					value = 'None'
+				column.append(value)
+		xyz = np.round(snapshot.coordinates, 5)
+		self.nodes.append([np.full(n, graph_id, dtype=np.int64), labels, xyz[:,0], xyz[:,1], xyz[:,2]]+extras)
+		if self.edges.size+self.nodes.size >= self.chunkRows:
+			self.flush()
+		return graph_id
+
+	def writeTable(self, index, buffer):
+		if buffer == None or buffer.size == 0:
+			return
+		df = buffer.frame()
+		path = self.paths[index]
+		if self.fileFormat == "Parquet":
+			if self.parquetWriters[index] is None:
+				self.openParquetWriter(index, df)
+			self.parquetWriters[index].write_table(parquetTable(df, self.schemas[index]))
+		else:
+			if not self.started[index] and (self.overwrite or not os.path.exists(path)):
+				df.to_csv(path, mode='w+', index = False, header=True)
+			else:
+				df.to_csv(path, mode='a', index = False, header=False)
+		self.started[index] = True
+		buffer.clear()
+
+	def openParquetWriter(self, index, df):
+		"""
+		Opens the Parquet writer of a table on a temporary file. When appending, the schema is the
+		one of the existing file and its row groups are copied over one at a time; otherwise the
+		schema is fixed from the first chunk. close() moves the file into place.
+		"""
+		import pyarrow.parquet as pq
+		path = self.paths[index]
+		previous = None
+		if not self.overwrite and os.path.exists(path):
+			previous = pq.ParquetFile(path)
+			self.schemas[index] = previous.schema_arrow
+		else:
+			self.schemas[index] = parquetSchema(df, [self.graph_label_header, self.node_label_header])
+		self.tempPaths[index] = path+".tmp"
+		self.parquetWriters[index] = pq.ParquetWriter(self.tempPaths[index], self.schemas[index])
+		if previous is not None:
+			for i in range(previous.num_row_groups):
+				self.parquetWriters[index].write_table(previous.read_row_group(i))
+
+	def flush(self):
+		self.writeTable(0, self.graphs)
+		self.writeTable(1, self.edges)
+		self.writeTable(2, self.nodes)
+		with open(self.sidecarPath, "w") as f:
+			f.write(str(self.nextGraphId))
+
+	def close(self):
+		self.flush()
+		for index, writer in enumerate(self.parquetWriters):
+			if writer is not None:
+				writer.close()
+				os.replace(self.tempPaths[index], self.paths[index])
+		self.parquetWriters = [None, None, None]
+		self.tempPaths = [None, None, None]
+
+def processItem(item, writers=None, fileFormat="CSV"):
+	"""
+	Adds the input graphs to the writer of their file paths. Writers passed in through the writers
+	dictionary are shared across items and closed by the caller; otherwise the tables are written
+	before returning.
+	"""
 	graph_list, \
     graph_label_list, \
     graphs_file_path, \
@@ -50,91 +291,23 @@ def processItem(item):
 
 	if not isinstance(graph_list, list):
 		graph_list = [graph_list]
+	if not isinstance(graph_label_list, list):
+		graph_label_list = [graph_label_list]
+	key = (graphs_file_path, edges_file_path, nodes_file_path)
+	ownWriter = writers == None
+	if ownWriter:
+		writers = {}
+	writer = writers.get(key)
+	if writer == None:
+		writer = GraphTableWriter(graphs_file_path, edges_file_path, nodes_file_path, graph_id_header, graph_label_header, graph_num_nodes_header, edge_src_header, edge_dst_header, node_label_header, node_label_key, default_node_label, overwrite, fileFormat)
+		writers[key] = writer
 	for graph_index, graph in enumerate(graph_list):
-		graph_label = graph_label_list[graph_index]
-		# Export Graph Properties
-		vertices = graphVertices(graph)
-		graph_num_nodes = len(vertices)
-		if overwrite == False:
-			graphs = pd.read_csv(graphs_file_path)
-			max_id = max(list(graphs[graph_id_header]))
-			graph_id = max_id + graph_index + 1
-		else:
-			graph_id = graph_index
-		data = [[graph_id], [graph_label], [graph_num_nodes]]
-		data = Replication.iterate(data)
-		data = Replication.transposeList(data)
-		df = pd.DataFrame(data, columns= [graph_id_header, graph_label_header, graph_num_nodes_header])
-		if overwrite == False:
-			df.to_csv(graphs_file_path, mode='a', index = False, header=False)
-		else:
-			if graph_index == 0:
-				df.to_csv(graphs_file_path, mode='w+', index = False, header=True)
-			else:
-				df.to_csv(graphs_file_path, mode='a', index = False, header=False)
-
-		# Export Edge Properties
-		edge_src = []
-		edge_dst = []
-		edge_graph_id = [] #Repetitive list of graph_id for each edge
-		node_graph_id = [] #Repetitive list of graph_id for each vertex/node
-		node_labels = []
-		x_list = []
-		y_list = []
-		z_list = []
-		node_data = []
-		node_columns = [graph_id_header, node_label_header, "X", "Y", "Z"]
-		# All keys should be the same for all vertices, so we can get them from the first vertex
-		d = vertices[0].GetDictionary()
-		keys = d.Keys()
-		for key in keys:
-			if key != node_label_key: #We have already saved that in its own column
-				node_columns.append(key)
-		for i, v in enumerate(vertices):
-			# Might as well get the node labels since we are iterating through the vertices
-			d = v.GetDictionary()
-			vLabel = DictionaryValueAtKey.processItem([d, node_label_key])
-			if not(vLabel):
-				vLabel = default_node_label		
-			single_node_data = [graph_id, vLabel, round(float(v.X()),5), round(float(v.Y()),5), round(float(v.Z()),5)]
-			keys = d.Keys()
-			for key in keys:
-				if key != node_label_key and (key in node_columns):
-					value = DictionaryValueAtKey.processItem([d, key])
-					if not value:
-						value = 'None'
-					single_node_data.append(value)
-			node_data.append(single_node_data)
-			av = adjacentVertices(graph, v)
-			for k in range(len(av)):
-				vi = vertexIndex(av[k], vertices)
-				edge_graph_id.append(graph_id)
-				edge_src.append(i)
-				edge_dst.append(vi)
-		data = [edge_graph_id, edge_src, edge_dst]
-		data = Replication.iterate(data)
-		data = Replication.transposeList(data)
-		df = pd.DataFrame(data, columns= [graph_id_header, edge_src_header, edge_dst_header])
-		if overwrite == False:
-			df.to_csv(edges_file_path, mode='a', index = False, header=False)
-		else:
-			if graph_index == 0:
-				df.to_csv(edges_file_path, mode='w+', index = False, header=True)
-			else:
-				df.to_csv(edges_file_path, mode='a', index = False, header=False)
-
-		# Export Node Properties
-		df = pd.DataFrame(node_data, columns= node_columns)
-
-		if overwrite == False:
-			df.to_csv(nodes_file_path, mode='a', index = False, header=False)
-		else:
-			if graph_index == 0:
-				df.to_csv(nodes_file_path, mode='w+', index = False, header=True)
-			else:
-				df.to_csv(nodes_file_path, mode='a', index = False, header=False)
+		writer.addGraph(graph, graph_label_list[graph_index])
+	if ownWriter:
+		writer.close()
 	return True
 
+fileFormats = [("CSV", "CSV", "", 1),("Parquet", "Parquet", "", 2)]
 replication = [("Default", "Default", "", 1),("Trim", "Trim", "", 2),("Iterate", "Iterate", "", 3),("Repeat", "Repeat", "", 4),("Interlace", "Interlace", "", 5)]
 	
 class SvGraphExportToCSV(bpy.types.Node, SverchCustomTreeNode):
@@ -162,6 +335,7 @@ class SvGraphExportToCSV(bpy.types.Node, SverchCustomTreeNode):
 	DefaultNodeLabelProp: IntProperty(name="Default Node Label", description="The default node label to save if none is found", default=0, update=updateNode)
 
 	OverwriteProp: BoolProperty(name="Overwrite", default=True, update=updateNode)
+	FileFormat: EnumProperty(name="File Format", description="The format of the exported tables", default="CSV", items=fileFormats, update=updateNode)
 
 
 	FilePath: StringProperty(name="File Path", default="", subtype="FILE_PATH")
@@ -202,6 +376,7 @@ class SvGraphExportToCSV(bpy.types.Node, SverchCustomTreeNode):
 
 	def draw_buttons(self, context, layout):
 		layout.prop(self, "Replication",text="")
+		layout.prop(self, "FileFormat",text="")
 
 	def process(self):
 		if not any(socket.is_linked for socket in self.outputs):
@@ -277,10 +452,13 @@ class SvGraphExportToCSV(bpy.types.Node, SverchCustomTreeNode):
 			inputs = Replication.repeat(inputs)
 			inputs = Replication.transposeList(inputs)
 		elif ((self.Replication) == "Interlace"):
-			inputs = list(Replication.interlace(inputs))
+			inputs = Replication.interlace(inputs)
 		outputs = []
+		writers = {}
 		for anInput in inputs:
-			outputs.append(processItem(anInput))
+			outputs.append(processItem(anInput, writers, self.FileFormat))
+		for writer in writers.values():
+			writer.close()
 		self.outputs['Status'].sv_set(outputs)
 
 def register():
@@ -5,36 +5,12 @@ from sverchok.data_structure import updateNode
 #from sverchok.core.socket_data import SvGetSocketInfo
 
 import topologic
-from . import Replication, DictionaryValueAtKey
-
-
-def vertexIndex(vertex, vertices):
-	for i in range(len(vertices)):
-		if topologic.Topology.IsSame(vertex, vertices[i]):
-			return i
-	return None
-
-def graphVertices(graph):
-	vertices = []
-	if graph:
-		try:
-			_ = graph.Vertices(vertices)
-		except:
-			print("ERROR: (Topologic>Graph.Vertices) operation failed.")
-			vertices = None
-	if vertices:
-		return vertices
-	else:
-		return []
-
-def adjacentVertices(graph, vertex):
-	vertices = []
-	_ = graph.AdjacentVertices(vertex, vertices)
-	return list(vertices)
+from . import Replication, DictionaryValueAtKey, GraphSnapshot
 
 def processItem(item):
 	graph, graph_label, key, default_vertex_label, filepath, overwrite = item
-	vertices = graphVertices(graph)
+	snapshot = GraphSnapshot.processItem(graph)
+	vertices = snapshot.vertices
 	new_lines = []
 	new_lines.append("\n"+str(len(vertices))+" "+str(graph_label))
 	for j in range(len(vertices)):
@@ -42,10 +18,9 @@ def processItem(item):
 		vLabel = DictionaryValueAtKey.processItem([d, key])
 		if not(vLabel):
 			vLabel = default_vertex_label
-		av = adjacentVertices(graph, vertices[j])
+		av = snapshot.neighbours(j).tolist()
 		line = "\n"+str(vLabel)+" "+ str(len(av))+" "
-		for k in range(len(av)):
-			vi = vertexIndex(av[k], vertices)
+		for vi in av:
 			line = line+str(vi)+" "
 		new_lines.append(line)
 	# Make sure the file extension is .txt
@@ -134,7 +109,7 @@ class SvGraphExportToDGCNN(bpy.types.Node, SverchCustomTreeNode):
 			inputs = Replication.repeat(inputs)
 			inputs = Replication.transposeList(inputs)
 		elif ((self.Replication) == "Interlace"):
-			inputs = list(Replication.interlace(inputs))
+			inputs = Replication.interlace(inputs)
 		outputs = []
 		for anInput in inputs:
 			outputs.append(processItem(anInput))
@@ -8,6 +8,8 @@ import topologic
 from topologic import Vertex, Edge, Wire, Face, Shell, Cell, CellComplex, Cluster, Topology, Graph
 import time
 from collections import defaultdict
+from . import GraphSnapshot
+from . import Replication
 
 #Class to represent a graph 
 class Graph: 
@@ -92,149 +94,15 @@ class Graph:
 		# print the contents of result[] to display the built MST 
 		return result
 
-# From https://stackabuse.com/python-how-to-flatten-list-of-lists/
-def flatten(element):
-	returnList = []
-	if isinstance(element, list) == True:
-		for anItem in element:
-			returnList = returnList + flatten(anItem)
-	else:
-		returnList = [element]
-	return returnList
-
-def repeat(list):
-	maxLength = len(list[0])
-	for aSubList in list:
-		newLength = len(aSubList)
-		if newLength > maxLength:
-			maxLength = newLength
-	for anItem in list:
-		if (len(anItem) > 0):
-			itemToAppend = anItem[-1]
-		else:
-			itemToAppend = None
-		for i in range(len(anItem), maxLength):
-			anItem.append(itemToAppend)
-	return list
-
-# From https://stackoverflow.com/questions/34432056/repeat-elements-of-list-between-each-other-until-we-reach-a-certain-length
-def onestep(cur,y,base):
-    # one step of the iteration
-    if cur is not None:
-        y.append(cur)
-        base.append(cur)
-    else:
-        y.append(base[0])  # append is simplest, for now
-        base = base[1:]+[base[0]]  # rotate
-    return base
-
-def iterate(list):
-	maxLength = len(list[0])
-	returnList = []
-	for aSubList in list:
-		newLength = len(aSubList)
-		if newLength > maxLength:
-			maxLength = newLength
-	for anItem in list:
-		for i in range(len(anItem), maxLength):
-			anItem.append(None)
-		y=[]
-		base=[]
-		for cur in anItem:
-			base = onestep(cur,y,base)
-		returnList.append(y)
-	return returnList
-
-def trim(list):
-	minLength = len(list[0])
-	returnList = []
-	for aSubList in list:
-		newLength = len(aSubList)
-		if newLength < minLength:
-			minLength = newLength
-	for anItem in list:
-		anItem = anItem[:minLength]
-		returnList.append(anItem)
-	return returnList
-
-# Adapted from https://stackoverflow.com/questions/533905/get-the-cartesian-product-of-a-series-of-lists
-def interlace(ar_list):
-    if not ar_list:
-        yield []
-    else:
-        for a in ar_list[0]:
-            for prod in interlace(ar_list[1:]):
-                yield [a,]+prod
-
-def transposeList(l):
-	length = len(l[0])
-	returnList = []
-	for i in range(length):
-		tempRow = []
-		for j in range(len(l)):
-			tempRow.append(l[j][i])
-		returnList.append(tempRow)
-	return returnList
-
-def listAttributeValues(listAttribute):
-	listAttributes = listAttribute.ListValue()
-	returnList = []
-	for attr in listAttributes:
-		if isinstance(attr, IntAttribute):
-			returnList.append(attr.IntValue())
-		elif isinstance(attr, DoubleAttribute):
-			returnList.append(attr.DoubleValue())
-		elif isinstance(attr, StringAttribute):
-			returnList.append(attr.StringValue())
-	return returnList
-
-def valueAtKey(item, key):
-	try:
-		attr = item.ValueAtKey(key)
-	except:
-		raise Exception("Dictionary.ValueAtKey - Error: Could not retrieve a Value at the specified key ("+key+")")
-	if isinstance(attr, IntAttribute):
-		return (attr.IntValue())
-	elif isinstance(attr, DoubleAttribute):
-		return (attr.DoubleValue())
-	elif isinstance(attr, StringAttribute):
-		return (attr.StringValue())
-	elif isinstance(attr, ListAttribute):
-		return (listAttributeValues(attr))
-	else:
-		return None
-
-def vertexIndex(v, vertices, tolerance):
-	i = 0
-	for aVertex in vertices:
-		if topologic.VertexUtility.Distance(v, aVertex) < tolerance:
-			return i
-		i = i + 1
-	return None
-
 def processItem(item):
-	#This code is contributed by Neelam Yadav 
 	graph = item[0]
 	edgeKey = item[1]
 	tolerance = item[2]
-	vertices = []
-	_ = graph.Vertices(vertices)
-	edges = []
-	_ = graph.Edges(vertices, tolerance, edges)
+	snapshot = GraphSnapshot.processItem(graph, edgeKey, tolerance)
+	vertices = snapshot.vertices
 	g = Graph(len(vertices))
-	for anEdge in edges:
-		sv = anEdge.StartVertex()
-		svi = vertexIndex(sv, vertices, tolerance)
-		ev = anEdge.EndVertex()
-		evi = vertexIndex(ev, vertices, tolerance)
-		edgeDict = anEdge.GetDictionary()
-		weight = 1
-		if (edgeDict):
-			try:
-				weight = valueAtKey(edgeDict,edgeKey)
-			except:
-				weight = 1
-		g.addEdge(svi, evi, weight) 
+	for (svi, evi), weight in zip(snapshot.edges.tolist(), snapshot.weights.tolist()):
+		g.addEdge(svi, evi, weight)
 
 	graphEdges = g.KruskalMST() # Get the Minimum Spanning Tree
 	# Create an initial Topologic Graph with one Vertex
@@ -288,27 +156,27 @@ class SvGraphMST(bpy.types.Node, SverchCustomTreeNode):
 		graphList = self.inputs['Graph'].sv_get(deepcopy=True)
 		edgeKeyList = self.inputs['Edge Key'].sv_get(deepcopy=True)
 		toleranceList = self.inputs['Tol'].sv_get(deepcopy=True)
-		graphList = flatten(graphList)
-		edgeKeyList = flatten(edgeKeyList)
+		graphList = Replication.flatten(graphList)
+		edgeKeyList = Replication.flatten(edgeKeyList)
 		if edgeKeyList == []:
 			edgeKeyList = ["Length"]
-		toleranceList = flatten(toleranceList)
+		toleranceList = Replication.flatten(toleranceList)
 		inputs = [graphList, edgeKeyList, toleranceList]
 		outputs = []
 		if ((self.Replication) == "Default"):
-			inputs = repeat(inputs)
-			inputs = transposeList(inputs)
+			inputs = Replication.repeat(inputs)
+			inputs = Replication.transposeList(inputs)
 		elif ((self.Replication) == "Trim"):
-			inputs = trim(inputs)
-			inputs = transposeList(inputs)
+			inputs = Replication.trim(inputs)
+			inputs = Replication.transposeList(inputs)
 		elif ((self.Replication) == "Iterate"):
-			inputs = iterate(inputs)
-			inputs = transposeList(inputs)
+			inputs = Replication.iterate(inputs)
+			inputs = Replication.transposeList(inputs)
 		elif ((self.Replication) == "Repeat"):
-			inputs = repeat(inputs)
-			inputs = transposeList(inputs)
+			inputs = Replication.repeat(inputs)
+			inputs = Replication.transposeList(inputs)
 		elif ((self.Replication) == "Interlace"):
-			inputs = list(interlace(inputs))
+			inputs = Replication.interlace(inputs)
 		for anInput in inputs:
 			outputs.append(processItem(anInput))
 		self.outputs['MST'].sv_set(outputs)
@@ -5,106 +5,21 @@ from sverchok.data_structure import updateNode
 
 import topologic
 import time
+from . import GraphSnapshot
+from . import Replication
 
-# From https://stackabuse.com/python-how-to-flatten-list-of-lists/
-def flatten(element):
-	returnList = []
-	if isinstance(element, list) == True:
-		for anItem in element:
-			returnList = returnList + flatten(anItem)
-	else:
-		returnList = [element]
-	return returnList
-
-def repeat(list):
-	maxLength = len(list[0])
-	for aSubList in list:
-		newLength = len(aSubList)
-		if newLength > maxLength:
-			maxLength = newLength
-	for anItem in list:
-		if (len(anItem) > 0):
-			itemToAppend = anItem[-1]
-		else:
-			itemToAppend = None
-		for i in range(len(anItem), maxLength):
-			anItem.append(itemToAppend)
-	return list
-
-# From https://stackoverflow.com/questions/34432056/repeat-elements-of-list-between-each-other-until-we-reach-a-certain-length
-def onestep(cur,y,base):
-    # one step of the iteration
-    if cur is not None:
-        y.append(cur)
-        base.append(cur)
-    else:
-        y.append(base[0])  # append is simplest, for now
-        base = base[1:]+[base[0]]  # rotate
-    return base
-
-def iterate(list):
-	maxLength = len(list[0])
-	returnList = []
-	for aSubList in list:
-		newLength = len(aSubList)
-		if newLength > maxLength:
-			maxLength = newLength
-	for anItem in list:
-		for i in range(len(anItem), maxLength):
-			anItem.append(None)
-		y=[]
-		base=[]
-		for cur in anItem:
-			base = onestep(cur,y,base)
-			# print(base,y)
-		returnList.append(y)
-	return returnList
-
-def trim(list):
-	minLength = len(list[0])
-	returnList = []
-	for aSubList in list:
-		newLength = len(aSubList)
-		if newLength < minLength:
-			minLength = newLength
-	for anItem in list:
-		anItem = anItem[:minLength]
-		returnList.append(anItem)
-	return returnList
-
-# Adapted from https://stackoverflow.com/questions/533905/get-the-cartesian-product-of-a-series-of-lists
-def interlace(ar_list):
-    if not ar_list:
-        yield []
-    else:
-        for a in ar_list[0]:
-            for prod in interlace(ar_list[1:]):
-                yield [a,]+prod
-
-def transposeList(l):
-	length = len(l[0])
-	returnList = []
-	for i in range(length):
-		tempRow = []
-		for j in range(len(l)):
-			tempRow.append(l[j][i])
-		returnList.append(tempRow)
-	return returnList
-
-def processItem(input):
+def processItem(input, snapshots=None):
 	graph = input[0]
 	vertex = input[1]
-
-	vertices = []
-	_ = graph.Vertices(vertices)
-	nearestVertex = vertices[0]
-	nearestDistance = topologic.VertexUtility.Distance(vertex, nearestVertex)
-	for aGraphVertex in vertices:
-		newDistance = topologic.VertexUtility.Distance(vertex, aGraphVertex)
-		if newDistance < nearestDistance:
-			nearestDistance = newDistance
-			nearestVertex = aGraphVertex
-	return nearestVertex
+	if snapshots == None:
+		snapshots = {}
+	# Replication repeats the same graph across many vertices, so its snapshot is built once per process()
+	snapshot = snapshots.get(id(graph))
+	if snapshot == None:
+		snapshot = GraphSnapshot.processItem(graph, includeEdges=False)
+		snapshots[id(graph)] = snapshot
+	i, distance = snapshot.nearest(vertex)
+	return snapshot.vertices[i]
 
 replication = [("Trim", "Trim", "", 1),("Iterate", "Iterate", "", 2),("Repeat", "Repeat", "", 3),("Interlace", "Interlace", "", 4)]
 
@@ -133,23 +48,14 @@ class SvGraphNearestVertex(bpy.types.Node, SverchCustomTreeNode):
 			return
 		graphList = self.inputs['Graph'].sv_get(deepcopy=False)
 		vertexList = self.inputs['Vertex'].sv_get(deepcopy=False)
-		graphList = flatten(graphList)
-		vertexList = flatten(vertexList)
+		graphList = Replication.flatten(graphList)
+		vertexList = Replication.flatten(vertexList)
 		inputs = [graphList, vertexList]
-		if ((self.Replication) == "Trim"):
-			inputs = trim(inputs)
-			inputs = transposeList(inputs)
-		elif ((self.Replication) == "Iterate"):
-			inputs = iterate(inputs)
-			inputs = transposeList(inputs)
-		elif ((self.Replication) == "Repeat"):
-			inputs = repeat(inputs)
-			inputs = transposeList(inputs)
-		elif ((self.Replication) == "Interlace"):
-			inputs = list(interlace(inputs))
+		inputs = Replication.replicateInputs(inputs, self.Replication)
 		outputs = []
+		snapshots = {}
 		for anInput in inputs:
-			outputs.append(processItem(anInput))
+			outputs.append(processItem(anInput, snapshots))
 		self.outputs['Vertex'].sv_set(outputs)
 		end = time.time()
 		print("Nearest Vertex Operation consumed "+str(round(end - start,2))+" seconds")
@@ -0,0 +1,104 @@
+import topologic
+import numpy as np
+from . import DictionaryValueAtKey
+
+def vertexKey(vertex):
+	return (vertex.X(), vertex.Y(), vertex.Z())
+
+def edgeWeight(edge, edgeKey, default=1):
+	if edgeKey == None:
+		return default
+	d = edge.GetDictionary()
+	if not d:
+		return default
+	try:
+		value = DictionaryValueAtKey.processItem([d, edgeKey])
+		return float(value)
+	except:
+		return default
+
+class GraphSnapshot:
+	"""
+	Array view of a topologic Graph, queried from the C++ graph once: the vertex list, an (N, 3)
+	coordinate array, a coordinate to index hash map, the (E, 2) edge index array with weights read
+	from an edge dictionary key, and a symmetric CSR adjacency where the neighbours of vertex i are
+	indices[indptr[i]:indptr[i+1]] and edgeIds gives the row of edges each entry came from. Edges
+	with an end vertex that does not match a graph vertex are left out and listed in
+	unmatchedEdges. With includeEdges set to False only the vertices are read.
+	"""
+	def __init__(self, graph, edgeKey=None, tolerance=0.0001, includeEdges=True):
+		self.graph = graph
+		self.tolerance = tolerance
+		self.vertices = []
+		_ = graph.Vertices(self.vertices)
+		self.coordinates = np.array([vertexKey(v) for v in self.vertices], dtype=np.float64).reshape(-1, 3)
+		self.lookup = {}
+		for i, aVertex in enumerate(self.vertices):
+			self.lookup.setdefault(vertexKey(aVertex), i)
+		self.topologicEdges = []
+		self.unmatchedEdges = []
+		edges = []
+		if includeEdges:
+			_ = graph.Edges(self.vertices, tolerance, edges)
+		pairs = []
+		weights = []
+		for anEdge in edges:
+			svi = self.index(anEdge.StartVertex())
+			evi = self.index(anEdge.EndVertex())
+			if svi == None or evi == None:
+				self.unmatchedEdges.append(anEdge)
+				continue
+			self.topologicEdges.append(anEdge)
+			pairs.append([svi, evi])
+			weights.append(edgeWeight(anEdge, edgeKey))
+		self.edges = np.array(pairs, dtype=np.int64).reshape(-1, 2)
+		self.weights = np.array(weights, dtype=np.float64)
+		self.buildAdjacency()
+
+	def buildAdjacency(self):
+		n = len(self.vertices)
+		edgeIds = np.arange(len(self.edges))
+		loops = self.edges[:,0] == self.edges[:,1]
+		src = np.concatenate([self.edges[:,0], self.edges[~loops,1]])
+		dst = np.concatenate([self.edges[:,1], self.edges[~loops,0]])
+		ids = np.concatenate([edgeIds, edgeIds[~loops]])
+		# Keep the first occurrence of every (src, dst) pair so duplicated edges count once
+		_, first = np.unique(src*max(n, 1)+dst, return_index=True)
+		first.sort()
+		src, dst, ids = src[first], dst[first], ids[first]
+		order = np.argsort(src, kind="stable")
+		self.indices = dst[order]
+		self.edgeIds = ids[order]
+		self.indptr = np.zeros(n+1, dtype=np.int64)
+		np.cumsum(np.bincount(src, minlength=n), out=self.indptr[1:])
+
+	def index(self, vertex):
+		"""
+		Returns the index of the input vertex, matching coordinates exactly and then within the tolerance.
+		"""
+		i = self.lookup.get(vertexKey(vertex))
+		if i != None:
+			return i
+		i, distance = self.nearest(vertex)
+		if i != None and distance <= self.tolerance:
+			return i
+		return None
+
+	def nearest(self, vertex):
+		"""
+		Returns [index, distance] of the graph vertex nearest to the input vertex.
+		"""
+		if len(self.coordinates) == 0:
+			return [None, None]
+		d = np.einsum("ij,ij->i", self.coordinates-vertexKey(vertex), self.coordinates-vertexKey(vertex))
+		i = int(np.argmin(d))
+		return [i, float(np.sqrt(d[i]))]
+
+	def neighbours(self, i):
+		return self.indices[self.indptr[i]:self.indptr[i+1]]
+
+	def degrees(self):
+		return np.diff(self.indptr)
+
+def processItem(graph, edgeKey=None, tolerance=0.0001, includeEdges=True):
+	return GraphSnapshot(graph, edgeKey, tolerance, includeEdges)
@@ -6,16 +6,7 @@ from sverchok.data_structure import updateNode
 import topologic
 import time
 import pyvisgraph as vg
-
-# From https://stackabuse.com/python-how-to-flatten-list-of-lists/
-def flatten(element):
-	returnList = []
-	if isinstance(element, list) == True:
-		for anItem in element:
-			returnList = returnList + flatten(anItem)
-	else:
-		returnList = [element]
-	return returnList
+from . import Replication
 
 def processItem(cluster):
 	wires = []
@@ -65,7 +56,7 @@ class SvGraphVisibilityGraph(bpy.types.Node, SverchCustomTreeNode):
 			self.outputs['Graph'].sv_set([])
 			return
 		clusters = self.inputs['Obstacles Cluster'].sv_get(deepcopy=True)
-		clusters = flatten(clusters)
+		clusters = Replication.flatten(clusters)
 		outputs = []
 		for aCluster in clusters:
 			outputs.append(processItem(aCluster))
@@ -61,91 +61,7 @@ try:
 except:
 	raise Exception("Error: Could not import openstudio.")
 import math
-
-# From https://stackabuse.com/python-how-to-flatten-list-of-lists/
-def flatten(element):
-	returnList = []
-	if isinstance(element, list) == True:
-		for anItem in element:
-			returnList = returnList + flatten(anItem)
-	else:
-		returnList = [element]
-	return returnList
-
-def repeat(list):
-	maxLength = len(list[0])
-	for aSubList in list:
-		newLength = len(aSubList)
-		if newLength > maxLength:
-			maxLength = newLength
-	for anItem in list:
-		if (len(anItem) > 0):
-			itemToAppend = anItem[-1]
-		else:
-			itemToAppend = None
-		for i in range(len(anItem), maxLength):
-			anItem.append(itemToAppend)
-	return list
-
-# From https://stackoverflow.com/questions/34432056/repeat-elements-of-list-between-each-other-until-we-reach-a-certain-length
-def onestep(cur,y,base):
-    # one step of the iteration
-    if cur is not None:
-        y.append(cur)
-        base.append(cur)
-    else:
-        y.append(base[0])  # append is simplest, for now
-        base = base[1:]+[base[0]]  # rotate
-    return base
-
-def iterate(list):
-	maxLength = len(list[0])
-	returnList = []
-	for aSubList in list:
-		newLength = len(aSubList)
-		if newLength > maxLength:
-			maxLength = newLength
-	for anItem in list:
-		for i in range(len(anItem), maxLength):
-			anItem.append(None)
-		y=[]
-		base=[]
-		for cur in anItem:
-			base = onestep(cur,y,base)
-			# print(base,y)
-		returnList.append(y)
-	return returnList
-
-def trim(list):
-	minLength = len(list[0])
-	returnList = []
-	for aSubList in list:
-		newLength = len(aSubList)
-		if newLength < minLength:
-			minLength = newLength
-	for anItem in list:
-		anItem = anItem[:minLength]
-		returnList.append(anItem)
-	return returnList
-
-# Adapted from https://stackoverflow.com/questions/533905/get-the-cartesian-product-of-a-series-of-lists
-def interlace(ar_list):
-    if not ar_list:
-        yield []
-    else:
-        for a in ar_list[0]:
-            for prod in interlace(ar_list[1:]):
-                yield [a,]+prod
-
-def transposeList(l):
-	length = len(l[0])
-	returnList = []
-	for i in range(length):
-		tempRow = []
-		for j in range(len(l)):
-			tempRow.append(l[j][i])
-		returnList.append(tempRow)
-	return returnList
+from . import Replication
 
 def processItem(item):
 	x = item[0]
@@ -357,34 +273,34 @@ class SvHBJSONByTopology(bpy.types.Node, SverchCustomTreeNode):
         heatingTempList = self.inputs['Heating Temperature'].sv_get(deepcopy=True)
 
 
-        modelList = flatten(modelList)
+        modelList = Replication.flatten(modelList)
         weatherFileList = self.inputs['Weather File Path'].sv_get(deepcopy=True)
         ddyFileList = self.inputs['Design Day File Path'].sv_get(deepcopy=True)
-        buildingTopologyList = flatten(buildingTopologyList)
-        shadingList = flatten(shadingList)
+        buildingTopologyList = Replication.flatten(buildingTopologyList)
+        shadingList = Replication.flatten(shadingList)
         #floorLevelsList does not need flattening
-        buildingNameList = flatten(buildingNameList)
-        buildingTypeList = flatten(buildingTypeList)
-        defaultSpaceList = flatten(defaultSpaceList)
-        northAxisList = flatten(northAxisList)
-        glazingRatioList = flatten(glazingRatioList)
-        coolingTempList = flatten(coolingTempList)
-        heatingTempList = flatten(heatingTempList)
+        buildingNameList = Replication.flatten(buildingNameList)
+        buildingTypeList = Replication.flatten(buildingTypeList)
+        defaultSpaceList = Replication.flatten(defaultSpaceList)
+        northAxisList = Replication.flatten(northAxisList)
+        glazingRatioList = Replication.flatten(glazingRatioList)
+        coolingTempList = Replication.flatten(coolingTempList)
+        heatingTempList = Replication.flatten(heatingTempList)
         inputs = [modelList, weatherFileList, ddyFileList, buildingTopologyList, shadingList, floorLevelsList, buildingNameList, buildingTypeList, defaultSpaceList, northAxisList, glazingRatioList, coolingTempList, heatingTempList]
         if ((self.Replication) == "Default"):
-            inputs = iterate(inputs)
-            inputs = transposeList(inputs)
+            inputs = Replication.iterate(inputs)
+            inputs = Replication.transposeList(inputs)
         if ((self.Replication) == "Trim"):
-            inputs = trim(inputs)
-            inputs = transposeList(inputs)
+            inputs = Replication.trim(inputs)
+            inputs = Replication.transposeList(inputs)
         elif ((self.Replication) == "Iterate"):
-            inputs = iterate(inputs)
-            inputs = transposeList(inputs)
+            inputs = Replication.iterate(inputs)
+            inputs = Replication.transposeList(inputs)
         elif ((self.Replication) == "Repeat"):
-            inputs = repeat(inputs)
-            inputs = transposeList(inputs)
+            inputs = Replication.repeat(inputs)
+            inputs = Replication.transposeList(inputs)
         elif ((self.Replication) == "Interlace"):
-            inputs = list(interlace(inputs))
+            inputs = Replication.interlace(inputs)
         outputs = []
         for anInput in inputs:
             outputs.append(processItem(anInput))
@@ -4,16 +4,7 @@ from sverchok.node_tree import SverchCustomTreeNode
 from sverchok.data_structure import updateNode
 
 import honeybee_energy.lib.programtypes as prog_type_lib
-# From https://stackabuse.com/python-how-to-flatten-list-of-lists/
-def flatten(element):
-	returnList = []
-	if isinstance(element, list) == True:
-		for anItem in element:
-			returnList = returnList + flatten(anItem)
-	else:
-		returnList = [element]
-	return returnList
-
+from . import Replication
 def processItem(item):
 	return prog_type_lib.program_type_by_identifier(item)
 
@@ -32,7 +23,7 @@ class SvHBProgramTypeByIdentifier(bpy.types.Node, SverchCustomTreeNode):
 		if not any(socket.is_linked for socket in self.outputs):
 			return
 		identifierList = self.inputs['Program Identifier'].sv_get(deepcopy=True)
-		identifierList = flatten(identifierList)
+		identifierList = Replication.flatten(identifierList)
 		outputs = []
 		for anInput in identifierList:
 			outputs.append(processItem(anInput))
@@ -5,16 +5,7 @@ from sverchok.data_structure import updateNode
 
 import topologic
 from molior import Molior
-
-# From https://stackabuse.com/python-how-to-flatten-list-of-lists/
-def flatten(element):
-	returnList = []
-	if isinstance(element, list) == True:
-		for anItem in element:
-			returnList = returnList + flatten(anItem)
-	else:
-		returnList = [element]
-	return returnList
+from . import Replication
 
 def processItem(item):
     molior_object = Molior.from_cellcomplex(cellcomplex=item, file=None, name="Homemaker building")
@@ -39,7 +30,7 @@ class SvHMIFCByCellComplex(bpy.types.Node, SverchCustomTreeNode):
 			self.outputs['IFC'].sv_set([])
 			return
 		inputs = self.inputs['CellComplex'].sv_get(deepcopy=False)
-		inputs = flatten(inputs)
+		inputs = Replication.flatten(inputs)
 		outputs = []
 		for anInput in inputs:
 			outputs.append(processItem(anInput))
@@ -45,19 +45,27 @@ class SvIFCAdd2ndLevelBoundaries(bpy.types.Node, SverchCustomTreeNode):
         top_opening_elements = []
         for ifc_rel_voids_element in ifc_building_element.HasOpenings:
           ifc_opening_element = ifc_rel_voids_element.RelatedOpeningElement
-          top_opening_element = ifc_topologic.getIfcProductCell(ifc_opening_element)
           if not ifc_opening_element.HasFillings:
             continue
 
+          # Opening cells come from the shared shape cache, so each opening is built once and copied per call
+          top_opening_element = ifc_topologic.getIfcProductCell(ifc_opening_element, ifc_file)
           topologic_lib.setDictionary(top_opening_element, "IfcElement", ifc_opening_element.HasFillings[0].RelatedBuildingElement.GlobalId)
           top_opening_elements.append(top_opening_element)
 
+        # Only the face pairs that pass the NumPy prefilter reach the projectFace boolean
+        unconnected_frames = topologic_lib.faceFrames(unconnected_faces)
+        other_face_candidates = topologic_lib.projectionCandidates(unconnected_frames)
+        connected_face_candidates = [[] for face in unconnected_faces]
+        if connected_faces:
+          connected_face_candidates = topologic_lib.projectionCandidates(unconnected_frames, topologic_lib.faceFrames(connected_faces))
+
         thk, thk_area, dists = None, 0.0, {}
         for face_index, face in enumerate(unconnected_faces):
-          normal = topologic.FaceUtility.NormalAtParameters(face, 0.5, 0.5)
+          normal = unconnected_frames[0][face_index]
           ifc_space = ifc_file.by_guid(topologic_lib.getDictionary(face, "IfcSpace"))
 
-          for other_face_index in range(face_index+1, len(unconnected_faces)):
+          for other_face_index in other_face_candidates[face_index]:
             dist, top_space_boundary = topologic_lib.projectFace(face, unconnected_faces[other_face_index])
             if dist is None:
               continue
@@ -90,7 +98,8 @@ class SvIFCAdd2ndLevelBoundaries(bpy.types.Node, SverchCustomTreeNode):
                 other_ifc_inner_boundary.CorrespondingBoundary = ifc_inner_boundary
 
           if ifc_space is not None:
-            for connected_face in connected_faces:
+            for connected_face_index in connected_face_candidates[face_index]:
+              connected_face = connected_faces[connected_face_index]
               dist, top_space_boundary = topologic_lib.projectFace(face, connected_face)
               if dist is None:
                 continue
@@ -36,7 +36,7 @@ class SvIFCBuildingElements(bpy.types.Node, SverchCustomTreeNode):
         else:
           continue
 
-        top_building_element_cell = ifc_topologic.getIfcProductCell(ifc_building_element)
+        top_building_element_cell = ifc_topologic.getIfcProductCell(ifc_building_element, ifc_file)
         topologic_lib.setDictionary(top_building_element_cell, "IfcBuildingElement", ifc_building_element.GlobalId)
         top_building_element_cells.append(top_building_element_cell)
       top_building_element_cellss.append(top_building_element_cells)
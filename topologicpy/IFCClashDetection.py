@@ -3,6 +3,7 @@ import bpy
 from sverchok.node_tree import SverchCustomTreeNode
 import numpy as np
 from . import topologic_lib
+from . import topologic_clash
 import topologic
 
 class SvIFCClashDetection(bpy.types.Node, SverchCustomTreeNode):
@@ -19,6 +20,9 @@ class SvIFCClashDetection(bpy.types.Node, SverchCustomTreeNode):
 
     self.outputs.new('SvStringsSocket', 'Clashes')
     self.outputs.new('SvStringsSocket', 'Building topology')
+    self.outputs.new('SvStringsSocket', 'Clash pairs')
+    self.outputs.new('SvStringsSocket', 'Clash volumes')
+    self.outputs.new('SvStringsSocket', 'Clash stats')
 
   def process(self):
     if not any(socket.is_linked for socket in self.outputs):
@@ -28,21 +32,31 @@ class SvIFCClashDetection(bpy.types.Node, SverchCustomTreeNode):
     top_building_element_cellss = self.inputs['Building elements'].sv_get(deepcopy=False)[0]
 
     clashess, top_building_cell_complexs = [], []
+    clash_pairss, clash_volumess, clash_statss = [], [], []
+    check_pairs = any(self.outputs[name].is_linked for name in ['Clash pairs', 'Clash volumes', 'Clash stats'])
     for ifc_file, top_building_element_cells in zip(ifc_files, top_building_element_cellss):
+      if check_pairs:
+        pair_clashes, stats = topologic_clash.session.check(top_building_element_cells, intersections=self.outputs['Clash pairs'].is_linked)
+        clash_pairss.append([[top_building_element_cells[i], top_building_element_cells[j], intersection] for i, j, volume, intersection in pair_clashes])
+        clash_volumess.append([volume for i, j, volume, intersection in pair_clashes])
+        clash_statss.append(stats)
+
+      if not (self.outputs['Clashes'].is_linked or self.outputs['Building topology'].is_linked):
+        continue
+
       top_building_cell_complex = topologic.CellComplex.ByCells(top_building_element_cells)
+      boxes, unboxed = topologic_clash.elementBoxes(top_building_element_cells, 1e-4)
+      grid, wide = topologic_clash.elementGrid(boxes, unboxed)
 
       clashes = []
       for sink in topologic_lib.getSubTopologies(top_building_cell_complex, topologic.Cell):
         vertex = topologic.CellUtility.InternalVertex(sink, 1e-3)
 
-        cells = []
-        for source in top_building_element_cells:
-          if topologic.CellUtility.Contains(source, vertex, 1e-4) == 0:
-            cells.append(source)
+        cells = topologic_clash.containingElements(top_building_element_cells, boxes, grid, wide, vertex, 1e-4)
 
         if len(cells) > 1:
           clashes.append([sink] + cells)
-        else:
+        elif len(cells) == 1:
           global_id = topologic_lib.getDictionary(cells[0], "IfcBuildingElement")
           topologic_lib.setDictionary(sink, "IfcBuildingElement", global_id)
 
@@ -51,6 +65,9 @@ class SvIFCClashDetection(bpy.types.Node, SverchCustomTreeNode):
 
     self.outputs['Clashes'].sv_set([clashess])
     self.outputs['Building topology'].sv_set([top_building_cell_complexs])
+    self.outputs['Clash pairs'].sv_set([clash_pairss])
+    self.outputs['Clash volumes'].sv_set([clash_volumess])
+    self.outputs['Clash stats'].sv_set([clash_statss])
 
 def register():
     bpy.utils.register_class(SvIFCClashDetection)
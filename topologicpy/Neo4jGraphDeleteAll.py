@@ -5,21 +5,12 @@ from sverchok.data_structure import updateNode, list_match_func, list_match_mode
 
 import topologic
 import time
+from . import Replication
 try:
 	import py2neo
 except:
 	raise Exception("Error: Could not import py2neo.")
 
-# From https://stackabuse.com/python-how-to-flatten-list-of-lists/
-def flatten(element):
-	returnList = []
-	if isinstance(element, list) == True:
-		for anItem in element:
-			returnList = returnList + flatten(anItem)
-	else:
-		returnList = [element]
-	return returnList
-
 def processItem(item):
 	neo4jGraph = item
 	neo4jGraph.delete_all()
@@ -47,7 +38,7 @@ class SvNeo4jGraphDeleteAll(bpy.types.Node, SverchCustomTreeNode):
 			waitForList = []
 		else:
 			waitForList = self.inputs['Wait For'].sv_get(deepcopy=True)
-		neo4jGraphList = flatten(neo4jGraphList)
+		neo4jGraphList = Replication.flatten(neo4jGraphList)
 		outputs = []
 		for anInput in neo4jGraphList:
 			outputs.append(processItem(anInput))
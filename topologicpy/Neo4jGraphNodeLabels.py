@@ -7,6 +7,7 @@ import topologic
 import time
 import random
 from py2neo.data import spatial as sp
+from . import Replication
 
 try:
 	import py2neo
@@ -15,16 +16,6 @@ try:
 except:
 	raise Exception("Error: Could not import py2neo.")
 
-# From https://stackabuse.com/python-how-to-flatten-list-of-lists/
-def flatten(element):
-	returnList = []
-	if isinstance(element, list) == True:
-		for anItem in element:
-			returnList = returnList + flatten(anItem)
-	else:
-		returnList = [element]
-	return returnList
-
 def processItem(item):
 	neo4jGraph = item
 	return neo4jGraph.schema.node_labels
@@ -45,7 +36,7 @@ class SvNeo4jGraphNodeLabels(bpy.types.Node, SverchCustomTreeNode):
 		if not any(socket.is_linked for socket in self.outputs):
 			return
 		neo4jGraphList = self.inputs['Neo4j Graph'].sv_get(deepcopy=True)
-		neo4jGraphList = flatten(neo4jGraphList)
+		neo4jGraphList = Replication.flatten(neo4jGraphList)
 		outputs = []
 		for anInput in neo4jGraphList:
 			outputs.append(processItem(anInput))
@@ -13,90 +13,7 @@ except:
 from py2neo import Node,Relationship,Graph,Path,Subgraph
 from py2neo import NodeMatcher,RelationshipMatcher
 from py2neo.data import spatial as sp
-
-# From https://stackabuse.com/python-how-to-flatten-list-of-lists/
-def flatten(element):
-	returnList = []
-	if isinstance(element, list) == True:
-		for anItem in element:
-			returnList = returnList + flatten(anItem)
-	else:
-		returnList = [element]
-	return returnList
-
-def repeat(list):
-	maxLength = len(list[0])
-	for aSubList in list:
-		newLength = len(aSubList)
-		if newLength > maxLength:
-			maxLength = newLength
-	for anItem in list:
-		if (len(anItem) > 0):
-			itemToAppend = anItem[-1]
-		else:
-			itemToAppend = None
-		for i in range(len(anItem), maxLength):
-			anItem.append(itemToAppend)
-	return list
-
-# From https://stackoverflow.com/questions/34432056/repeat-elements-of-list-between-each-other-until-we-reach-a-certain-length
-def onestep(cur,y,base):
-    # one step of the iteration
-    if cur is not None:
-        y.append(cur)
-        base.append(cur)
-    else:
-        y.append(base[0])  # append is simplest, for now
-        base = base[1:]+[base[0]]  # rotate
-    return base
-
-def iterate(list):
-	maxLength = len(list[0])
-	returnList = []
-	for aSubList in list:
-		newLength = len(aSubList)
-		if newLength > maxLength:
-			maxLength = newLength
-	for anItem in list:
-		for i in range(len(anItem), maxLength):
-			anItem.append(None)
-		y=[]
-		base=[]
-		for cur in anItem:
-			base = onestep(cur,y,base)
-		returnList.append(y)
-	return returnList
-
-def trim(list):
-	minLength = len(list[0])
-	returnList = []
-	for aSubList in list:
-		newLength = len(aSubList)
-		if newLength < minLength:
-			minLength = newLength
-	for anItem in list:
-		anItem = anItem[:minLength]
-		returnList.append(anItem)
-	return returnList
-
-# Adapted from https://stackoverflow.com/questions/533905/get-the-cartesian-product-of-a-series-of-lists
-def interlace(ar_list):
-    if not ar_list:
-        yield []
-    else:
-        for a in ar_list[0]:
-            for prod in interlace(ar_list[1:]):
-                yield [a,]+prod
-
-def transposeList(l):
-	length = len(l[0])
-	returnList = []
-	for i in range(length):
-		tempRow = []
-		for j in range(len(l)):
-			tempRow.append(l[j][i])
-		returnList.append(tempRow)
-	return returnList
+from . import Replication
 
 def listAttributeValues(listAttribute):
 	listAttributes = listAttribute.ListValue()
@@ -250,26 +167,16 @@ class SvNeo4jGraphSetGraph(bpy.types.Node, SverchCustomTreeNode):
 		deleteAllList = self.inputs['DeleteAll'].sv_get(deepcopy=True)
 		toleranceList = self.inputs['Tolerance'].sv_get(deepcopy=True)
 		runList = self.inputs['Run'].sv_get(deepcopy=True)
-		neo4jGraphList = flatten(neo4jGraphList)
-		topologicGraphList = flatten(topologicGraphList)
-		labelKeyList = flatten(labelKeyList)
-		relationshipKeyList = flatten(relationshipKeyList)
-		bidirectionalList = flatten(bidirectionalList)
-		deleteAllList = flatten(deleteAllList)
-		toleranceList = flatten(toleranceList)
-		runList = flatten(runList)
+		neo4jGraphList = Replication.flatten(neo4jGraphList)
+		topologicGraphList = Replication.flatten(topologicGraphList)
+		labelKeyList = Replication.flatten(labelKeyList)
+		relationshipKeyList = Replication.flatten(relationshipKeyList)
+		bidirectionalList = Replication.flatten(bidirectionalList)
+		deleteAllList = Replication.flatten(deleteAllList)
+		toleranceList = Replication.flatten(toleranceList)
+		runList = Replication.flatten(runList)
 		inputs = [neo4jGraphList, topologicGraphList, labelKeyList, relationshipKeyList, bidirectionalList, deleteAllList, toleranceList, runList]
-		if ((self.Replication) == "Trim"):
-			inputs = trim(inputs)
-			inputs = transposeList(inputs)
-		elif ((self.Replication) == "Default") or ((self.Replication) == "Iterate"):
-			inputs = iterate(inputs)
-			inputs = transposeList(inputs)
-		elif ((self.Replication) == "Repeat"):
-			inputs = repeat(inputs)
-			inputs = transposeList(inputs)
-		elif ((self.Replication) == "Interlace"):
-			inputs = list(interlace(inputs))
+		inputs = Replication.replicateInputs(inputs, self.Replication)
 		outputs = []
 		for anInput in inputs:
 			outputs.append(processItem(anInput))
@@ -1,95 +1,76 @@
-# From https://stackabuse.com/python-how-to-flatten-list-of-lists/
+# Replication engine shared by the nodes. Every helper runs in time linear in the size of its
+# input (interlace is linear in the number of combinations it yields) and interlace never
+# materializes the cartesian product, so it can be consumed one combination at a time.
 import numpy as np
+import itertools
+from collections import deque
 
 def flatten(element):
+	if isinstance(element, list) == False:
+		return [element]
 	returnList = []
-	if isinstance(element, list) == True:
-		for anItem in element:
-			returnList = returnList + flatten(anItem)
-	else:
-		returnList = [element]
+	stack = [iter(element)]
+	while stack:
+		for anItem in stack[-1]:
+			if isinstance(anItem, list) == True:
+				stack.append(iter(anItem))
+				break
+			returnList.append(anItem)
+		else:
+			stack.pop()
 	return returnList
 
 def repeat(list):
-	maxLength = len(list[0])
-	for aSubList in list:
-		newLength = len(aSubList)
-		if newLength > maxLength:
-			maxLength = newLength
+	maxLength = max(len(aSubList) for aSubList in list)
 	for anItem in list:
 		if (len(anItem) > 0):
 			itemToAppend = anItem[-1]
 		else:
 			itemToAppend = None
-		for i in range(len(anItem), maxLength):
-			anItem.append(itemToAppend)
+		anItem.extend([itemToAppend]*(maxLength-len(anItem)))
 	return list
 
 # From https://stackoverflow.com/questions/34432056/repeat-elements-of-list-between-each-other-until-we-reach-a-certain-length
 def onestep(cur,y,base):
-    # one step of the iteration
-    if cur is not None:
-        y.append(cur)
-        base.append(cur)
-    else:
-        y.append(base[0])  # append is simplest, for now
-        base = base[1:]+[base[0]]  # rotate
-    return base
+	# one step of the iteration. base is a deque so the rotation is O(1)
+	if cur is not None:
+		y.append(cur)
+		base.append(cur)
+	else:
+		y.append(base[0])
+		base.rotate(-1)
+	return base
 
 def iterate(list):
-	maxLength = len(list[0])
+	maxLength = max(len(aSubList) for aSubList in list)
 	returnList = []
-	for aSubList in list:
-		newLength = len(aSubList)
-		if newLength > maxLength:
-			maxLength = newLength
 	for anItem in list:
-		for i in range(len(anItem), maxLength):
-			anItem.append(None)
+		anItem.extend([None]*(maxLength-len(anItem)))
 		y=[]
-		base=[]
+		base=deque()
 		for cur in anItem:
-			base = onestep(cur,y,base)
+			onestep(cur,y,base)
 		returnList.append(y)
 	return returnList
 
 def trim(list):
-	minLength = len(list[0])
-	returnList = []
-	for aSubList in list:
-		newLength = len(aSubList)
-		if newLength < minLength:
-			minLength = newLength
-	for anItem in list:
-		anItem = anItem[:minLength]
-		returnList.append(anItem)
-	return returnList
+	minLength = min(len(aSubList) for aSubList in list)
+	return [anItem[:minLength] for anItem in list]
 
-# Adapted from https://stackoverflow.com/questions/533905/get-the-cartesian-product-of-a-series-of-lists
 def interlace(ar_list):
-    if not ar_list:
-        yield []
-    else:
-        for a in ar_list[0]:
-            for prod in interlace(ar_list[1:]):
-                yield [a,]+prod
+	"""
+	Lazily yields every combination of one item from each input list, the last list varying fastest.
+	"""
+	for combination in itertools.product(*ar_list):
+		yield list(combination)
 
-def interlace2(ar_list):
-    if not ar_list:
-        yield []
-    else:
-        for a in ar_list[0]:
-            for prod in interlace(ar_list[1:]):
-                yield [a,]+prod
+interlace2 = interlace
 
 def transposeList(l):
 	length = len(l[0])
-	returnList = []
-	for i in range(length):
-		tempRow = []
-		for j in range(len(l)):
-			tempRow.append(l[j][i])
-		returnList.append(tempRow)
+	returnList = [list(row) for row in zip(*l)]
+	if len(returnList) < length:
+		raise IndexError("Replication.transposeList - Error: The input lists are shorter than the first list.")
 	return returnList
 
 def list_level_iter(lst, level, _current_level: int= 1):
@@ -125,7 +106,7 @@ def replicateInputs(inputs, replicationType):
 		inputs = repeat(inputs)
 		inputs = transposeList(inputs)
 	elif (replicationType == "interlace"):
-		inputs = list(interlace(inputs))
+		inputs = interlace(inputs)
 	else:
 		raise Exception("Error - Replication.replicateInputs: Replication type is unrecognized. It must be one of: default, iterate, trim, repeat, or interlace.")
 	return inputs
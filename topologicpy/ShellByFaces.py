@@ -5,16 +5,7 @@ from sverchok.data_structure import updateNode
 
 import topologic
 import warnings
-
-# From https://stackabuse.com/python-how-to-flatten-list-of-lists/
-def flatten(element):
-	returnList = []
-	if isinstance(element, list) == True:
-		for anItem in element:
-			returnList = returnList + flatten(anItem)
-	else:
-		returnList = [element]
-	return returnList
+from . import Replication
 
 def list_level_iter(lst, level, _current_level: int= 1):
     """
@@ -76,11 +67,11 @@ class SvShellByFaces(bpy.types.Node, SverchCustomTreeNode):
 			return
 		faceList = self.inputs['Faces'].sv_get(deepcopy=False)
 		tol = self.inputs['Tol'].sv_get(deepcopy=True, default=0.0001)[0][0]
-		level = flatten(self.inputs['Level'].sv_get(deepcopy=False, default= 1))
+		level = Replication.flatten(self.inputs['Level'].sv_get(deepcopy=False, default= 1))
 		if isinstance(level,list):
 			level = int(level[0])
 		faceList = list(list_level_iter(faceList,level))
-		faceList = [flatten(t) for t in faceList]
+		faceList = [Replication.flatten(t) for t in faceList]
 		outputs = []
 		for t in range(len(faceList)):
 			outputs.append(processItem([faceList[t], tol]))
@@ -371,17 +371,7 @@ class SvShellHyperbolicParaboloid(bpy.types.Node, SverchCustomTreeNode):
 			bList = Replication.flatten(bList)
 
 			inputs = [originList, radiusList, sidesList, ringsList, aList, bList, dirXList, dirYList, dirZList]
-			if ((self.Replication) == "Trim"):
-				inputs = Replication.trim(inputs)
-				inputs = Replication.transposeList(inputs)
-			elif (((self.Replication) == "Iterate")  or ((self.Replication) == "Default")):
-				inputs = Replication.iterate(inputs)
-				inputs = Replication.transposeList(inputs)
-			elif ((self.Replication) == "Repeat"):
-				inputs = Replication.repeat(inputs)
-				inputs = Replication.transposeList(inputs)
-			elif ((self.Replication) == "Interlace"):
-				inputs = list(Replication.interlace(inputs))
+			inputs = Replication.replicateInputs(inputs, self.Replication)
 			outputs = []
 			for anInput in inputs:
 				outputs.append(processItemCircularDomain(anInput, self.originLocation))
@@ -412,17 +402,7 @@ class SvShellHyperbolicParaboloid(bpy.types.Node, SverchCustomTreeNode):
 			vList = self.inputs['V'].sv_get(deepcopy=True)
 			vList = Replication.flatten(vList)
 			inputs = [originList, llVertexList, lrVertexList, urVertexList, ulVertexList, uList, vList, dirXList, dirYList, dirZList]
-			if ((self.Replication) == "Trim"):
-				inputs = Replication.trim(inputs)
-				inputs = Replication.transposeList(inputs)
-			elif (((self.Replication) == "Iterate")  or ((self.Replication) == "Default")):
-				inputs = Replication.iterate(inputs)
-				inputs = Replication.transposeList(inputs)
-			elif ((self.Replication) == "Repeat"):
-				inputs = Replication.repeat(inputs)
-				inputs = Replication.transposeList(inputs)
-			elif ((self.Replication) == "Interlace"):
-				inputs = list(Replication.interlace(inputs))
+			inputs = Replication.replicateInputs(inputs, self.Replication)
 			outputs = []
 			for anInput in inputs:
 				outputs.append(processItemRectangularDomain(anInput, self.originLocation))
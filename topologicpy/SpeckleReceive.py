@@ -20,91 +20,7 @@ from bpy_speckle.clients import speckle_clients
 from bpy_speckle.operators.users import add_user_stream
 import bmesh
 import time
-
-# From https://stackabuse.com/python-how-to-flatten-list-of-lists/
-def flatten(element):
-	returnList = []
-	if isinstance(element, list) == True:
-		for anItem in element:
-			returnList = returnList + flatten(anItem)
-	else:
-		returnList = [element]
-	return returnList
-
-def repeat(list):
-	maxLength = len(list[0])
-	for aSubList in list:
-		newLength = len(aSubList)
-		if newLength > maxLength:
-			maxLength = newLength
-	for anItem in list:
-		if (len(anItem) > 0):
-			itemToAppend = anItem[-1]
-		else:
-			itemToAppend = None
-		for i in range(len(anItem), maxLength):
-			anItem.append(itemToAppend)
-	return list
-
-# From https://stackoverflow.com/questions/34432056/repeat-elements-of-list-between-each-other-until-we-reach-a-certain-length
-def onestep(cur,y,base):
-    # one step of the iteration
-    if cur is not None:
-        y.append(cur)
-        base.append(cur)
-    else:
-        y.append(base[0])  # append is simplest, for now
-        base = base[1:]+[base[0]]  # rotate
-    return base
-
-def iterate(list):
-	maxLength = len(list[0])
-	returnList = []
-	for aSubList in list:
-		newLength = len(aSubList)
-		if newLength > maxLength:
-			maxLength = newLength
-	for anItem in list:
-		for i in range(len(anItem), maxLength):
-			anItem.append(None)
-		y=[]
-		base=[]
-		for cur in anItem:
-			base = onestep(cur,y,base)
-			# print(base,y)
-		returnList.append(y)
-	return returnList
-
-def trim(list):
-	minLength = len(list[0])
-	returnList = []
-	for aSubList in list:
-		newLength = len(aSubList)
-		if newLength < minLength:
-			minLength = newLength
-	for anItem in list:
-		anItem = anItem[:minLength]
-		returnList.append(anItem)
-	return returnList
-
-# Adapted from https://stackoverflow.com/questions/533905/get-the-cartesian-product-of-a-series-of-lists
-def interlace(ar_list):
-    if not ar_list:
-        yield []
-    else:
-        for a in ar_list[0]:
-            for prod in interlace(ar_list[1:]):
-                yield [a,]+prod
-
-def transposeList(l):
-	length = len(l[0])
-	returnList = []
-	for i in range(length):
-		tempRow = []
-		for j in range(len(l)):
-			tempRow.append(l[j][i])
-		returnList.append(tempRow)
-	return returnList
+from . import Replication
 
 def add_vertices(speckle_mesh, blender_mesh, scale=1.0):
     sverts = speckle_mesh.vertices
@@ -237,23 +153,13 @@ class SvSpeckleReset(bpy.types.Operator, SvGenericNodeLocator):
 		streamList = node.inputs['Stream'].sv_get(deepcopy=True)
 		branchList = node.inputs['Branch'].sv_get(deepcopy=True)
 		commitList = node.inputs['Commit'].sv_get(deepcopy=True)
-		clientList = flatten(clientList)
-		streamList = flatten(streamList)
-		branchList = flatten(branchList)
-		commitList = flatten(commitList)
+		clientList = Replication.flatten(clientList)
+		streamList = Replication.flatten(streamList)
+		branchList = Replication.flatten(branchList)
+		commitList = Replication.flatten(commitList)
 
 		inputs = [clientList, streamList, branchList, commitList]
-		if ((node.Replication) == "Trim"):
-			inputs = trim(inputs)
-			inputs = transposeList(inputs)
-		elif ((node.Replication) == "Default") or ((self.Replication) == "Iterate"):
-			inputs = iterate(inputs)
-			inputs = transposeList(inputs)
-		elif ((node.Replication) == "Repeat"):
-			inputs = repeat(inputs)
-			inputs = transposeList(inputs)
-		elif ((node.Replication) == "Interlace"):
-			inputs = list(interlace(inputs))
+		inputs = Replication.replicateInputs(inputs, node.Replication)
 		outputs = []
 		for anInput in inputs:
 			resetItem(anInput)
@@ -274,23 +180,13 @@ class SvSpeckleRun(bpy.types.Operator, SvGenericNodeLocator):
 		streamList = node.inputs['Stream'].sv_get(deepcopy=True)
 		branchList = node.inputs['Branch'].sv_get(deepcopy=True)
 		commitList = node.inputs['Commit'].sv_get(deepcopy=True)
-		clientList = flatten(clientList)
-		streamList = flatten(streamList)
-		branchList = flatten(branchList)
-		commitList = flatten(commitList)
+		clientList = Replication.flatten(clientList)
+		streamList = Replication.flatten(streamList)
+		branchList = Replication.flatten(branchList)
+		commitList = Replication.flatten(commitList)
 
 		inputs = [clientList, streamList, branchList, commitList]
-		if ((node.Replication) == "Trim"):
-			inputs = trim(inputs)
-			inputs = transposeList(inputs)
-		elif ((node.Replication) == "Default") or ((self.Replication) == "Iterate"):
-			inputs = iterate(inputs)
-			inputs = transposeList(inputs)
-		elif ((node.Replication) == "Repeat"):
-			inputs = repeat(inputs)
-			inputs = transposeList(inputs)
-		elif ((node.Replication) == "Interlace"):
-			inputs = list(interlace(inputs))
+		inputs = Replication.replicateInputs(inputs, node.Replication)
 		outputs = []
 		for anInput in inputs:
 			outputs.append(runItem(anInput))
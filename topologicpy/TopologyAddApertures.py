@@ -1,5 +1,5 @@
 import topologic
-from topologicpy import VertexNearestVertex, DictionaryByKeysValues, TopologySetDictionary, DictionaryValueAtKey
+from topologicpy import VertexNearestVertex, TopologyAttributeCache
 import time
 
 def isInside(aperture, face, tolerance):
@@ -59,26 +59,19 @@ def processApertures(subTopologies, apertureCluster, exclusive, tolerance):
         apertures = vertices
     else:
         apertures = []
-    usedTopologies = []
-    temp_verts = []
-    for i, subTopology in enumerate(subTopologies):
-            usedTopologies.append(0)
-            temp_v = internalVertex(subTopology, tolerance)
-            d = DictionaryByKeysValues.processItem([["id"], [i]])
-            temp_v = TopologySetDictionary.processItem([temp_v, d])
-            temp_verts.append(temp_v)
-    clus = topologic.Cluster.ByTopologies(temp_verts)
-    tree = VertexNearestVertex.kdtree(clus)
-    for aperture in apertures:
-        apCenter = internalVertex(aperture, tolerance)
-        nearest_vert = VertexNearestVertex.find_nearest_neighbor(tree=tree, vertex=apCenter)
-        d = nearest_vert.GetDictionary()
-        i = DictionaryValueAtKey.processItem([d,"id"])
+    usedTopologies = [0]*len(subTopologies)
+    if len(subTopologies) == 0 or len(apertures) == 0:
+        return None
+    tree = VertexNearestVertex.KDTree(VertexNearestVertex.vertexCoordinates([internalVertex(subTopology, tolerance) for subTopology in subTopologies]))
+    apCenters = VertexNearestVertex.vertexCoordinates([internalVertex(aperture, tolerance) for aperture in apertures])
+    distances, nearest = tree.query(apCenters, 1)
+    for aperture, i in zip(apertures, nearest[:, 0]):
         subTopology = subTopologies[i]
         if exclusive == True and usedTopologies[i] == 1:
             continue
         context = topologic.Context.ByTopologyParameters(subTopology, 0.5, 0.5, 0.5)
         _ = topologic.Aperture.ByTopologyContext(aperture, context)
+        TopologyAttributeCache.session.invalidate(subTopology, "apertures")
         if exclusive == True:
             usedTopologies[i] = 1
     return None
@@ -0,0 +1,93 @@
+import topologic
+import hashlib
+from collections import OrderedDict
+
+class AttributeCache:
+	"""
+	Memo of derived face attributes (area, normal at (0.5, 0.5), centroid, internal vertex and
+	apertures) keyed on the SHA-1 of the BREP string of the topology, so the fresh wrappers that
+	Faces() returns for the same face share one entry. Transforms and booleans produce new BREPs and
+	therefore new keys. Apertures are not part of the BREP, so code that attaches apertures must call
+	invalidate() on the receiving topology, and the aperture list of a face describes the last face
+	with that geometry that was read (clear the cache when switching between models). At most
+	maxItems topologies are kept (least recently used first out). Vertices are stored as coordinates
+	and rebuilt on every read, so callers never share a mutable topology.
+	"""
+	def __init__(self, maxItems=4096):
+		self.maxItems = maxItems
+		self.store = OrderedDict()
+		self.hits = 0
+		self.misses = 0
+
+	def get(self, topology, name, compute, key=None):
+		if key is None:
+			key = topologyKey(topology)
+		attributes = self.store.get(key)
+		if attributes is None:
+			attributes = {}
+			self.store[key] = attributes
+			while len(self.store) > self.maxItems:
+				self.store.popitem(last=False)
+		else:
+			self.store.move_to_end(key)
+		if name in attributes:
+			self.hits += 1
+			return attributes[name]
+		self.misses += 1
+		value = compute(topology)
+		attributes[name] = value
+		return value
+
+	def invalidate(self, topology=None, name=None):
+		"""
+		Forgets the attributes of the input topology (or only the named attribute). Without a
+		topology the whole cache is cleared.
+		"""
+		if topology is None:
+			self.store.clear()
+			return
+		key = topologyKey(topology)
+		if name is None:
+			self.store.pop(key, None)
+		elif key in self.store:
+			self.store[key].pop(name, None)
+
+	def stats(self):
+		total = self.hits + self.misses
+		return {"hits": self.hits, "misses": self.misses, "entries": len(self.store), "hitRate": (float(self.hits)/total if total > 0 else 0.0)}
+
+# The cache shared by the nodes, the importers and the app for the lifetime of the process
+session = AttributeCache()
+
+def topologyKey(topology):
+	return hashlib.sha1(topology.String().encode()).hexdigest()
+
+def apertureTopologies(topology):
+	apertures = []
+	_ = topology.Apertures(apertures)
+	return [topologic.Aperture.Topology(aperture) for aperture in apertures]
+
+def vertexCoordinates(vertex):
+	return (vertex.X(), vertex.Y(), vertex.Z())
+
+def cached(topology, name, compute, cache, key):
+	if cache is None:
+		return compute(topology)
+	return cache.get(topology, name, compute, key)
+
+def area(face, cache=None, key=None):
+	return cached(face, "area", topologic.FaceUtility.Area, cache, key)
+
+def normal(face, cache=None, key=None):
+	return list(cached(face, "normal", lambda f: tuple(topologic.FaceUtility.NormalAtParameters(f, 0.5, 0.5)), cache, key))
+
+def centroid(topology, cache=None, key=None):
+	x, y, z = cached(topology, "centroid", lambda t: vertexCoordinates(t.Centroid()), cache, key)
+	return topologic.Vertex.ByCoordinates(x, y, z)
+
+def internalVertex(face, tolerance, cache=None, key=None):
+	x, y, z = cached(face, "internalVertex"+repr(tolerance), lambda f: vertexCoordinates(topologic.FaceUtility.InternalVertex(f, tolerance)), cache, key)
+	return topologic.Vertex.ByCoordinates(x, y, z)
+
+def apertures(topology, cache=None, key=None):
+	return list(cached(topology, "apertures", apertureTopologies, cache, key))
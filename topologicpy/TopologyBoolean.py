@@ -8,6 +8,7 @@ from topologic import Vertex, Edge, Wire, Face, Shell, Cell, CellComplex, Cluste
 import time
 from . import Replication
 from . import DictionaryByKeysValues, DictionaryValueAtKey
+from . import DictionaryTransfer
 
 
 def topologyContains(topology, vertex, tol):
@@ -45,37 +46,8 @@ def relevantSelector(topology, tol):
 		return topology.CenterOfMass()
 
 def transferDictionaries(sources, sinks, tol):
-	for sink in sinks:
-		sinkKeys = []
-		sinkValues = []
-		iv = relevantSelector(sink, tol)
-		j = 1
-		for source in sources:
-			if topologyContains(source, iv, tol):
-				d = source.GetDictionary()
-				if d == None:
-					continue
-				stlKeys = d.Keys()
-				if len(stlKeys) > 0:
-					sourceKeys = d.Keys()
-					for aSourceKey in sourceKeys:
-						if aSourceKey not in sinkKeys:
-							sinkKeys.append(aSourceKey)
-							sinkValues.append("")
-					for i in range(len(sourceKeys)):
-						index = sinkKeys.index(sourceKeys[i])
-						sourceValue = DictionaryValueAtKey.processItem([d, sourceKeys[i]])
-						if sourceValue != None:
-							if sinkValues[index] != "":
-								if isinstance(sinkValues[index], list):
-									sinkValues[index].append(sourceValue)
-								else:
-									sinkValues[index] = [sinkValues[index], sourceValue]
-							else:
-								sinkValues[index] = sourceValue
-		if len(sinkKeys) > 0 and len(sinkValues) > 0:
-			newDict = DictionaryByKeysValues.processItem([sinkKeys, sinkValues])
-			_ = sink.SetDictionary(newDict)
+	DictionaryTransfer.transferSourcesToSinks(sources, sinks, tol, lambda t: relevantSelector(t, tol), topologyContains, lambda d, k: DictionaryValueAtKey.processItem([d, k]), lambda keys, values: DictionaryByKeysValues.processItem([keys, values]))
+
 
 def highestDimension(topology):
 	if (topology.Type() == topologic.Cluster.Type()):
@@ -335,20 +307,7 @@ class SvTopologyBoolean(bpy.types.Node, SverchCustomTreeNode):
 		tranDictList = Replication.flatten(tranDictList)
 		toleranceList = Replication.flatten(toleranceList)
 		inputs = [topologyAList, topologyBList, booleanOpList, tranDictList, toleranceList]
-		if ((self.Replication) == "Default"):
-			inputs = Replication.iterate(inputs)
-			inputs = Replication.transposeList(inputs)
-		elif ((self.Replication) == "Trim"):
-			inputs = Replication.trim(inputs)
-			inputs = Replication.transposeList(inputs)
-		elif ((self.Replication) == "Iterate"):
-			inputs = Replication.iterate(inputs)
-			inputs = Replication.transposeList(inputs)
-		elif ((self.Replication) == "Repeat"):
-			inputs = Replication.repeat(inputs)
-			inputs = Replication.transposeList(inputs)
-		elif ((self.Replication) == "Interlace"):
-			inputs = list(Replication.interlace(inputs))
+		inputs = Replication.replicateInputs(inputs, self.Replication)
 		outputs = []
 		for anInput in inputs:
 			outputs.append(processItem(anInput))
@@ -345,7 +345,7 @@ class SvTopologyByGeometry(bpy.types.Node, SverchCustomTreeNode):
 				inputs = Replication.repeat(inputs)
 				inputs = Replication.transposeList(inputs)
 			elif ((self.Replication) == "Interlace"):
-				inputs = list(Replication.interlace(inputs))
+				inputs = Replication.interlace(inputs)
 			outputs = []
 			for anInput in inputs:
 				outputs.append(processItem(anInput, tol, self.outputMode))
@@ -369,7 +369,7 @@ class SvTopologyByGeometry(bpy.types.Node, SverchCustomTreeNode):
 				inputs = Replication.repeat(inputs)
 				inputs = Replication.transposeList(inputs)
 			elif ((self.Replication) == "Interlace"):
-				inputs = list(Replication.interlace(inputs))
+				inputs = Replication.interlace(inputs)
 			outputs = []
 			for anInput in inputs:
 				outputs.append(processVEF(anInput, tol, self.outputMode))
@@ -1,5 +1,5 @@
 import bpy
-from bpy.props import StringProperty, FloatProperty
+from bpy.props import StringProperty, FloatProperty, IntProperty
 from sverchok.node_tree import SverchCustomTreeNode
 from sverchok.data_structure import updateNode
 import sys
@@ -11,16 +11,7 @@ except:
 import topologic
 from topologic import Vertex, Edge, Wire, Face, Shell, Cell, CellComplex, Cluster, Topology
 import uuid
-
-# From https://stackabuse.com/python-how-to-flatten-list-of-lists/
-def flatten(element):
-	returnList = []
-	if isinstance(element, list) == True:
-		for anItem in element:
-			returnList = returnList + flatten(anItem)
-	else:
-		returnList = [element]
-	return returnList
+from . import Replication
 
 def processKeysValues(keys, values):
 	if len(keys) != len(values):
@@ -70,71 +61,156 @@ def triangulate(faces):
 		ib = []
 		_ = aFace.InternalBoundaries(ib)
 		if len(ib) != 0:
-			print("Found Internal Boundaries")
 			faceTriangles = []
 			topologic.FaceUtility.Triangulate(aFace, 0.0, faceTriangles)
-			print("Length of Face Triangles:", len(faceTriangles))
 			for aFaceTriangle in faceTriangles:
 				triangles.append(aFaceTriangle)
 		else:
 			triangles.append(aFace)
 	return triangles
 
-def processItem(filePath, typeList):
+def geometrySettings():
 	settings = ifcopenshell.geom.settings()
 	settings.set(settings.USE_BREP_DATA,True)
 	settings.set(settings.SEW_SHELLS,True)
 	settings.set(settings.USE_WORLD_COORDS,False)
+	return settings
+
+def typeProducts(ifc_file, typeList):
+	"""
+	Returns the products of the input types in type order, each product listed once. Only IfcProduct
+	entities with a Representation are returned: the other entities have no geometry to import.
+	"""
+	products = []
+	seen = set()
+	for aType in typeList:
+		for p in ifc_file.by_type(aType):
+			if p.id() not in seen and p.is_a("IfcProduct") and p.Representation != None:
+				seen.add(p.id())
+				products.append(p)
+	return products
 
+def propertySets(ifc_file, products):
+	"""
+	Returns a dictionary of product id to [keys, values] of its IfcPropertySingleValue properties,
+	read in one pass over the IfcRelDefinesByProperties relationships.
+	"""
+	wanted = set(p.id() for p in products)
+	properties = {}
+	for definition in ifc_file.by_type("IfcRelDefinesByProperties"):
+		property_set = definition.RelatingPropertyDefinition
+		# To support IFC2X3, we need to filter our results.
+		if not property_set.is_a("IfcPropertySet"):
+			continue
+		singles = [[property.Name, property.NominalValue.wrappedValue] for property in property_set.HasProperties if property.is_a('IfcPropertySingleValue') and property.NominalValue != None]
+		if len(singles) == 0:
+			continue
+		for p in definition.RelatedObjects:
+			if p.id() in wanted:
+				keys, values = properties.setdefault(p.id(), [[], []])
+				for key, value in singles:
+					keys.append(key)
+					values.append(value)
+	return properties
+
+def productBReps(ifc_file, products, settings, threads):
+	"""
+	Yields [product, brepString, error] in the order of the input products. With threads > 1 the
+	shapes come from the ifcopenshell geometry iterator, which returns them in the order they
+	finish, so they are collected before being yielded. Products the iterator does not return are
+	yielded with an error.
+	"""
+	if threads > 1 and len(products) > 1:
+		iterator = ifcopenshell.geom.iterator(settings, ifc_file, threads, include=products)
+		if iterator.initialize():
+			wanted = set(p.id() for p in products)
+			breps = {}
+			while True:
+				shape = iterator.get()
+				if shape.id in wanted:
+					breps[shape.id] = shape.geometry.brep_data
+				if not iterator.next():
+					break
+			for p in products:
+				if p.id() in breps:
+					yield [p, breps.pop(p.id()), None]
+				else:
+					yield [p, None, "The geometry iterator did not produce a shape for this product"]
+			return
+	for p in products:
+		try:
+			cr = ifcopenshell.geom.create_shape(settings, p)
+			yield [p, cr.geometry.brep_data, None]
+		except Exception as e:
+			yield [p, None, str(e)]
+
+def productTopology(p, brepString, properties):
+	topology = topologic.Topology.ByString(brepString)
+	if topology == None:
+		raise Exception("Topology.ByString returned no topology")
+	if topology.Type() == 8:
+		triangles = triangulate([topology])
+		topology = topologic.Cluster.ByTopologies(triangles)
+	elif topology.Type() > 8:
+		faces = []
+		_ = topology.Faces(None, faces)
+		triangles = triangulate(faces)
+		topology = topologic.Cluster.ByTopologies(triangles)
+	keys = []
+	values = []
+	keys.append("TOPOLOGIC_color")
+	values.append([1.0,1.0,1.0,1.0])
+	keys.append("TOPOLOGIC_id")
+	values.append(str(uuid.uuid4()))
+	keys.append("TOPOLOGIC_name")
+	values.append(p.Name)
+	keys.append("TOPOLOGIC_type")
+	values.append(topology.GetTypeAsString())
+	keys.append("IFC_id")
+	values.append(str(p.GlobalId))
+	keys.append("IFC_name")
+	values.append(p.Name)
+	keys.append("IFC_type")
+	values.append(p.is_a())
+	if p.id() in properties:
+		keys += properties[p.id()][0]
+		values += properties[p.id()][1]
+	topDict = processKeysValues(keys, values)
+	_ = topology.SetDictionary(topDict)
+	return topology
+
+def importTopologies(filePath, typeList, threads=1):
+	"""
+	Yields [topology, failure] per product, in type and product order. failure is None on success
+	and [GlobalId, IFC type, message] when the product could not be imported.
+	"""
 	ifc_file = ifcopenshell.open(filePath)
 	if len(typeList) < 1:
 		typeList = ifc_file.types()
-	returnList = []
-	for aType in typeList:
-		products = ifc_file.by_type(aType)
-		for p in products:
+	products = typeProducts(ifc_file, typeList)
+	properties = propertySets(ifc_file, products)
+	for p, brepString, error in productBReps(ifc_file, products, geometrySettings(), threads):
+		if error == None:
 			try:
-				cr = ifcopenshell.geom.create_shape(settings, p)
-				brepString = cr.geometry.brep_data
-				topology = topologic.Topology.ByString(brepString)
-				if topology.Type() == 8:
-					triangles = triangulate([topology])
-					topology = topologic.Cluster.ByTopologies(triangles)
-				elif topology.Type() > 8:
-					faces = []
-					_ = topology.Faces(None, faces)
-					triangles = triangulate(faces)
-					topology = topologic.Cluster.ByTopologies(triangles)
-				keys = []
-				values = []
-				keys.append("TOPOLOGIC_color")
-				values.append([1.0,1.0,1.0,1.0])
-				keys.append("TOPOLOGIC_id")
-				values.append(str(uuid.uuid4()))
-				keys.append("TOPOLOGIC_name")
-				values.append(p.Name)
-				keys.append("TOPOLOGIC_type")
-				values.append(topology.GetTypeAsString())
-				keys.append("IFC_id")
-				values.append(str(p.GlobalId))
-				keys.append("IFC_name")
-				values.append(p.Name)
-				keys.append("IFC_type")
-				values.append(p.is_a())
-				for definition in p.IsDefinedBy:
-					# To support IFC2X3, we need to filter our results.
-					if definition.is_a('IfcRelDefinesByProperties'):
-						property_set = definition.RelatingPropertyDefinition
-						for property in property_set.HasProperties:
-							if property.is_a('IfcPropertySingleValue'):
-								keys.append(property.Name)
-								values.append(property.NominalValue.wrappedValue)
-				topDict = processKeysValues(keys, values)
-				_ = topology.SetDictionary(topDict)
-			except:
+				yield [productTopology(p, brepString, properties), None]
 				continue
+			except Exception as e:
+				error = str(e)
+		yield [None, [str(p.GlobalId), p.is_a(), error]]
+
+def processItem(filePath, typeList, threads=1):
+	"""
+	Returns [topologies, report] where report lists [GlobalId, IFC type, message] for every
+	product that could not be imported.
+	"""
+	returnList = []
+	report = []
+	for topology, failure in importTopologies(filePath, typeList, threads):
+		if failure == None:
 			returnList.append(topology)
-	return returnList
+		else:
+			report.append(failure)
+	return [returnList, report]
 
 class SvTopologyByImportedIFC(bpy.types.Node, SverchCustomTreeNode):
 	"""
@@ -144,11 +220,14 @@ class SvTopologyByImportedIFC(bpy.types.Node, SverchCustomTreeNode):
 	bl_idname = 'SvTopologyByImportedIFC'
 	bl_label = 'Topology.ByImportedIFC'
 	FilePath: StringProperty(name="file", default="", subtype="FILE_PATH")
+	ThreadsProp: IntProperty(name="Threads", description="The number of threads used by the ifcopenshell geometry iterator", default=1, min=1, update=updateNode)
 
 	def sv_init(self, context):
 		self.inputs.new('SvStringsSocket', 'File Path').prop_name='FilePath'
 		self.inputs.new('SvStringsSocket', 'IFC Types')
+		self.inputs.new('SvStringsSocket', 'Threads').prop_name='ThreadsProp'
 		self.outputs.new('SvStringsSocket', 'Topology')
+		self.outputs.new('SvStringsSocket', 'Report')
 
 	def process(self):
 		if not any(socket.is_linked for socket in self.outputs):
@@ -158,11 +237,12 @@ class SvTopologyByImportedIFC(bpy.types.Node, SverchCustomTreeNode):
 			typeList = ['ifcProduct']
 		else:
 			typeList = self.inputs['IFC Types'].sv_get(deepcopy=False)
-			typeList = flatten(typeList)
-		outputs = []
-		outputs.append(processItem(filePath, typeList))
-		outputs = flatten(outputs)
+			typeList = Replication.flatten(typeList)
+		threads = Replication.flatten(self.inputs['Threads'].sv_get(deepcopy=True))[0]
+		outputs, report = processItem(filePath, typeList, int(threads))
+		outputs = Replication.flatten(outputs)
 		self.outputs['Topology'].sv_set(outputs)
+		self.outputs['Report'].sv_set(report)
 
 def register():
     bpy.utils.register_class(SvTopologyByImportedIFC)
@@ -1,6 +1,7 @@
 import topologic
-from topologicpy import VertexNearestVertex, DictionaryValueAtKey, DictionaryByKeysValues, TopologySetDictionary
+from topologicpy import VertexNearestVertex, DictionaryTransfer, TopologyAttributeCache
 import json
+import codecs
 
 def relevantSelector(topology, tol):
 	returnVertex = None
@@ -9,7 +10,7 @@ def relevantSelector(topology, tol):
 	elif topology.Type() == topologic.Edge.Type():
 		return topologic.EdgeUtility.PointAtParameter(topology, 0.5)
 	elif topology.Type() == topologic.Face.Type():
-		return topologic.FaceUtility.InternalVertex(topology, tol)
+		return TopologyAttributeCache.internalVertex(topology, tol, TopologyAttributeCache.session)
 	elif topology.Type() == topologic.Cell.Type():
 		return topologic.CellUtility.InternalVertex(topology, tol)
 	else:
@@ -64,44 +65,8 @@ def valueAtKey(item, key):
 		return None
 
 def transferDictionaries(sources, sinks, tol):
-	usedSources = []
-	for i in range(len(sources)):
-		usedSources.append(False)
-	for sink in sinks:
-		sinkKeys = []
-		sinkValues = []
-		for j in range(len(sources)):
-			source = sources[j]
-			if usedSources[j] == False:
-				d = source.GetDictionary()
-				if d:
-					sourceKeys = d.Keys()
-					if len(sourceKeys) > 0:
-						iv = relevantSelector(source, tol)
-						if topologyContains(sink, iv, tol):
-							usedSources[j] = True
-							for aSourceKey in sourceKeys:
-								if aSourceKey not in sinkKeys:
-									sinkKeys.append(aSourceKey)
-									sinkValues.append("")
-							for i in range(len(sourceKeys)):
-								index = sinkKeys.index(sourceKeys[i])
-								sourceValue = valueAtKey(d, sourceKeys[i])
-								if sourceValue != None:
-									if sinkValues[index] != "":
-										if isinstance(sinkValues[index], list):
-											sinkValues[index].append(sourceValue)
-										else:
-											sinkValues[index] = [sinkValues[index], sourceValue]
-									else:
-										sinkValues[index] = sourceValue
-					else:
-						usedSources[j] = True # Has no keys so not useful to reconsider
-				else:
-					usedSources[j] = True # Has no dictionary so not useful to reconsider
-		if len(sinkKeys) > 0 and len(sinkValues) > 0:
-			newDict = processKeysValues(sinkKeys, sinkValues)
-			_ = sink.SetDictionary(newDict)
+	DictionaryTransfer.transferSelectorsToSinks(sources, sinks, tol, lambda t: relevantSelector(t, tol), topologyContains, valueAtKey, processKeysValues)
+
 
 def highestDimension(topology):
 	if (topology.Type() == topologic.Cluster.Type()):
@@ -237,7 +202,7 @@ def internalVertex(topology, tolerance):
 		tempFace = tempFaces[0]
 		vst = topologic.FaceUtility.InternalVertex(tempFace, tolerance)
 	elif classType == 8: #Face
-		vst = topologic.FaceUtility.InternalVertex(topology, tolerance)
+		vst = TopologyAttributeCache.internalVertex(topology, tolerance, TopologyAttributeCache.session)
 	elif classType == 4: #Wire
 		if topology.IsClosed():
 			internalBoundaries = []
@@ -277,26 +242,19 @@ def processApertures(subTopologies, apertureCluster, exclusive, tolerance):
 		apertures = vertices
 	else:
 		apertures = []
-	usedTopologies = []
-	temp_verts = []
-	for i, subTopology in enumerate(subTopologies):
-			usedTopologies.append(0)
-			temp_v = internalVertex(subTopology, tolerance)
-			d = DictionaryByKeysValues.processItem([["id"], [i]])
-			temp_v = TopologySetDictionary.processItem([temp_v, d])
-			temp_verts.append(temp_v)
-	clus = topologic.Cluster.ByTopologies(temp_verts)
-	tree = VertexNearestVertex.kdtree(clus)
-	for aperture in apertures:
-		apCenter = internalVertex(aperture, tolerance)
-		nearest_vert = VertexNearestVertex.find_nearest_neighbor(tree=tree, vertex=apCenter)
-		d = nearest_vert.GetDictionary()
-		i = DictionaryValueAtKey.processItem([d,"id"])
+	usedTopologies = [0]*len(subTopologies)
+	if len(subTopologies) == 0 or len(apertures) == 0:
+		return None
+	tree = VertexNearestVertex.KDTree(VertexNearestVertex.vertexCoordinates([internalVertex(subTopology, tolerance) for subTopology in subTopologies]))
+	apCenters = VertexNearestVertex.vertexCoordinates([internalVertex(aperture, tolerance) for aperture in apertures])
+	distances, nearest = tree.query(apCenters, 1)
+	for aperture, i in zip(apertures, nearest[:, 0]):
 		subTopology = subTopologies[i]
 		if exclusive == True and usedTopologies[i] == 1:
 			continue
 		context = topologic.Context.ByTopologyParameters(subTopology, 0.5, 0.5, 0.5)
 		_ = topologic.Aperture.ByTopologyContext(aperture, context)
+		TopologyAttributeCache.session.invalidate(subTopology, "apertures")
 		if exclusive == True:
 			usedTopologies[i] = 1
 	return None
@@ -315,6 +273,7 @@ def processApertures_old(subTopologies, apertures, exclusive, tolerance):
 			if topologic.VertexUtility.Distance(apCenter, subTopology) < tolerance:
 				context = topologic.Context.ByTopologyParameters(subTopology, 0.5, 0.5, 0.5)
 				_ = topologic.Aperture.ByTopologyContext(aperture, context)
+				TopologyAttributeCache.session.invalidate(subTopology, "apertures")
 				if exclusive == True:
 					usedTopologies[i] = 1
 		ap = ap + 1
@@ -352,66 +311,161 @@ def assignDictionary(item):
 	_ = v.SetDictionary(d)
 	return v
 
-def processItem(item):
-	topology = None
-	topologies = []
-	jsondata = json.load(item)
-	for jsonItem in jsondata:
-		brep = jsonItem['brep']
-		brep = brep.replace("CASCADE Topology V3, (c) Open Cascade", "CASCADE Topology V1, (c) Matra-Datavision")
-		topology = topologic.Topology.ByString(brep)
-		if topology:
-			dictionary = jsonItem['dictionary']
-			topDictionary = dictionaryByPythonDictionary(dictionary)
-			_ = topology.SetDictionary(topDictionary)
-			cellApertures = getApertures(jsonItem['cellApertures'])
-			cells = []
-			try:
-				_ = topology.Cells(None, cells)
-			except:
-				pass
-			processApertures(cells, topologic.Cluster.ByTopologies(cellApertures), False, 0.001)
-			faceApertures = getApertures(jsonItem['faceApertures'])
-			faces = []
-			try:
-				_ = topology.Faces(None, faces)
-			except:
-				pass
-			processApertures(faces, topologic.Cluster.ByTopologies(faceApertures), False, 0.001)
-			edgeApertures = getApertures(jsonItem['edgeApertures'])
-			edges = []
-			try:
-				_ = topology.Edges(None, edges)
-			except:
-				pass
-			processApertures(edges, topologic.Cluster.ByTopologies(edgeApertures), False, 0.001)
-			vertexApertures = getApertures(jsonItem['vertexApertures'])
-			vertices = []
+jsonDelimiters = set(" \t\r\n,]}")
+
+def iterJSONArray(fp, chunkSize=65536):
+	"""
+	Yields the elements of a top-level JSON array one at a time, reading the file in chunks so
+	that only the element being decoded needs to be held in memory. The array must be well formed:
+	exactly one comma between elements, no trailing comma and nothing but whitespace after the
+	closing bracket.
+	"""
+	decoder = json.JSONDecoder()
+	textDecoder = codecs.getincrementaldecoder("utf-8")()
+	buffer = ""
+	position = 0
+	# "start": before "[", "first": after "[", "element": after ",", "separator": after an element, "end": after "]"
+	state = "start"
+	eof = False
+	readSize = chunkSize
+	while True:
+		while position < len(buffer) and buffer[position].isspace():
+			position += 1
+		if position < len(buffer):
+			character = buffer[position]
+			if state == "start":
+				if character == "\ufeff":
+					position += 1
+					continue
+				if character != "[":
+					raise Exception("Topology.ByImportedJSONMK1 - Error: The input JSON is not an array")
+				state = "first"
+				position += 1
+				continue
+			if state == "end":
+				raise Exception("Topology.ByImportedJSONMK1 - Error: The input JSON has data after the end of the array")
+			if state == "separator":
+				if character == ",":
+					state = "element"
+				elif character == "]":
+					state = "end"
+				else:
+					raise Exception("Topology.ByImportedJSONMK1 - Error: The elements of the input JSON array are not separated by commas")
+				position += 1
+				continue
+			if character == "]":
+				if state == "element":
+					raise Exception("Topology.ByImportedJSONMK1 - Error: The input JSON array has a trailing comma")
+				state = "end"
+				position += 1
+				continue
+			if character == ",":
+				raise Exception("Topology.ByImportedJSONMK1 - Error: The input JSON array has an empty element")
 			try:
-				_ = topology.Vertices(None, vertices)
-			except:
-				pass
-			processApertures(vertices, topologic.Cluster.ByTopologies(vertexApertures), False, 0.001)
-			cellDataList = jsonItem['cellDictionaries']
-			cellSelectors = []
-			for cellDataItem in cellDataList:
-				cellSelectors.append(assignDictionary(cellDataItem))
-			processSelectors(cellSelectors, topology, False, False, False, True, 0.001)
-			faceDataList = jsonItem['faceDictionaries']
-			faceSelectors = []
-			for faceDataItem in faceDataList:
-				faceSelectors.append(assignDictionary(faceDataItem))
-			processSelectors(faceSelectors, topology, False, False, True, False, 0.001)
-			edgeDataList = jsonItem['edgeDictionaries']
-			edgeSelectors = []
-			for edgeDataItem in edgeDataList:
-				edgeSelectors.append(assignDictionary(edgeDataItem))
-			processSelectors(edgeSelectors, topology, False, True, False, False, 0.001)
-			vertexDataList = jsonItem['vertexDictionaries']
-			vertexSelectors = []
-			for vertexDataItem in vertexDataList:
-				vertexSelectors.append(assignDictionary(vertexDataItem))
-			processSelectors(vertexSelectors, topology, True, False, False, False, 0.001)
-			topologies.append(topology)
-	return topologies
+				element, end = decoder.raw_decode(buffer, position)
+				decoded = True
+				if isinstance(element, (int, float)) and not isinstance(element, bool):
+					# A number is only complete once a delimiter after it is buffered: "2." may continue as "2.5"
+					decoded = eof or (end < len(buffer) and buffer[end] in jsonDelimiters)
+			except json.JSONDecodeError:
+				if eof:
+					raise
+				decoded = False
+			if decoded:
+				yield element
+				state = "separator"
+				buffer = buffer[end:]
+				position = 0
+				readSize = chunkSize
+				continue
+		elif eof:
+			if state == "start":
+				raise Exception("Topology.ByImportedJSONMK1 - Error: The input JSON is not an array")
+			if state != "end":
+				raise Exception("Topology.ByImportedJSONMK1 - Error: The input JSON array is not terminated")
+			return
+		chunk = fp.read(readSize)
+		if len(chunk) == 0:
+			eof = True # Taken from the raw read: a chunk holding part of a multibyte character decodes to ""
+		if isinstance(chunk, bytes):
+			chunk = textDecoder.decode(chunk, final=eof)
+		buffer = buffer[position:] + chunk
+		position = 0
+		if len(buffer) > readSize:
+			readSize = readSize*2 # Grow the reads for elements larger than a chunk to avoid re-decoding them too often
+
+def processJSONItem(jsonItem):
+	brep = jsonItem['brep']
+	brep = brep.replace("CASCADE Topology V3, (c) Open Cascade", "CASCADE Topology V1, (c) Matra-Datavision")
+	topology = topologic.Topology.ByString(brep)
+	if not topology:
+		return None
+	dictionary = jsonItem['dictionary']
+	topDictionary = dictionaryByPythonDictionary(dictionary)
+	_ = topology.SetDictionary(topDictionary)
+	cellApertures = getApertures(jsonItem['cellApertures'])
+	cells = []
+	try:
+		_ = topology.Cells(None, cells)
+	except:
+		pass
+	processApertures(cells, topologic.Cluster.ByTopologies(cellApertures), False, 0.001)
+	faceApertures = getApertures(jsonItem['faceApertures'])
+	faces = []
+	try:
+		_ = topology.Faces(None, faces)
+	except:
+		pass
+	processApertures(faces, topologic.Cluster.ByTopologies(faceApertures), False, 0.001)
+	edgeApertures = getApertures(jsonItem['edgeApertures'])
+	edges = []
+	try:
+		_ = topology.Edges(None, edges)
+	except:
+		pass
+	processApertures(edges, topologic.Cluster.ByTopologies(edgeApertures), False, 0.001)
+	vertexApertures = getApertures(jsonItem['vertexApertures'])
+	vertices = []
+	try:
+		_ = topology.Vertices(None, vertices)
+	except:
+		pass
+	processApertures(vertices, topologic.Cluster.ByTopologies(vertexApertures), False, 0.001)
+	cellDataList = jsonItem['cellDictionaries']
+	cellSelectors = []
+	for cellDataItem in cellDataList:
+		cellSelectors.append(assignDictionary(cellDataItem))
+	processSelectors(cellSelectors, topology, False, False, False, True, 0.001)
+	faceDataList = jsonItem['faceDictionaries']
+	faceSelectors = []
+	for faceDataItem in faceDataList:
+		faceSelectors.append(assignDictionary(faceDataItem))
+	processSelectors(faceSelectors, topology, False, False, True, False, 0.001)
+	edgeDataList = jsonItem['edgeDictionaries']
+	edgeSelectors = []
+	for edgeDataItem in edgeDataList:
+		edgeSelectors.append(assignDictionary(edgeDataItem))
+	processSelectors(edgeSelectors, topology, False, True, False, False, 0.001)
+	vertexDataList = jsonItem['vertexDictionaries']
+	vertexSelectors = []
+	for vertexDataItem in vertexDataList:
+		vertexSelectors.append(assignDictionary(vertexDataItem))
+	processSelectors(vertexSelectors, topology, True, False, False, False, 0.001)
+	return topology
 
+def iterItems(item):
+	"""
+	Generator version of processItem. Accepts a file path or a file-like object and yields each
+	topology as soon as its apertures and dictionaries have been applied.
+	"""
+	if isinstance(item, str):
+		with open(item, "rb") as fp:
+			yield from iterItems(fp)
+		return
+	for jsonItem in iterJSONArray(item):
+		topology = processJSONItem(jsonItem)
+		if topology:
+			yield topology
+
+def processItem(item):
+	return list(iterItems(item))
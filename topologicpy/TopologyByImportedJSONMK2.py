@@ -5,18 +5,10 @@ from sverchok.data_structure import updateNode
 
 import topologic
 from topologic import Vertex, Edge, Wire, Face, Shell, Cell, CellComplex, Cluster, Topology
+from . import DictionaryTransfer, TopologyAttributeCache
 import json
 import os
-
-# From https://stackabuse.com/python-how-to-flatten-list-of-lists/
-def flatten(element):
-	returnList = []
-	if isinstance(element, list) == True:
-		for anItem in element:
-			returnList = returnList + flatten(anItem)
-	else:
-		returnList = [element]
-	return returnList
+from . import Replication
 
 def relevantSelector(topology, tol):
 	returnVertex = None
@@ -25,7 +17,7 @@ def relevantSelector(topology, tol):
 	elif topology.Type() == topologic.Edge.Type():
 		return topologic.EdgeUtility.PointAtParameter(topology, 0.5)
 	elif topology.Type() == topologic.Face.Type():
-		return topologic.FaceUtility.InternalVertex(topology, tol)
+		return TopologyAttributeCache.internalVertex(topology, tol, TopologyAttributeCache.session)
 	elif topology.Type() == topologic.Cell.Type():
 		return topologic.CellUtility.InternalVertex(topology, tol)
 	else:
@@ -80,44 +72,8 @@ def valueAtKey(item, key):
 		return None
 
 def transferDictionaries(sources, sinks, tol):
-	usedSources = []
-	for i in range(len(sources)):
-		usedSources.append(False)
-	for sink in sinks:
-		sinkKeys = []
-		sinkValues = []
-		for j in range(len(sources)):
-			source = sources[j]
-			if usedSources[j] == False:
-				d = source.GetDictionary()
-				if d:
-					sourceKeys = d.Keys()
-					if len(sourceKeys) > 0:
-						iv = relevantSelector(source, tol)
-						if topologyContains(sink, iv, tol):
-							usedSources[j] = True
-							for aSourceKey in sourceKeys:
-								if aSourceKey not in sinkKeys:
-									sinkKeys.append(aSourceKey)
-									sinkValues.append("")
-							for i in range(len(sourceKeys)):
-								index = sinkKeys.index(sourceKeys[i])
-								sourceValue = valueAtKey(d, sourceKeys[i])
-								if sourceValue != None:
-									if sinkValues[index] != "":
-										if isinstance(sinkValues[index], list):
-											sinkValues[index].append(sourceValue)
-										else:
-											sinkValues[index] = [sinkValues[index], sourceValue]
-									else:
-										sinkValues[index] = sourceValue
-					else:
-						usedSources[j] = True # Has no keys so not useful to reconsider
-				else:
-					usedSources[j] = True # Has no dictionary so not useful to reconsider
-		if len(sinkKeys) > 0 and len(sinkValues) > 0:
-			newDict = processKeysValues(sinkKeys, sinkValues)
-			_ = sink.SetDictionary(newDict)
+	DictionaryTransfer.transferSelectorsToSinks(sources, sinks, tol, lambda t: relevantSelector(t, tol), topologyContains, valueAtKey, processKeysValues)
+
 
 def highestDimension(topology):
 	if (topology.Type() == topologic.Cluster.Type()):
@@ -285,6 +241,7 @@ def processApertures(subTopologies, apertures, exclusive, tolerance):
 			if topologic.VertexUtility.Distance(apCenter, subTopology) < tolerance:
 				context = topologic.Context.ByTopologyParameters(subTopology, 0.5, 0.5, 0.5)
 				_ = topologic.Aperture.ByTopologyContext(aperture, context)
+				TopologyAttributeCache.session.invalidate(subTopology, "apertures")
 				if exclusive == True:
 					usedTopologies[i] = 1
 		ap = ap + 1
@@ -415,7 +372,7 @@ class SvTopologyByImportedJSONMK2(bpy.types.Node, SverchCustomTreeNode):
 		if not any(socket.is_linked for socket in self.outputs):
 			return
 		inputs = self.inputs['File Path'].sv_get(deepcopy=False)
-		inputs = flatten(inputs)
+		inputs = Replication.flatten(inputs)
 		outputs = []
 		for anInput in inputs:
 			outputs.append(processItem(anInput))
@@ -4,100 +4,73 @@ from sverchok.node_tree import SverchCustomTreeNode
 from sverchok.data_structure import updateNode
 
 import numpy as np
-from numpy import arctan, pi, signbit
+from numpy import pi
 from numpy.linalg import norm
 import math
 
 import topologic
-from . import Replication, FaceNormalAtParameters, TopologySelfMerge
+from . import Replication, FaceNormalAtParameters, TopologySelfMerge, VertexNearestVertex
 
 from math import sqrt
 
-def angle_between(v1, v2):
-	u1 = v1 / norm(v1)
-	u2 = v2 / norm(v2)
-	y = u1 - u2
-	x = u1 + u2
-	if norm(x) == 0:
-		return 0
-	a0 = 2 * arctan(norm(y) / norm(x))
-	if (not signbit(a0)) or signbit(pi - a0):
-		return a0
-	elif signbit(a0):
-		return 0
-	else:
-		return pi
-
-def collinear(v1, v2, tol):
-	ang = angle_between(v1, v2)
-	if math.isnan(ang) or math.isinf(ang):
+def clusterNormals(normals, tol):
+	"""
+	Groups the indices of the input normals into clusters of parallel or anti-parallel normals
+	(angle below tol), closed under transitivity. Clusters are returned in order of decreasing
+	neighbour count, starting from the lowest index on ties, with their indices in breadth-first
+	order. Faces share a handful of distinct normals, so the neighbourhood is
+	computed once per distinct normal with a k-d tree over the normals and their antipodes.
+	"""
+	normals = np.asarray(normals, dtype=np.float64).reshape(-1, 3)
+	if len(normals) == 0:
+		return []
+	lengths = norm(normals, axis=1)
+	if np.any(lengths == 0) or not np.all(np.isfinite(lengths)):
 		raise Exception("Face.IsCollinear - Error: Could not determine the angle between the input faces")
-	elif abs(ang) < tol or abs(pi - ang) < tol:
-		return True
-	return False
-
-# Adapted from https://github.com/erikm0111/Clustering/blob/master/sim_matrix_clustering/clustering.py
-
-def process_input(line, samples):
-    x, y = line.split(",")
-    samples.append((float(x.strip()), float(y.strip())))
-    return samples
-
-def sumRow(matrix, i):
-    return np.sum(matrix[i,:])
-
-def buildSimilarityMatrix(samples, tol):
-    numOfSamples = len(samples)
-    matrix = np.zeros(shape=(numOfSamples, numOfSamples))
-    for i in range(len(matrix)):
-        for j in range(len(matrix)):
-            if collinear(samples[i], samples[j], tol):
-                matrix[i,j] = 1
-    return matrix
-
-def determineRow(matrix):
-    maxNumOfOnes = -1
-    row = -1
-    for i in range(len(matrix)):
-        if maxNumOfOnes < sumRow(matrix, i):
-            maxNumOfOnes = sumRow(matrix, i)
-            row = i
-    return row
-
-def categorizeIntoClusters(matrix):
-    groups = []
-    while np.sum(matrix) > 0:
-        group = []
-        row = determineRow(matrix)
-        indexes = addIntoGroup(matrix, row)
-        groups.append(indexes)
-        matrix = deleteChosenRowsAndCols(matrix, indexes)
-    return groups
-
-def addIntoGroup(matrix, ind):
-    change = True
-    indexes = []
-    for col in range(len(matrix)):
-        if matrix[ind, col] == 1:
-            indexes.append(col)
-    while change == True:
-        change = False
-        numIndexes = len(indexes)
-        for i in indexes:
-            for col in range(len(matrix)):
-                if matrix[i, col] == 1:
-                    if col not in indexes:
-                        indexes.append(col)
-        numIndexes2 = len(indexes)
-        if numIndexes != numIndexes2:
-            change = True
-    return indexes
-
-def deleteChosenRowsAndCols(matrix, indexes):
-    for i in indexes:
-        matrix[i,:] = 0
-        matrix[:,i] = 0
-    return matrix
+	distinct, inverse = np.unique(normals, axis=0, return_inverse=True)
+	inverse = inverse.reshape(-1)
+	m = len(distinct)
+	units = distinct / norm(distinct, axis=1)[:, None]
+	order = np.argsort(inverse, kind="stable")
+	facesOf = np.split(order, np.cumsum(np.bincount(inverse, minlength=m))[:-1])
+	if tol > pi/2:
+		# Any two normals are within tol of each other or of each other's antipode
+		neighbours = [np.arange(m) for a in range(m)]
+	else:
+		# Two unit vectors are within angle tol of each other when their chord is below 2*sin(tol/2).
+		# The k-d tree finds the candidates with a slightly larger radius, then the strict angle test
+		# of collinear() decides, so normals exactly tol apart stay in separate clusters.
+		points = np.concatenate([units, -units])
+		tree = VertexNearestVertex.KDTree(points)
+		radius = 2*math.sin(tol/2)*(1+1e-9)+1e-12
+		neighbours = []
+		for a, found in enumerate(tree.queryRadius(units, radius)):
+			angles = 2*np.arctan2(norm(units[a] - points[found], axis=1), norm(units[a] + points[found], axis=1))
+			neighbours.append(np.union1d(found[angles < tol] % m, [a]))
+	counts = np.array([len(f) for f in facesOf])
+	degrees = np.array([counts[nb].sum() for nb in neighbours])[inverse]
+	groups = []
+	done = np.zeros(m, dtype=bool)
+	for row in np.lexsort((np.arange(len(normals)), -degrees)).tolist():
+		if done[inverse[row]]:
+			continue
+		reached = set(neighbours[inverse[row]].tolist())
+		indexes = np.sort(np.concatenate([facesOf[b] for b in reached])).tolist()
+		expanded = set()
+		k = 0
+		while k < len(indexes):
+			a = inverse[indexes[k]]
+			k += 1
+			if a in expanded:
+				continue
+			expanded.add(a)
+			new = [b for b in neighbours[a].tolist() if b not in reached]
+			if len(new) > 0:
+				reached.update(new)
+				indexes += np.sort(np.concatenate([facesOf[b] for b in new])).tolist()
+		done[list(reached)] = True
+		groups.append(indexes)
+	return groups
 
 replication = [("Default", "Default", "", 1), ("Trim", "Trim", "", 2),("Iterate", "Iterate", "", 3),("Repeat", "Repeat", "", 4),("Interlace", "Interlace", "", 5)]
 
@@ -108,9 +81,7 @@ def processItem(item):
 	normals = []
 	for aFace in faces:
 		normals.append(FaceNormalAtParameters.processItem([aFace, 0.5, 0.5], "XYZ", 3))
-	# build a matrix of similarity
-	mat = buildSimilarityMatrix(normals, tol)
-	categories = categorizeIntoClusters(mat)
+	categories = clusterNormals(normals, tol)
 	returnList = []
 	for aCategory in categories:
 		tempList = []
@@ -149,20 +120,7 @@ class SvTopologyClusterFaces(bpy.types.Node, SverchCustomTreeNode):
 		toleranceList = self.inputs['Tol'].sv_get(deepcopy=True, default=0.0001)
 		toleranceList = Replication.flatten(toleranceList)
 		inputs = [topologyList, toleranceList]
-		if ((self.Replication) == "Default"):
-			inputs = Replication.iterate(inputs)
-			inputs = Replication.transposeList(inputs)
-		elif ((self.Replication) == "Trim"):
-			inputs = Replication.trim(inputs)
-			inputs = Replication.transposeList(inputs)
-		elif ((self.Replication) == "Iterate"):
-			inputs = Replication.iterate(inputs)
-			inputs = Replication.transposeList(inputs)
-		elif ((self.Replication) == "Repeat"):
-			inputs = Replication.repeat(inputs)
-			inputs = Replication.transposeList(inputs)
-		elif ((self.Replication) == "Interlace"):
-			inputs = list(Replication.interlace(inputs))
+		inputs = Replication.replicateInputs(inputs, self.Replication)
 		outputs = []
 		for anInput in inputs:
 			outputs.append(processItem(anInput))
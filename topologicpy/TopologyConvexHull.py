@@ -6,7 +6,9 @@ from sverchok.data_structure import updateNode
 import topologic
 import numpy as np
 from scipy.spatial import ConvexHull
-from . import ShellByFaces, ShellExternalBoundary, TopologySelfMerge, Replication
+from scipy.sparse import csr_matrix
+from scipy.sparse.csgraph import connected_components
+from . import ShellByFaces, ShellExternalBoundary, TopologySelfMerge, Replication, CellByFaces
 import math
 
 def list_level_iter(lst, level, _current_level: int= 1):
@@ -39,34 +41,81 @@ def recur(input, tol):
 		output = processItem([input, tol])
 	return output
 
-def convexHull3D(item, tol, option):
-	if item:
-		vertices = []
-		_ = item.Vertices(None, vertices)
-		pointList = []
-		for v in vertices:
-			pointList.append([v.X(), v.Y(), v.Z()])
-		points = np.array(pointList)
-		if option:
-			hull = ConvexHull(points, qhull_options=option)
-		else:
-			hull = ConvexHull(points)
-		hull_vertices = []
-		faces = []
-		for simplex in hull.simplices:
-			edges = []
-			for i in range(len(simplex)-1):
-				sp = hull.points[simplex[i]]
-				ep = hull.points[simplex[i+1]]
-				sv = topologic.Vertex.ByCoordinates(sp[0], sp[1], sp[2])
-				ev = topologic.Vertex.ByCoordinates(ep[0], ep[1], ep[2])
-				edges.append(topologic.Edge.ByStartVertexEndVertex(sv, ev))
-			sp = hull.points[simplex[-1]]
-			ep = hull.points[simplex[0]]
-			sv = topologic.Vertex.ByCoordinates(sp[0], sp[1], sp[2])
-			ev = topologic.Vertex.ByCoordinates(ep[0], ep[1], ep[2])
-			edges.append(topologic.Edge.ByStartVertexEndVertex(sv, ev))
-			faces.append(topologic.Face.ByExternalBoundary(topologic.Wire.ByEdges(edges)))
+def topologyPoints(item):
+	vertices = []
+	_ = item.Vertices(None, vertices)
+	return np.array([[v.X(), v.Y(), v.Z()] for v in vertices], dtype=np.float64).reshape(-1, 3)
+
+def coplanarGroups(hull, tol):
+	"""
+	Returns a label per simplex such that neighbouring simplices whose plane equations agree within
+	tol share a label.
+	"""
+	n = len(hull.simplices)
+	rows = np.repeat(np.arange(n), hull.neighbors.shape[1])
+	cols = hull.neighbors.reshape(-1)
+	keep = cols >= 0
+	rows, cols = rows[keep], cols[keep]
+	close = np.abs(hull.equations[rows] - hull.equations[cols]).max(axis=1) <= tol
+	graph = csr_matrix((np.ones(int(close.sum())), (rows[close], cols[close])), shape=(n, n))
+	_, labels = connected_components(graph, directed=False)
+	return labels
+
+def boundaryLoop(simplices, normal, points):
+	"""
+	Returns the ordered point indices of the outer boundary of a planar, convex set of triangles,
+	counter-clockwise around the outward normal.
+	"""
+	edges = np.sort(np.concatenate([simplices[:, [0, 1]], simplices[:, [1, 2]], simplices[:, [2, 0]]]), axis=1)
+	unique, counts = np.unique(edges, axis=0, return_counts=True)
+	boundary = unique[counts == 1]
+	following = {}
+	for a, b in boundary.tolist():
+		following.setdefault(a, []).append(b)
+		following.setdefault(b, []).append(a)
+	start = boundary[0][0]
+	loop = [int(start)]
+	previous = None
+	current = int(start)
+	while True:
+		candidates = [v for v in following[current] if v != previous]
+		nextVertex = candidates[0]
+		if nextVertex == start:
+			break
+		loop.append(nextVertex)
+		previous, current = current, nextVertex
+	coords = points[loop]
+	area = np.cross(coords, np.roll(coords, -1, axis=0)).sum(axis=0)
+	if np.dot(area, normal) < 0:
+		loop.reverse()
+	return loop
+
+def convexHull3D(item, tol, option, points=None):
+	if points is None:
+		points = topologyPoints(item)
+	points = np.asarray(points, dtype=np.float64).reshape(-1, 3)
+	if option:
+		hull = ConvexHull(points, qhull_options=option)
+	else:
+		hull = ConvexHull(points)
+	# One Vertex per hull point and one Edge per boundary segment, shared by the faces on both sides
+	vertices = {}
+	for i in hull.vertices.tolist():
+		p = hull.points[i]
+		vertices[i] = topologic.Vertex.ByCoordinates(p[0], p[1], p[2])
+	edges = {}
+	faces = []
+	labels = coplanarGroups(hull, tol)
+	order = np.argsort(labels, kind="stable")
+	for group in np.split(order, np.flatnonzero(np.diff(labels[order]))+1):
+		loop = boundaryLoop(hull.simplices[group], hull.equations[group[0]][:3], hull.points)
+		faceEdges = []
+		for a, b in zip(loop, loop[1:]+loop[:1]):
+			key = (min(a, b), max(a, b))
+			if key not in edges:
+				edges[key] = topologic.Edge.ByStartVertexEndVertex(vertices[key[0]], vertices[key[1]])
+			faceEdges.append(edges[key])
+		faces.append(topologic.Face.ByExternalBoundary(topologic.Wire.ByEdges(faceEdges)))
 	try:
 		c = CellByFaces.processItem(faces, tol)
 		return c
@@ -136,13 +185,21 @@ def convexHull2D(item, tol):
 	clus = topologic.TopologyUtility.Translate(clus, cm.X(), cm.Y(), cm.Z())
 	return [clus, base_item]
 
-def processItem(item):
+def processItem(item, points=None):
+	"""
+	Returns the convex hull of the input topology. Callers that already hold the coordinates can
+	pass them as an (N, 3) points array to skip the vertex walk.
+	"""
 	topology, tol = item
 	returnObject = None
+	if topology == None:
+		return None
+	if points is None:
+		points = topologyPoints(topology)
 	try:
-		returnObject = convexHull3D(topology, tol, None)
+		returnObject = convexHull3D(topology, tol, None, points)
 	except:
-		returnObject = convexHull3D(topology, tol, 'QJ')
+		returnObject = convexHull3D(topology, tol, 'QJ', points)
 	return returnObject
 
 class SvTopologyConvexHull(bpy.types.Node, SverchCustomTreeNode):
@@ -1,4 +1,6 @@
 import topologic
+import math
+import numpy as np
 from topologic import Topology, Vertex, Edge, Wire, Face, Shell, Cell, CellComplex, Cluster, Graph, Dictionary, Attribute, VertexUtility, EdgeUtility, WireUtility, FaceUtility, ShellUtility, CellUtility, TopologyUtility
 
 def getSubTopologies(topology, subTopologyClass):
@@ -30,45 +32,83 @@ def triangulateFace(face):
 	faceTriangles.append(face)
 	return faceTriangles
 
-def processItem(item):
-	vertices = []
+def vtkFaces(connectivity, offsets):
+	"""
+	Converts a connectivity/offsets pair into the padded [n, i0, i1, ...] face array used by VTK and PyVista.
+	"""
+	return np.insert(connectivity, offsets[:-1], np.diff(offsets)).astype(np.int32)
+
+class VertexWelder:
+	"""
+	Assigns a single index to coincident vertices. With a tolerance of zero,
+	coordinates are matched exactly. Otherwise coordinates are quantized to a
+	grid of cell size tolerance and vertices within tolerance of an already
+	welded vertex in the same or a neighbouring cell reuse its index.
+	"""
+	def __init__(self, tolerance=0.0):
+		self.tolerance = tolerance
+		self.vertices = []
+		self.lookup = {}
+
+	def key(self, coords):
+		if self.tolerance <= 0:
+			return tuple(coords)
+		return tuple(int(math.floor(c/self.tolerance)) for c in coords)
+
+	def index(self, aVertex):
+		coords = [aVertex.X(), aVertex.Y(), aVertex.Z()]
+		k = self.key(coords)
+		if self.tolerance <= 0:
+			i = self.lookup.get(k)
+			if i == None:
+				i = len(self.vertices)
+				self.vertices.append(coords)
+				self.lookup[k] = i
+			return i
+		tol2 = self.tolerance*self.tolerance
+		for dx in (-1, 0, 1):
+			for dy in (-1, 0, 1):
+				for dz in (-1, 0, 1):
+					for i in self.lookup.get((k[0]+dx, k[1]+dy, k[2]+dz), []):
+						v = self.vertices[i]
+						if (v[0]-coords[0])**2 + (v[1]-coords[1])**2 + (v[2]-coords[2])**2 <= tol2:
+							return i
+		i = len(self.vertices)
+		self.vertices.append(coords)
+		self.lookup.setdefault(k, []).append(i)
+		return i
+
+def processItem(item, tolerance=0.0, as_arrays=False):
 	edges = []
 	faces = []
+	connectivity = []
+	offsets = [0]
 	if item == None:
+		if as_arrays:
+			return [np.zeros((0, 3), dtype=np.float64), np.zeros((0, 2), dtype=np.int32), np.zeros(0, dtype=np.int32), np.zeros(1, dtype=np.int32)]
 		return [None, None, None]
+	welder = VertexWelder(tolerance)
+	vertices = welder.vertices
 	topVerts = []
 	if (item.Type() == 1): #input is a vertex, just add it and process it
 		topVerts.append(item)
 	else:
 		_ = item.Vertices(None, topVerts)
 	for aVertex in topVerts:
-		try:
-			vertices.index([aVertex.X(), aVertex.Y(), aVertex.Z()]) # Vertex already in list
-		except:
-			vertices.append([aVertex.X(), aVertex.Y(), aVertex.Z()]) # Vertex not in list, add it.
+		_ = welder.index(aVertex)
 	topEdges = []
 	if (item.Type() == 2): #Input is an Edge, just add it and process it
 		topEdges.append(item)
 	elif (item.Type() > 2):
 		_ = item.Edges(None, topEdges)
+	edgeKeys = set()
 	for anEdge in topEdges:
-		e = []
-		sv = anEdge.StartVertex()
-		ev = anEdge.EndVertex()
-		try:
-			svIndex = vertices.index([sv.X(), sv.Y(), sv.Z()])
-		except:
-			vertices.append([sv.X(), sv.Y(), sv.Z()])
-			svIndex = len(vertices)-1
-		try:
-			evIndex = vertices.index([ev.X(), ev.Y(), ev.Z()])
-		except:
-			vertices.append([ev.X(), ev.Y(), ev.Z()])
-			evIndex = len(vertices)-1
-		e.append(svIndex)
-		e.append(evIndex)
-		if ([e[0], e[1]] not in edges) and ([e[1], e[0]] not in edges):
-			edges.append(e)
+		svIndex = welder.index(anEdge.StartVertex())
+		evIndex = welder.index(anEdge.EndVertex())
+		edgeKey = (min(svIndex, evIndex), max(svIndex, evIndex))
+		if edgeKey not in edgeKeys:
+			edgeKeys.add(edgeKey)
+			edges.append([svIndex, evIndex])
 	topFaces = []
 	if (item.Type() == 8): # Input is a Face, just add it and process it
 		topFaces.append(item)
@@ -78,32 +118,22 @@ def processItem(item):
 		ib = []
 		_ = aFace.InternalBoundaries(ib)
 		if(len(ib) > 0):
-			triFaces = triangulateFace(aFace)
-			for aTriFace in triFaces:
-				wire = aTriFace.ExternalBoundary()
-				faceVertices = getSubTopologies(wire, Vertex)
-				f = []
-				for aVertex in faceVertices:
-					try:
-						fVertexIndex = vertices.index([aVertex.X(), aVertex.Y(), aVertex.Z()])
-					except:
-						vertices.append([aVertex.X(), aVertex.Y(), aVertex.Z()])
-						fVertexIndex = len(vertices)-1
-					f.append(fVertexIndex)
-				faces.append(f)
+			wires = [aTriFace.ExternalBoundary() for aTriFace in triangulateFace(aFace)]
 		else:
-			wire =  aFace.ExternalBoundary()
+			wires = [aFace.ExternalBoundary()]
 			#wire = topologic.WireUtility.RemoveCollinearEdges(wire, 0.1) #This is an angle Tolerance
+		for wire in wires:
 			faceVertices = getSubTopologies(wire, Vertex)
-			f = []
-			for aVertex in faceVertices:
-				try:
-					fVertexIndex = vertices.index([aVertex.X(), aVertex.Y(), aVertex.Z()])
-				except:
-					vertices.append([aVertex.X(), aVertex.Y(), aVertex.Z()])
-					fVertexIndex = len(vertices)-1
-				f.append(fVertexIndex)
-			faces.append(f)
+			f = [welder.index(aVertex) for aVertex in faceVertices]
+			if as_arrays:
+				connectivity.extend(f)
+				offsets.append(len(connectivity))
+			else:
+				faces.append(f)
+	if as_arrays:
+		points = np.array(vertices, dtype=np.float64).reshape(-1, 3)
+		edgeArray = np.array(edges, dtype=np.int32).reshape(-1, 2)
+		return [points, edgeArray, np.array(connectivity, dtype=np.int32), np.array(offsets, dtype=np.int32)]
 	if len(vertices) == 0:
 		vertices = [[]]
 	if len(edges) == 0:
@@ -4,16 +4,7 @@ from sverchok.node_tree import SverchCustomTreeNode
 from sverchok.data_structure import updateNode
 
 import topologic
-
-# From https://stackabuse.com/python-how-to-flatten-list-of-lists/
-def flatten(element):
-	returnList = []
-	if isinstance(element, list) == True:
-		for anItem in element:
-			returnList = returnList + flatten(anItem)
-	else:
-		returnList = [element]
-	return returnList
+from . import Replication
 
 def processItem(item):
 	return topologic.Topology.IsSame(item[0], item[1])
@@ -52,8 +43,8 @@ class SvTopologyIsSame(bpy.types.Node, SverchCustomTreeNode):
 			return
 		topologyAList = self.inputs['Topology A'].sv_get(deepcopy=False)
 		topologyBList = self.inputs['Topology B'].sv_get(deepcopy=False)
-		topologyAList = flatten(topologyAList)
-		topologyBList = flatten(topologyBList)
+		topologyAList = Replication.flatten(topologyAList)
+		topologyBList = Replication.flatten(topologyBList)
 		matchLengths([topologyAList, topologyBList])
 		inputs = zip(topologyAList, topologyBList)
 		output = []
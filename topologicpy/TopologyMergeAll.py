@@ -5,16 +5,7 @@ from sverchok.data_structure import updateNode
 
 import topologic
 import time
-
-# From https://stackabuse.com/python-how-to-flatten-list-of-lists/
-def flatten(element):
-	returnList = []
-	if isinstance(element, list) == True:
-		for anItem in element:
-			returnList = returnList + flatten(anItem)
-	else:
-		returnList = [element]
-	return returnList
+from . import Replication
 
 def processItem(item):
 	resultTopology = item[0]
@@ -66,7 +57,7 @@ class SvTopologyMergeAll(bpy.types.Node, SverchCustomTreeNode):
 		if not any(socket.is_linked for socket in self.outputs):
 			return
 		inputs = self.inputs['Topologies'].sv_get(deepcopy=False)
-		inputs = flatten(inputs)
+		inputs = Replication.flatten(inputs)
 		topology = processItem(inputs)
 		self.outputs['Topology'].sv_set([topology])
 		end = time.time()
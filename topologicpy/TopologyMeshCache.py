@@ -0,0 +1,133 @@
+import topologic
+import os
+import hashlib
+import tempfile
+import numpy as np
+from collections import OrderedDict
+from . import TopologyTriangulate, TopologyGeometry
+
+class MeshCache:
+	"""
+	Content-addressed cache of tessellated mesh arrays. Entries are keyed by a hash of the
+	BREP string of the topology and the triangulation tolerance. Recently used entries are
+	kept in memory (LRU) and every entry is also written to an .npz file in a cache
+	directory whose total size is capped, evicting the least recently used files first. The
+	directory is created on the first write.
+	"""
+	def __init__(self, maxItems=64, directory=None, maxBytes=256*1024*1024):
+		self.maxItems = maxItems
+		self.directory = directory
+		self.maxBytes = maxBytes
+		self.memory = OrderedDict()
+		self.hits = 0
+		self.diskHits = 0
+		self.misses = 0
+
+	def key(self, topology, tolerance):
+		h = hashlib.sha256()
+		h.update(topology.String().encode("utf-8"))
+		h.update(repr(float(tolerance)).encode("utf-8"))
+		return h.hexdigest()
+
+	def filePath(self, key):
+		return os.path.join(self.directory, key+".npz")
+
+	def remember(self, key, value):
+		self.memory[key] = value
+		self.memory.move_to_end(key)
+		while len(self.memory) > self.maxItems:
+			self.memory.popitem(last=False)
+
+	def get(self, key):
+		value = self.memory.get(key)
+		if value is not None:
+			self.memory.move_to_end(key)
+			self.hits += 1
+			return value
+		if self.directory:
+			path = self.filePath(key)
+			try:
+				with np.load(path) as data:
+					value = [data["vertices"], data["edges"], data["connectivity"], data["offsets"]]
+				os.utime(path)
+			except (OSError, KeyError, ValueError):
+				value = None
+			if value is not None:
+				self.remember(key, value)
+				self.diskHits += 1
+				return value
+		self.misses += 1
+		return None
+
+	def put(self, key, value):
+		self.remember(key, value)
+		if not self.directory:
+			return
+		vertices, edges, connectivity, offsets = value
+		path = self.filePath(key)
+		try:
+			os.makedirs(self.directory, exist_ok=True)
+			# Every writer gets its own temporary file, so concurrent writers of a key cannot mix their data
+			handle, tempPath = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+		except OSError:
+			return
+		try:
+			with os.fdopen(handle, "wb") as f:
+				np.savez(f, vertices=vertices, edges=edges, connectivity=connectivity, offsets=offsets)
+			os.replace(tempPath, path)
+		except OSError:
+			if os.path.exists(tempPath):
+				os.remove(tempPath)
+			return
+		self.evict()
+
+	def evict(self):
+		if not os.path.isdir(self.directory):
+			return
+		entries = []
+		total = 0
+		for name in os.listdir(self.directory):
+			if not name.endswith(".npz"):
+				continue
+			path = os.path.join(self.directory, name)
+			try:
+				st = os.stat(path)
+			except OSError:
+				continue
+			entries.append((st.st_mtime, st.st_size, path))
+			total += st.st_size
+		entries.sort()
+		for mtime, size, path in entries:
+			if total <= self.maxBytes:
+				break
+			try:
+				os.remove(path)
+			except OSError:
+				continue
+			total -= size
+
+	def clear(self):
+		self.memory.clear()
+		if self.directory and os.path.isdir(self.directory):
+			for name in os.listdir(self.directory):
+				if name.endswith(".npz"):
+					os.remove(os.path.join(self.directory, name))
+
+defaultCache = MeshCache(directory=os.environ.get("TOPOLOGIC_MESH_CACHE", os.path.join(tempfile.gettempdir(), "topologic_mesh_cache")))
+
+def processItem(topology, tolerance=0.0001, cache=None):
+	"""
+	Returns [vertices, edges, connectivity, offsets] arrays of the triangulated topology, skipping
+	the triangulation entirely when the same BREP and tolerance have been tessellated before.
+	"""
+	if topology == None:
+		return TopologyGeometry.processItem(None, as_arrays=True)
+	if cache == None:
+		cache = defaultCache
+	key = cache.key(topology, tolerance)
+	value = cache.get(key)
+	if value is None:
+		triangulated = TopologyTriangulate.processItem(topology, tolerance)
+		value = TopologyGeometry.processItem(triangulated, as_arrays=True)
+		cache.put(key, value)
+	return value
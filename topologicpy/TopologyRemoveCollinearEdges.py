@@ -4,16 +4,7 @@ from sverchok.node_tree import SverchCustomTreeNode
 from sverchok.data_structure import updateNode
 
 import topologic
-
-# From https://stackabuse.com/python-how-to-flatten-list-of-lists/
-def flatten(element):
-	returnList = []
-	if isinstance(element, list) == True:
-		for anItem in element:
-			returnList = returnList + flatten(anItem)
-	else:
-		returnList = [element]
-	return returnList
+from . import Replication
 
 def toDegrees(ang):
 	import math
@@ -141,7 +132,7 @@ class SvTopologyRemoveCollinearEdges(bpy.types.Node, SverchCustomTreeNode):
 		angTol = self.inputs['Angular Tolerance'].sv_get(deepcopy=False)[0][0]
 		tol = self.inputs['Tol'].sv_get(deepcopy=False, default=0.0001)[0][0]
 
-		topologyList = flatten(topologyList)
+		topologyList = Replication.flatten(topologyList)
 		outputs = []
 		for aTopology in topologyList:
 			outputs.append(processItem(aTopology, angTol, tol))
@@ -6,65 +6,42 @@ from sverchok.data_structure import updateNode
 import topologic
 import time
 
+# Sub-topology queries in order of decreasing dimension. The first type present decides the outcome,
+# so the census stops there instead of walking all seven types.
+census = ["CellComplexes", "Cells", "Shells", "Faces", "Wires", "Edges", "Vertices"]
+
+def subTopologies(item, name):
+	topologies = []
+	_ = getattr(item, name)(None, topologies)
+	return topologies
+
+def vertexCount(topology):
+	vertices = []
+	_ = topology.Vertices(None, vertices)
+	return len(vertices)
+
+def mergePlan(item):
+	"""
+	Returns [plan, topology] where plan is the name of the sub-topology query that yields the
+	canonical result (or None if a SelfMerge is needed) and topology is that result.
+	"""
+	for name in census:
+		topologies = subTopologies(item, name)
+		if len(topologies) == 0:
+			continue
+		if len(topologies) > 1:
+			return [None, None]
+		if name == "Vertices" or vertexCount(item) == vertexCount(topologies[0]):
+			return [name, topologies[0]]
+		return [None, None]
+	return [None, None]
+
 def processItem(item):
 	if item.Type() != 128:
 		item = topologic.Cluster.ByTopologies([item])
-	resultingTopologies = []
-	topCC = []
-	_ = item.CellComplexes(None, topCC)
-	topCells = []
-	_ = item.Cells(None, topCells)
-	topShells = []
-	_ = item.Shells(None, topShells)
-	topFaces = []
-	_ = item.Faces(None, topFaces)
-	topWires = []
-	_ = item.Wires(None, topWires)
-	topEdges = []
-	_ = item.Edges(None, topEdges)
-	topVertices = []
-	_ = item.Vertices(None, topVertices)
-	if len(topCC) == 1:
-		cc = topCC[0]
-		ccVertices = []
-		_ = cc.Vertices(None, ccVertices)
-		if len(topVertices) == len(ccVertices):
-			resultingTopologies.append(cc)
-	if len(topCC) == 0 and len(topCells) == 1:
-		cell = topCells[0]
-		ccVertices = []
-		_ = cell.Vertices(None, ccVertices)
-		if len(topVertices) == len(ccVertices):
-			resultingTopologies.append(cell)
-	if len(topCC) == 0 and len(topCells) == 0 and len(topShells) == 1:
-		shell = topShells[0]
-		ccVertices = []
-		_ = shell.Vertices(None, ccVertices)
-		if len(topVertices) == len(ccVertices):
-			resultingTopologies.append(shell)
-	if len(topCC) == 0 and len(topCells) == 0 and len(topShells) == 0 and len(topFaces) == 1:
-		face = topFaces[0]
-		ccVertices = []
-		_ = face.Vertices(None, ccVertices)
-		if len(topVertices) == len(ccVertices):
-			resultingTopologies.append(face)
-	if len(topCC) == 0 and len(topCells) == 0 and len(topShells) == 0 and len(topFaces) == 0 and len(topWires) == 1:
-		wire = topWires[0]
-		ccVertices = []
-		_ = wire.Vertices(None, ccVertices)
-		if len(topVertices) == len(ccVertices):
-			resultingTopologies.append(wire)
-	if len(topCC) == 0 and len(topCells) == 0 and len(topShells) == 0 and len(topFaces) == 0 and len(topWires) == 0 and len(topEdges) == 1:
-		edge = topEdges[0]
-		ccVertices = []
-		_ = edge.Vertices(None, ccVertices)
-		if len(topVertices) == len(ccVertices):
-			resultingTopologies.append(edge)
-	if len(topCC) == 0 and len(topCells) == 0 and len(topShells) == 0 and len(topFaces) == 0 and len(topWires) == 0 and len(topEdges) == 0 and len(topVertices) == 1:
-		vertex = topVertices[0]
-		resultingTopologies.append(vertex)
-	if len(resultingTopologies) == 1:
-		return resultingTopologies[0]
+	plan, topology = mergePlan(item)
+	if topology != None:
+		return topology
 	return item.SelfMerge()
 
 class SvTopologySelfMerge(bpy.types.Node, SverchCustomTreeNode):
@@ -137,17 +137,7 @@ class SvTopologySpin(bpy.types.Node, SverchCustomTreeNode):
 		sidesList = Replication.flatten(sidesList)
 		toleranceList = Replication.flatten(toleranceList)
 		inputs = [wireList, originList, dirXList, dirYList, dirZList, degreeList, sidesList, toleranceList]
-		if ((self.Replication) == "Trim"):
-			inputs = Replication.trim(inputs)
-			inputs = Replication.transposeList(inputs)
-		elif ((self.Replication) == "Iterate"):
-			inputs = Replication.iterate(inputs)
-			inputs = Replication.transposeList(inputs)
-		elif ((self.Replication) == "Repeat"):
-			inputs = Replication.repeat(inputs)
-			inputs = Replication.transposeList(inputs)
-		elif ((self.Replication) == "Interlace"):
-			inputs = list(Replication.interlace(inputs))
+		inputs = Replication.replicateInputs(inputs, self.Replication)
 		outputs = []
 		for anInput in inputs:
 			outputs.append(processItem(anInput))
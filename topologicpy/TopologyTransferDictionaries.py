@@ -6,16 +6,7 @@ from sverchok.data_structure import updateNode
 import topologic
 from topologic import Vertex, Edge, Wire, Face, Shell, Cell, CellComplex, Cluster, Topology, Dictionary
 import time
-
-# From https://stackabuse.com/python-how-to-flatten-list-of-lists/
-def flatten(element):
-	returnList = []
-	if isinstance(element, list) == True:
-		for anItem in element:
-			returnList = returnList + flatten(anItem)
-	else:
-		returnList = [element]
-	return returnList
+from . import DictionaryTransfer
 
 def relevantSelector(topology):
 	returnVertex = None
@@ -122,37 +113,8 @@ def processKeysValues(keys, values):
 	return myDict
 
 def transferDictionaries(sources, sinks, tol):
-	for sink in sinks:
-		sinkKeys = []
-		sinkValues = []
-		iv = relevantSelector(sink)
-		j = 1
-		for source in sources:
-			if topologyContains(source, iv, tol):
-				d = source.GetDictionary()
-				if d == None:
-					continue
-				stlKeys = d.Keys()
-				if len(stlKeys) > 0:
-					sourceKeys = d.Keys()
-					for aSourceKey in sourceKeys:
-						if aSourceKey not in sinkKeys:
-							sinkKeys.append(aSourceKey)
-							sinkValues.append("")
-					for i in range(len(sourceKeys)):
-						index = sinkKeys.index(sourceKeys[i])
-						sourceValue = valueAtKey(d, sourceKeys[i])
-						if sourceValue != None:
-							if sinkValues[index] != "":
-								if isinstance(sinkValues[index], list):
-									sinkValues[index].append(sourceValue)
-								else:
-									sinkValues[index] = [sinkValues[index], sourceValue]
-							else:
-								sinkValues[index] = sourceValue
-		if len(sinkKeys) > 0 and len(sinkValues) > 0:
-			newDict = processKeysValues(sinkKeys, sinkValues)
-			_ = sink.SetDictionary(newDict)
+	DictionaryTransfer.transferSourcesToSinks(sources, sinks, tol, relevantSelector, topologyContains, valueAtKey, processKeysValues)
+
 
 def highestDimension(topology):
 	if (topology.Type() == topologic.Cluster.Type()):
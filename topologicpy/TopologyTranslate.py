@@ -9,91 +9,6 @@ from mathutils import Vector
 
 from . import Replication
 
-# From https://stackabuse.com/python-how-to-flatten-list-of-lists/
-def flatten(element):
-	returnList = []
-	if isinstance(element, list) == True:
-		for anItem in element:
-			returnList = returnList + flatten(anItem)
-	else:
-		returnList = [element]
-	return returnList
-
-def repeat(list):
-	maxLength = len(list[0])
-	for aSubList in list:
-		newLength = len(aSubList)
-		if newLength > maxLength:
-			maxLength = newLength
-	for anItem in list:
-		if (len(anItem) > 0):
-			itemToAppend = anItem[-1]
-		else:
-			itemToAppend = None
-		for i in range(len(anItem), maxLength):
-			anItem.append(itemToAppend)
-	return list
-
-# From https://stackoverflow.com/questions/34432056/repeat-elements-of-list-between-each-other-until-we-reach-a-certain-length
-def onestep(cur,y,base):
-    # one step of the iteration
-    if cur is not None:
-        y.append(cur)
-        base.append(cur)
-    else:
-        y.append(base[0])  # append is simplest, for now
-        base = base[1:]+[base[0]]  # rotate
-    return base
-
-def iterate(list):
-	maxLength = len(list[0])
-	returnList = []
-	for aSubList in list:
-		newLength = len(aSubList)
-		if newLength > maxLength:
-			maxLength = newLength
-	for anItem in list:
-		for i in range(len(anItem), maxLength):
-			anItem.append(None)
-		y=[]
-		base=[]
-		for cur in anItem:
-			base = onestep(cur,y,base)
-			# print(base,y)
-		returnList.append(y)
-	return returnList
-
-def trim(list):
-	minLength = len(list[0])
-	returnList = []
-	for aSubList in list:
-		newLength = len(aSubList)
-		if newLength < minLength:
-			minLength = newLength
-	for anItem in list:
-		anItem = anItem[:minLength]
-		returnList.append(anItem)
-	return returnList
-
-# Adapted from https://stackoverflow.com/questions/533905/get-the-cartesian-product-of-a-series-of-lists
-def interlace(ar_list):
-    if not ar_list:
-        yield []
-    else:
-        for a in ar_list[0]:
-            for prod in interlace(ar_list[1:]):
-                yield [a,]+prod
-
-def transposeList(l):
-	length = len(l[0])
-	returnList = []
-	for i in range(length):
-		tempRow = []
-		for j in range(len(l)):
-			tempRow.append(l[j][i])
-		returnList.append(tempRow)
-	return returnList
-
 def update_sockets(self, context):
 	# hide all input sockets
 	self.inputs['X'].hide_safe = True
@@ -167,46 +82,26 @@ class SvTopologyTranslate(bpy.types.Node, SverchCustomTreeNode):
 			self.outputs['Topology'].sv_set([])
 			return
 		topologyList = self.inputs['Topology'].sv_get(deepcopy=True)
-		topologyList = flatten(topologyList)
+		topologyList = Replication.flatten(topologyList)
 		if self.inputMode == "XYZ":
 			xList = self.inputs['X'].sv_get(deepcopy=True)
 			yList = self.inputs['Y'].sv_get(deepcopy=True)
 			zList = self.inputs['Z'].sv_get(deepcopy=True)
-			xList = flatten(xList)
-			yList = flatten(yList)
-			zList = flatten(zList)
+			xList = Replication.flatten(xList)
+			yList = Replication.flatten(yList)
+			zList = Replication.flatten(zList)
 			inputs = [topologyList, xList, yList, zList]
-			if ((self.Replication) == "Trim"):
-				inputs = trim(inputs)
-				inputs = transposeList(inputs)
-			elif (((self.Replication) == "Iterate")  or ((self.Replication) == "Default")):
-				inputs = iterate(inputs)
-				inputs = transposeList(inputs)
-			elif ((self.Replication) == "Repeat"):
-				inputs = repeat(inputs)
-				inputs = transposeList(inputs)
-			elif ((self.Replication) == "Interlace"):
-				inputs = list(interlace(inputs))
+			inputs = Replication.replicateInputs(inputs, self.Replication)
 			outputs = []
 			for anInput in inputs:
 				outputs.append(processItem(anInput))
 		else:
 			directionList = self.inputs['Direction'].sv_get(deepcopy=True)
-			#directionList = flatten(directionList)
+			#directionList = Replication.flatten(directionList)
 			distanceList = self.inputs['Distance'].sv_get(deepcopy=True)
-			distanceList = flatten(distanceList)
+			distanceList = Replication.flatten(distanceList)
 			inputs = [topologyList, directionList, distanceList]
-			if ((self.Replication) == "Trim"):
-				inputs = trim(inputs)
-				inputs = transposeList(inputs)
-			elif (((self.Replication) == "Iterate")  or ((self.Replication) == "Default")):
-				inputs = iterate(inputs)
-				inputs = transposeList(inputs)
-			elif ((self.Replication) == "Repeat"):
-				inputs = repeat(inputs)
-				inputs = transposeList(inputs)
-			elif ((self.Replication) == "Interlace"):
-				inputs = list(interlace(inputs))
+			inputs = Replication.replicateInputs(inputs, self.Replication)
 			outputs = []
 			for anInput in inputs:
 				outputs.append(processDirectionDistance(anInput))
@@ -4,15 +4,7 @@ from sverchok.node_tree import SverchCustomTreeNode
 from sverchok.data_structure import updateNode
 
 import topologic
-
-def flatten(element):
-	returnList = []
-	if isinstance(element, list) == True:
-		for anItem in element:
-			returnList = returnList + flatten(anItem)
-	else:
-		returnList = [element]
-	return returnList
+from . import Replication
 
 def processItem(item):
 	return [item.Type(), item.GetTypeAsString()]
@@ -36,7 +28,7 @@ class SvTopologyType(bpy.types.Node, SverchCustomTreeNode):
 			self.outputs['Cells'].sv_set([])
 			return
 		topologyList = self.inputs['Topology'].sv_get(deepcopy=False)
-		topologyList = flatten(topologyList)
+		topologyList = Replication.flatten(topologyList)
 		ids = []
 		names = []
 		for anInput in topologyList:
@@ -1,4 +1,5 @@
 import topologic
+import numpy as np
 
 # Adapted From https://johnlekberg.com/blog/2020-04-17-kd-tree.html
 import collections
@@ -110,6 +111,158 @@ def find_nearest_neighbor(*, tree, vertex):
 	search(tree=tree, depth=0)
 	return best.vertex
 
+def vertexCoordinates(vertices):
+	return np.array([[v.X(), v.Y(), v.Z()] for v in vertices], dtype=np.float64).reshape(-1, 3)
+
+class KDTree:
+	"""
+	A bucketed k-d tree over an (N,3) coordinate array, built once with median splits along the
+	widest axis and stored as flat node arrays. Queries are answered in batch: all queries walk
+	the tree together as (query, node) pairs, pruned level by level against each query's current
+	bound, and the surviving leaf points are evaluated with array operations.
+	"""
+	def __init__(self, points, leafSize=16):
+		self.points = np.ascontiguousarray(points, dtype=np.float64).reshape(-1, 3)
+		assert (len(self.points) > 0), "Vertex.NearestVertex: Could not find any vertices to build the k-d tree"
+		order = np.arange(len(self.points))
+		start, end, left, right, nodeMin, nodeMax = [], [], [], [], [], []
+		stack = [(0, len(order), -1, False)]
+		while stack:
+			b, e, parent, isRight = stack.pop()
+			node = len(start)
+			if parent >= 0:
+				if isRight:
+					right[parent] = node
+				else:
+					left[parent] = node
+			pts = self.points[order[b:e]]
+			lo = pts.min(axis=0)
+			hi = pts.max(axis=0)
+			start.append(b)
+			end.append(e)
+			left.append(-1)
+			right.append(-1)
+			nodeMin.append(lo)
+			nodeMax.append(hi)
+			if e - b <= leafSize:
+				continue
+			axis = int(np.argmax(hi - lo))
+			middle = (e - b) // 2
+			order[b:e] = order[b:e][np.argpartition(pts[:, axis], middle)]
+			stack.append((b + middle, e, node, True))
+			stack.append((b, b + middle, node, False))
+		self.order = order
+		self.start = np.array(start, dtype=np.int64)
+		self.end = np.array(end, dtype=np.int64)
+		self.left = np.array(left, dtype=np.int64)
+		self.right = np.array(right, dtype=np.int64)
+		self.nodeMin = np.array(nodeMin)
+		self.nodeMax = np.array(nodeMax)
+
+	def lowerBounds(self, queries, nodes):
+		below = np.maximum(self.nodeMin[nodes] - queries, 0)
+		above = np.maximum(queries - self.nodeMax[nodes], 0)
+		return ((below + above)**2).sum(axis=1)
+
+	def expandPairs(self, queryIndices, nodes):
+		counts = self.end[nodes] - self.start[nodes]
+		total = int(counts.sum())
+		q = np.repeat(queryIndices, counts)
+		offsets = np.repeat(self.start[nodes] - np.cumsum(counts) + counts, counts)
+		return q, self.order[offsets + np.arange(total)]
+
+	def candidatePairs(self, queries, bounds):
+		"""
+		Walks all queries down the tree together and returns the (query, point) pairs of every
+		leaf whose box lies within the squared bound of its query.
+		"""
+		if len(queries) == 0:
+			return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+		q = np.arange(len(queries))
+		nodes = np.zeros(len(queries), dtype=np.int64)
+		leafQ = []
+		leafNodes = []
+		while len(q) > 0:
+			keep = self.lowerBounds(queries[q], nodes) <= bounds[q]
+			q, nodes = q[keep], nodes[keep]
+			isLeaf = self.left[nodes] < 0
+			leafQ.append(q[isLeaf])
+			leafNodes.append(nodes[isLeaf])
+			q, nodes = q[~isLeaf], nodes[~isLeaf]
+			q = np.concatenate([q, q])
+			nodes = np.concatenate([self.left[nodes], self.right[nodes]])
+		return self.expandPairs(np.concatenate(leafQ), np.concatenate(leafNodes))
+
+	def query(self, queries, k=1):
+		"""
+		Returns (distances, indices), each of shape (Q,k), of the k nearest points to each query.
+		"""
+		queries = np.asarray(queries, dtype=np.float64).reshape(-1, 3)
+		n = len(queries)
+		k = min(k, len(self.points))
+		# Upper bound: descend greedily to the smallest node still holding at least k points
+		nodes = np.zeros(n, dtype=np.int64)
+		active = np.nonzero(self.left[nodes] >= 0)[0]
+		while len(active) > 0:
+			l = self.left[nodes[active]]
+			r = self.right[nodes[active]]
+			child = np.where(self.lowerBounds(queries[active], l) <= self.lowerBounds(queries[active], r), l, r)
+			move = (self.end[child] - self.start[child]) >= k
+			nodes[active[move]] = child[move]
+			active = active[move]
+			active = active[self.left[nodes[active]] >= 0]
+		q, p = self.expandPairs(np.arange(n), nodes)
+		d = ((queries[q] - self.points[p])**2).sum(axis=1)
+		upper = self.kSmallest(q, p, d, n, k)[0][:, -1]
+		# Exact pass over every leaf that can still hold a point within the bound
+		q, p = self.candidatePairs(queries, upper)
+		d = ((queries[q] - self.points[p])**2).sum(axis=1)
+		distances, indices = self.kSmallest(q, p, d, n, k)
+		return np.sqrt(distances), indices
+
+	def kSmallest(self, q, p, d, n, k):
+		order = np.lexsort((p, d, q))
+		q, p, d = q[order], p[order], d[order]
+		groupStart = np.searchsorted(q, np.arange(n))
+		rank = np.arange(len(q)) - groupStart[q]
+		keep = rank < k
+		distances = np.empty((n, k))
+		indices = np.empty((n, k), dtype=np.int64)
+		distances[q[keep], rank[keep]] = d[keep]
+		indices[q[keep], rank[keep]] = p[keep]
+		return distances, indices
+
+	def queryRadius(self, queries, radius):
+		"""
+		Returns, for each query, the sorted array of indices of the points within radius.
+		"""
+		queries = np.asarray(queries, dtype=np.float64).reshape(-1, 3)
+		if len(queries) == 0:
+			return []
+		r2 = np.full(len(queries), radius*radius)
+		q, p = self.candidatePairs(queries, r2)
+		keep = ((queries[q] - self.points[p])**2).sum(axis=1) <= r2[q]
+		q, p = q[keep], p[keep]
+		order = np.lexsort((p, q))
+		q, p = q[order], p[order]
+		return np.split(p, np.searchsorted(q, np.arange(1, len(queries))))
+
+def kdtreeByTopology(topology):
+	assert isinstance(topology, topologic.Topology), "Vertex.NearestVertex: The input is not a Topology."
+	vertices = []
+	_ = topology.Vertices(None, vertices)
+	return [KDTree(vertexCoordinates(vertices)), vertices]
+
+def processItems(vertices, topology, k=1):
+	"""
+	Returns the nearest vertex of the topology for each input vertex (or the k nearest as a list when k > 1) using a single batched k-d tree query.
+	"""
+	tree, topologyVertices = kdtreeByTopology(topology)
+	distances, indices = tree.query(vertexCoordinates(vertices), k)
+	if k == 1:
+		return [topologyVertices[i] for i in indices[:, 0]]
+	return [[topologyVertices[i] for i in row] for row in indices]
+
 def processItem(input):
 	vertex, topology, useKDTree = input
 	if useKDTree:
@@ -22,7 +22,12 @@ from sverchok.data_structure import updateNode
 import topologic
 from topologic import Vertex, Edge, Wire, Face, Shell, Cell, CellComplex, Cluster, Topology
 import math
-from . import Replication
+import numpy as np
+from . import Replication, DictionaryTransfer
+
+# The isovist is computed in plan: the boundary and obstacle edges are projected onto the XY plane,
+# rays are cast from the view point's (x, y) and the resulting face is placed at the view point's Z.
+# The external boundary must therefore be horizontal (parallel to the XY plane).
 
 def wireByVertices(vList):
 	edges = []
@@ -31,144 +36,194 @@ def wireByVertices(vList):
 	edges.append(topologic.Edge.ByStartVertexEndVertex(vList[-1], vList[0]))
 	return topologic.Wire.ByEdges(edges)
 
-def nearestVertex(v, vList):
-	distances = []
-	indexList = list(range(len(vList)))
-	for vertex in vList:
-		distances.append(topologic.VertexUtility.Distance(v, vertex))
-	z = [x for _, x in sorted(zip(distances, indexList))]
-	return vList[z[0]]
-
-def toDegrees(ang):
-	import math
-	return ang * 180 / math.pi
-
-def angleBetweenEdges(e1, e2, tolerance):
-	a = e1.EndVertex().X() - e1.StartVertex().X()
-	b = e1.EndVertex().Y() - e1.StartVertex().Y()
-	c = e1.EndVertex().Z() - e1.StartVertex().Z()
-	d = topologic.VertexUtility.Distance(e1.EndVertex(), e2.StartVertex())
-	if d <= tolerance:
-		d = e2.StartVertex().X() - e2.EndVertex().X()
-		e = e2.StartVertex().Y() - e2.EndVertex().Y()
-		f = e2.StartVertex().Z() - e2.EndVertex().Z()
-	else:
-		d = e2.EndVertex().X() - e2.StartVertex().X()
-		e = e2.EndVertex().Y() - e2.StartVertex().Y()
-		f = e2.EndVertex().Z() - e2.StartVertex().Z()
-	dotProduct = a*d + b*e + c*f
-	modOfVector1 = math.sqrt( a*a + b*b + c*c)*math.sqrt(d*d + e*e + f*f) 
-	angle = dotProduct/modOfVector1
-	angleInDegrees = math.degrees(math.acos(angle))
-	return angleInDegrees
-
-def normalizeEdge(e):
-	length = topologic.EdgeUtility.Length(e)
-	ev = e.EndVertex()
-	scaleFactor = 1/length
-	newEv = topologic.TopologyUtility.Scale(ev, e.StartVertex(), scaleFactor, scaleFactor, scaleFactor)
-	newEdge = topologic.Edge.ByStartVertexEndVertex(e.StartVertex(), newEv)
-	return newEdge
-
-def compassAngle(e1, e2):
-	ne1 = normalizeEdge(e1)
-	ne2 = normalizeEdge(e2)
-	deltaX = ne2.EndVertex().X() - ne1.EndVertex().X()
-	deltaY = ne2.EndVertex().Y() - ne1.EndVertex().Y()
-	degrees_temp = math.atan2(deltaX, deltaY)/math.pi*360
-	#print(degrees_temp)
-	if degrees_temp < 0:
-		degrees_final = 360 + degrees_temp
+def edgePoints(edge, tolerance, curveSegments):
+	"""
+	Returns the (x, y) points of the input edge: its end points if it is straight, otherwise
+	curveSegments+1 points along the curve.
+	"""
+	if DictionaryTransfer.isStraight(edge, tolerance):
+		vertices = [edge.StartVertex(), edge.EndVertex()]
 	else:
-		degrees_final = degrees_temp
-	print(degrees_final)
-	return degrees_final
+		vertices = [topologic.EdgeUtility.PointAtParameter(edge, float(i)/curveSegments) for i in range(curveSegments+1)]
+	return [[v.X(), v.Y()] for v in vertices]
+
+def boundarySegments(topology, tolerance=0.0001, curveSegments=32):
+	"""
+	Returns the edges of the input topology, projected onto the XY plane, as an (S, 4) array of
+	[x1, y1, x2, y2] rows. Curved edges are split into curveSegments straight segments.
+	"""
+	if topology == None:
+		return np.zeros((0, 4))
+	edges = []
+	_ = topology.Edges(None, edges)
+	segments = []
+	for e in edges:
+		points = edgePoints(e, tolerance, curveSegments)
+		for i in range(len(points)-1):
+			segments.append(points[i]+points[i+1])
+	return np.array(segments, dtype=np.float64).reshape(-1, 4)
 
-def vertexPartofFace(vertex, face, tolerance):
+def checkHorizontal(topology, tolerance=0.0001):
 	vertices = []
-	_ = face.Vertices(None, vertices)
-	for v in vertices:
-		if topologic.VertexUtility.Distance(vertex, v) < tolerance:
-			return True
-	return False
-
-def processItem(item):
-	viewPoint, externalBoundary, obstaclesCluster = item
-	
-	internalBoundaries = []
-	_ = obstaclesCluster.Wires(None, internalBoundaries)
-	internalVertices = []
-	_ = obstaclesCluster.Vertices(None, internalVertices)
-	# 1. Create a Face with external and internal boundaries
-	face = topologic.Face.ByExternalInternalBoundaries(externalBoundary, internalBoundaries, False)
-	# 2. Draw Rays from viewpoint through each Vertex of the obstacles extending to the External Boundary
-	#	2.1 Get the Edges and Vertices of the External Boundary
-	exBoundaryEdges = []
-	_ = externalBoundary.Edges(None, exBoundaryEdges)
-	exBoundaryVertices = []
-	_ = externalBoundary.Vertices(None, exBoundaryVertices)
-	testTopologies = exBoundaryEdges+exBoundaryVertices
-	#	1.2 Find the maximum distance from the viewpoint to the edges and vertices of the external boundary
-	distances = []
-	for x in testTopologies:
-		distances.append(topologic.VertexUtility.Distance(viewPoint, x))
-	maxDistance = max(distances)*1.5
-	#	1.3 Shoot rays and intersect with the external boundary
-	rays = []
-	for aVertex in (internalVertices+exBoundaryVertices):
-		d = topologic.VertexUtility.Distance(viewPoint, aVertex)
-		if d > 0:
-			scaleFactor = maxDistance/d
-			newV = topologic.TopologyUtility.Scale(aVertex, viewPoint, scaleFactor, scaleFactor, scaleFactor)
-			ray = topologic.Edge.ByStartVertexEndVertex(viewPoint, newV)
-			topologyC = ray.Intersect(externalBoundary, False)
-			vertices = []
-			_ = topologyC.Vertices(None, vertices)
-			if topologyC:
-				rays.append(topologic.Edge.ByStartVertexEndVertex(viewPoint, vertices[0]))
-			rays.append(topologic.Edge.ByStartVertexEndVertex(viewPoint, aVertex))
-	rayEdges = []
-	for r in rays:
-		a = r.Difference(obstaclesCluster, False)
-		edges = []
-		_ = a.Edges(None, edges)
-		w = None
-		try:
-			w = topologic.Wire.ByEdges(edges)
-			rayEdges = rayEdges + edges
-		except:
-			c = topologic.Cluster.ByTopologies(edges)
-			c = c.SelfMerge()
-			wires = []
-			_ = c.Wires(None, wires)
-			if len(wires) > 0:
-				edges = []
-				_ = wires[0].Edges(None, edges)
-				rayEdges = rayEdges + edges
-			else:
-				for e in edges:
-					vertices = []
-					e.Vertices(None, vertices)
-					for v in vertices:
-						if topologic.VertexUtility.Distance(viewPoint, v) < 0.0001:
-							rayEdges.append(e)
-	rayCluster = topologic.Cluster.ByTopologies(rayEdges)
-	#return rayCluster
-	shell = face.Slice(rayCluster, False)
-	faces = []
-	_ = shell.Faces(None, faces)
-	finalFaces = []
-	for aFace in faces:
-		if vertexPartofFace(viewPoint, aFace, 0.001):
-			finalFaces.append(aFace)
-	return finalFaces
+	_ = topology.Vertices(None, vertices)
+	z = [v.Z() for v in vertices]
+	if len(z) > 0 and max(z) - min(z) > tolerance:
+		raise Exception("Wire.Isovist - Error: The input External Boundary is not parallel to the XY plane")
+
+def castRays(origins, angles, segments, maxDistances):
+	"""
+	Returns the distance along each ray from its origin to the nearest segment (its maxDistance if
+	none is hit). origins is an (R, 2) array (or a single point shared by every ray) and
+	maxDistances an (R,) array or a scalar.
+	"""
+	d = np.stack([np.cos(angles), np.sin(angles)], axis=1)
+	origins = np.broadcast_to(np.asarray(origins, dtype=np.float64), d.shape)
+	maxDistances = np.broadcast_to(np.asarray(maxDistances, dtype=np.float64), (len(angles),))
+	a = segments[:, :2]
+	e = segments[:, 2:] - a
+	distances = np.array(maxDistances)
+	for start in range(0, len(angles), 1024):
+		dc = d[start:start+1024]
+		ap = a[None, :, :] - origins[start:start+1024, None, :]
+		denom = dc[:, 0:1]*e[None, :, 1] - dc[:, 1:2]*e[None, :, 0]
+		with np.errstate(divide="ignore", invalid="ignore"):
+			t = (ap[:, :, 0]*e[None, :, 1] - ap[:, :, 1]*e[None, :, 0]) / denom
+			u = (ap[:, :, 0]*dc[:, 1:2] - ap[:, :, 1]*dc[:, 0:1]) / denom
+		valid = (np.abs(denom) > 1e-12) & (t > 1e-9) & (u >= -1e-9) & (u <= 1+1e-9)
+		t = np.where(valid, t, np.inf).min(axis=1)
+		distances[start:start+1024] = np.minimum(t, maxDistances[start:start+1024])
+	return distances
+
+def alternateRuns(flags):
+	"""
+	Returns the flags of every other vertex within each cyclic run of flagged vertices, so no two
+	neighbours are selected (a polygon whose vertices are all flagged keeps every other one).
+	"""
+	n = len(flags)
+	if not flags.any():
+		return flags
+	if flags.all():
+		selected = (np.arange(n) % 2) == 0
+		if n % 2 == 1:
+			selected[-1] = False
+		return selected
+	# Rotate a cleared vertex to the front so no run wraps around the end of the array
+	shift = int(np.flatnonzero(~flags)[0])
+	rolled = np.roll(flags, -shift)
+	starts = rolled & ~np.roll(rolled, 1)
+	positions = np.arange(n) - np.maximum.accumulate(np.where(starts, np.arange(n), 0))
+	return np.roll(rolled & (positions % 2 == 0), shift)
+
+def simplifyPolygon(points, tolerance):
+	# Drop repeated points and points lying on the line through their neighbours
+	keep = np.ones(len(points), dtype=bool)
+	changed = True
+	while changed and keep.sum() > 3:
+		changed = False
+		idx = np.flatnonzero(keep)
+		p = points[idx]
+		prev = np.roll(p, 1, axis=0)
+		nxt = np.roll(p, -1, axis=0)
+		cross = np.abs((p[:, 0]-prev[:, 0])*(nxt[:, 1]-prev[:, 1]) - (p[:, 1]-prev[:, 1])*(nxt[:, 0]-prev[:, 0]))
+		span = np.hypot(nxt[:, 0]-prev[:, 0], nxt[:, 1]-prev[:, 1])
+		redundant = (np.hypot(p[:, 0]-prev[:, 0], p[:, 1]-prev[:, 1]) <= tolerance) | (cross <= tolerance*np.maximum(span, tolerance))
+		# Never remove two neighbours in one pass, so each survivor is re-tested against its new neighbours
+		redundant = alternateRuns(redundant)
+		removable = np.flatnonzero(redundant)[:max(len(idx)-3, 0)]
+		if len(removable) > 0:
+			keep[idx[removable]] = False
+			changed = True
+	return points[keep]
+
+def rayAngles(origin, segments, epsilon):
+	# The angles of the segment end points seen from origin, each with a ray just either side of it
+	ends = np.concatenate([segments[:, :2], segments[:, 2:]])
+	offsets = ends - origin
+	maxDistance = np.hypot(offsets[:, 0], offsets[:, 1]).max()*1.5+1.0
+	angles = np.unique(np.round(np.arctan2(offsets[:, 1], offsets[:, 0]), 12))
+	return [np.sort(np.concatenate([angles-epsilon, angles, angles+epsilon])), maxDistance]
+
+def isovists(viewPoints, segments, epsilon=1e-6, tolerance=0.0001):
+	"""
+	Returns the (N, 2) visibility polygon, ordered counter-clockwise, of each (x, y) view point among
+	the segments. The rays of all the view points are cast together in one batch.
+	"""
+	viewPoints = np.asarray(viewPoints, dtype=np.float64).reshape(-1, 2)
+	if len(viewPoints) == 0:
+		return []
+	angleLists = []
+	origins = []
+	maxDistances = []
+	for origin in viewPoints:
+		angles, maxDistance = rayAngles(origin, segments, epsilon)
+		angleLists.append(angles)
+		origins.append(np.repeat(origin[None, :], len(angles), axis=0))
+		maxDistances.append(np.full(len(angles), maxDistance))
+	angles = np.concatenate(angleLists)
+	origins = np.concatenate(origins)
+	distances = castRays(origins, angles, segments, np.concatenate(maxDistances))
+	points = origins + distances[:, None]*np.stack([np.cos(angles), np.sin(angles)], axis=1)
+	splits = np.cumsum([len(a) for a in angleLists])[:-1]
+	return [simplifyPolygon(polygon, tolerance) for polygon in np.split(points, splits)]
+
+def visibilityPolygon(origin, segments, epsilon=1e-6, tolerance=0.0001):
+	"""
+	Returns the (N, 2) visibility polygon of origin among the segments by casting rays at every
+	segment end point and just either side of it, ordered counter-clockwise.
+	"""
+	return isovists([origin], segments, epsilon, tolerance)[0]
+
+def polygonMetrics(points):
+	x, y = points[:, 0], points[:, 1]
+	area = 0.5*abs(np.dot(x, np.roll(y, -1)) - np.dot(y, np.roll(x, -1)))
+	perimeter = np.hypot(np.roll(x, -1)-x, np.roll(y, -1)-y).sum()
+	compactness = 4*math.pi*area/(perimeter*perimeter) if perimeter > 0 else 0
+	return [float(area), float(perimeter), float(compactness)]
+
+def faceByPolygon(points, z):
+	vertices = [topologic.Vertex.ByCoordinates(float(p[0]), float(p[1]), z) for p in points]
+	return topologic.Face.ByExternalBoundary(wireByVertices(vertices))
+
+def itemSegments(externalBoundary, obstaclesCluster, segmentsCache):
+	# Boundary and obstacle segments are extracted once per (external boundary, obstacles) pair
+	key = (id(externalBoundary), id(obstaclesCluster))
+	segments = segmentsCache.get(key)
+	if segments is None:
+		checkHorizontal(externalBoundary)
+		segments = np.concatenate([boundarySegments(externalBoundary), boundarySegments(obstaclesCluster)])
+		segmentsCache[key] = segments
+	return [key, segments]
+
+def processItems(items, segmentsCache=None):
+	"""
+	Returns [isovist face, [area, perimeter, compactness]] for each [view point, external boundary,
+	obstacles cluster] item. The isovists are computed in the XY plane and placed at the height of
+	their view points; the external boundary must be horizontal. The rays of all the view points
+	that share an (external boundary, obstacles) pair are cast in one batch, and a segmentsCache
+	dictionary can be shared across calls to extract the segments only once.
+	"""
+	if segmentsCache == None:
+		segmentsCache = {}
+	groups = {}
+	for i, (viewPoint, externalBoundary, obstaclesCluster) in enumerate(items):
+		key, segments = itemSegments(externalBoundary, obstaclesCluster, segmentsCache)
+		groups.setdefault(key, []).append(i)
+	results = [None]*len(items)
+	for key, indices in groups.items():
+		viewPoints = [[items[i][0].X(), items[i][0].Y()] for i in indices]
+		for i, polygon in zip(indices, isovists(viewPoints, segmentsCache[key])):
+			results[i] = [faceByPolygon(polygon, items[i][0].Z()), polygonMetrics(polygon)]
+	return results
+
+def processItem(item, segmentsCache=None):
+	return processItems([item], segmentsCache)[0]
 
 replication = [("Default", "Default", "", 1),("Trim", "Trim", "", 2),("Iterate", "Iterate", "", 3),("Repeat", "Repeat", "", 4),("Interlace", "Interlace", "", 5)]
 
 class SvWireIsovist(bpy.types.Node, SverchCustomTreeNode):
 	"""
 	Triggers: Topologic
-	Tooltip: Creates an Isovist (Face) from the input origin    
+	Tooltip: Creates an Isovist (Face) in the XY plane from the input origin    
 	"""
 	bl_idname = 'SvWireIsovist'
 	bl_label = 'Wire.Isovist'
@@ -181,6 +236,9 @@ class SvWireIsovist(bpy.types.Node, SverchCustomTreeNode):
 		self.inputs.new('SvStringsSocket', 'External Boundary')
 		self.inputs.new('SvStringsSocket', 'Obstacles Cluster')
 		self.outputs.new('SvStringsSocket', 'Isovist')
+		self.outputs.new('SvStringsSocket', 'Area')
+		self.outputs.new('SvStringsSocket', 'Perimeter')
+		self.outputs.new('SvStringsSocket', 'Compactness')
 		self.width = 175
 		for socket in self.inputs:
 			if socket.prop_name != '':
@@ -208,22 +266,23 @@ class SvWireIsovist(bpy.types.Node, SverchCustomTreeNode):
 			inputs_nested.append(inp)
 			inputs_flat.append(Replication.flatten(inp))
 		inputs_replicated = Replication.replicateInputs(inputs_flat, self.Replication)
-		outputs = []
-		for anInput in inputs_replicated:
-			outputs.append(processItem(anInput))
+		results = processItems(inputs_replicated)
 		inputs_flat = []
 		for anInput in self.inputs:
 			inp = anInput.sv_get(deepcopy=True)
 			inputs_flat.append(Replication.flatten(inp))
-		if self.Replication == "Interlace":
-			outputs = Replication.re_interlace(outputs, inputs_flat)
-		else:
-			match_list = Replication.best_match(inputs_nested, inputs_flat, self.Replication)
-			outputs = Replication.unflatten(outputs, match_list)
-		if len(outputs) == 1:
-			if isinstance(outputs[0], list):
-				outputs = outputs[0]
-		self.outputs['Isovist'].sv_set(outputs)
+		sockets = ['Isovist', 'Area', 'Perimeter', 'Compactness']
+		columns = [[r[0] for r in results]]+[[r[1][i] for r in results] for i in range(3)]
+		for socketName, outputs in zip(sockets, columns):
+			if self.Replication == "Interlace":
+				outputs = Replication.re_interlace(outputs, inputs_flat)
+			else:
+				match_list = Replication.best_match(inputs_nested, inputs_flat, self.Replication)
+				outputs = Replication.unflatten(outputs, match_list)
+			if len(outputs) == 1:
+				if isinstance(outputs[0], list):
+					outputs = outputs[0]
+			self.outputs[socketName].sv_set(outputs)
 
 def register():
 	bpy.utils.register_class(SvWireIsovist)
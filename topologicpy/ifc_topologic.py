@@ -1,26 +1,145 @@
-
 import ifcopenshell
 from . import topologic_lib
 import topologic
 import numpy as np
 import math
+import os
+import hashlib
+import tempfile
+import weakref
+from collections import OrderedDict
 
-def getIfcSettings():
-  settings = ifcopenshell.geom.settings()
-  settings.set(settings.USE_BREP_DATA, True)
-  settings.set(settings.SEW_SHELLS, True)
-  settings.set(settings.USE_WORLD_COORDS, True)
-  settings.set(settings.DISABLE_OPENING_SUBTRACTIONS, True)
-
-  return settings
+settingOptions = ["USE_BREP_DATA", "SEW_SHELLS", "USE_WORLD_COORDS", "DISABLE_OPENING_SUBTRACTIONS"]
+sharedSettings = None
 
-def getIfcProductTopology(product):
-  shape = ifcopenshell.geom.create_shape(getIfcSettings(), product)
-  brepString = shape.geometry.brep_data
+def getIfcSettings():
+  global sharedSettings
+  if sharedSettings is None:
+    settings = ifcopenshell.geom.settings()
+    settings.set(settings.USE_BREP_DATA, True)
+    settings.set(settings.SEW_SHELLS, True)
+    settings.set(settings.USE_WORLD_COORDS, True)
+    settings.set(settings.DISABLE_OPENING_SUBTRACTIONS, True)
+    sharedSettings = settings
+
+  return sharedSettings
+
+def settingsFingerprint(settings):
+  return ";".join([name + "=" + str(settings.get(getattr(settings, name))) for name in settingOptions])
+
+def geometryFingerprint(ifc_file, product):
+  """
+  Returns the SHA-1 of the STEP records of the product's representation and placement chain, so
+  any edit to its coordinates, shape or placement gives a new fingerprint.
+  """
+  digest = hashlib.sha1(str(product.GlobalId).encode("utf-8"))
+  for attribute in ["ObjectPlacement", "Representation"]:
+    root = getattr(product, attribute, None)
+    if root is None:
+      continue
+    for entity in ifc_file.traverse(root):
+      digest.update(str(entity).encode("utf-8"))
+  return digest.hexdigest()
+
+class ShapeCache:
+  """
+  LRU memo of the product geometry of one open IFC file, keyed by GlobalId, geometry fingerprint
+  and settings fingerprint. Each entry holds the BREP string and, once built, the Cell. Every
+  caller gets its own deep copy of the Cell, so the dictionaries they set never leak into the
+  cache. With a directory the BREP strings are also written to disk and read back across sessions.
+  """
+  def __init__(self, ifc_file, maxItems=4096, directory=None):
+    self.ifc_file = weakref.ref(ifc_file)
+    self.maxItems = maxItems
+    self.directory = directory
+    self.shapes = OrderedDict()
+    self.hits = 0
+    self.misses = 0
+
+  def key(self, product, settings):
+    return (product.GlobalId, geometryFingerprint(self.ifc_file(), product), settingsFingerprint(settings))
+
+  def path(self, key):
+    return os.path.join(self.directory, hashlib.sha1(repr(key).encode("utf-8")).hexdigest() + ".brep")
+
+  def write(self, path, brepString):
+    os.makedirs(self.directory, exist_ok=True)
+    handle, temp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+    try:
+      with os.fdopen(handle, "w") as f:
+        f.write(brepString)
+      os.replace(temp_path, path)
+    except:
+      if os.path.exists(temp_path):
+        os.remove(temp_path)
+      raise
+
+  def entry(self, product, settings):
+    key = self.key(product, settings)
+    entry = self.shapes.get(key)
+    if entry is not None:
+      self.shapes.move_to_end(key)
+      self.hits += 1
+      return entry
+    self.misses += 1
+    brepString = None
+    if self.directory is not None and os.path.exists(self.path(key)):
+      with open(self.path(key), "r") as f:
+        brepString = f.read()
+    if brepString is None:
+      brepString = ifcopenshell.geom.create_shape(settings, product).geometry.brep_data
+      if self.directory is not None:
+        self.write(self.path(key), brepString)
+    entry = {"brep": brepString, "cell": None}
+    self.shapes[key] = entry
+    while len(self.shapes) > self.maxItems:
+      self.shapes.popitem(last=False)
+    return entry
+
+  def brep(self, product, settings):
+    return self.entry(product, settings)["brep"]
+
+  def cell(self, product, settings):
+    entry = self.entry(product, settings)
+    if entry["cell"] is None:
+      topology = topologic.Topology.ByString(entry["brep"])
+      faces = topologic_lib.getSubTopologies(topology, topologic.Face)
+      entry["cell"] = topologic.Cell.ByFaces(faces, 1e-4)
+    return topologic.Topology.DeepCopy(entry["cell"])
+
+  def invalidate(self, product=None):
+    if product is None:
+      self.shapes.clear()
+      return
+    for key in [key for key in self.shapes if key[0] == product.GlobalId]:
+      del self.shapes[key]
+
+  def stats(self):
+    return {"hits": self.hits, "misses": self.misses, "entries": len(self.shapes)}
+
+# One shape cache per open IFC file, dropped with the file. Set shapeCacheDirectory to also keep
+# the BREP strings on disk.
+shapeCaches = weakref.WeakKeyDictionary()
+shapeCacheDirectory = None
+
+def getShapeCache(ifc_file):
+  cache = shapeCaches.get(ifc_file)
+  if cache is None:
+    cache = ShapeCache(ifc_file, directory=shapeCacheDirectory)
+    shapeCaches[ifc_file] = cache
+  return cache
+
+def getIfcProductTopology(product, ifc_file=None):
+  if ifc_file is None:
+    brepString = ifcopenshell.geom.create_shape(getIfcSettings(), product).geometry.brep_data
+  else:
+    brepString = getShapeCache(ifc_file).brep(product, getIfcSettings())
 
   return topologic.Topology.ByString(brepString)
 
-def getIfcProductCell(product):
+def getIfcProductCell(product, ifc_file=None):
+  if ifc_file is not None:
+    return getShapeCache(ifc_file).cell(product, getIfcSettings())
   topology = getIfcProductTopology(product)
   faces = topologic_lib.getSubTopologies(topology, topologic.Face)
 
@@ -88,19 +207,17 @@ def getFacesStorey(faces, ifc_file):
   return ifc_faces_storey
 
 def assignRepresentation(topology, ifc_file, ifc_product):
-  vs, fs = topologic_lib.meshData(topology)
+  vs, connectivity, offsets = topologic_lib.meshData(topology, as_arrays=True)
   if ifc_product.is_a("IfcSpace"):
-    o, z = None, None
-    for v in vs:
-      if z is None or v[-1] < z:
-        o, z = v, v[-1]
+    o = vs[np.argmin(vs[:,-1])]
     product_matrix = ifcopenshell.util.placement.a2p(o, np.array([0,0,1]), np.array([1,0,0]))
     ifcopenshell.api.run("geometry.edit_object_placement", ifc_file, product=ifc_product, matrix=product_matrix)
   else:
     product_matrix = ifcopenshell.util.placement.get_local_placement(ifc_product.ObjectPlacement)
 
-  point_list = ifc_file.createIfcCartesianPointList3D([ np.linalg.solve(product_matrix, np.append(v,1))[:-1].tolist() for v in vs ])
-  indexed_faces = [ ifc_file.createIfcIndexedPolygonalFace([ index + 1 for index in f]) for f in fs ]
+  local_vs = np.linalg.solve(product_matrix, np.hstack([vs, np.ones((len(vs), 1))]).T).T[:,:-1]
+  point_list = ifc_file.createIfcCartesianPointList3D(local_vs.tolist())
+  indexed_faces = [ ifc_file.createIfcIndexedPolygonalFace((f + 1).tolist()) for f in topologic_lib.splitFaces(connectivity, offsets) ]
   representation = ifc_file.createIfcPolygonalFaceSet(point_list, None, indexed_faces, None)
   body_context = next((item  for item  in ifc_file.by_type("IfcGeometricRepresentationSubContext") if item.ContextIdentifier == "Body"), None)
   shape = ifc_file.createIfcShapeRepresentation(body_context, body_context.ContextIdentifier, "Tessellation", [representation])
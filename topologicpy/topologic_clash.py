@@ -0,0 +1,175 @@
+import topologic
+import numpy as np
+import hashlib
+import time
+from collections import OrderedDict
+from . import topologic_lib
+from . import DictionaryTransfer
+
+# Clash detection between building element cells in two phases. The broad phase sweeps the
+# element bounding boxes along X (sweep and prune) and keeps the pairs whose boxes also overlap in
+# Y and Z. The narrow phase intersects only those pairs in OCCT and reports the clash volume.
+# Narrow phase clash volumes are remembered per pair of BREP hashes, so re-checking a model only
+# intersects the pairs in which at least one element changed geometry. The intersection topologies
+# are not kept: those of reused clashing pairs are recomputed when they are asked for.
+
+def elementKey(cell):
+  return hashlib.sha1(cell.String().encode("utf-8")).hexdigest()
+
+def elementBoxes(cells, tolerance):
+  """
+  Returns [boxes, unboxed] where boxes is an (N, 6) array of [minX, minY, minZ, maxX, maxY, maxZ]
+  and unboxed lists the cells that cannot be safely boxed (curved edges). Those rows hold NaN.
+  """
+  boxes = np.full((len(cells), 6), np.nan)
+  unboxed = []
+  for i, cell in enumerate(cells):
+    box = DictionaryTransfer.boundingBox(cell, tolerance)
+    if box is None:
+      unboxed.append(i)
+    else:
+      boxes[i] = box
+  return [boxes, unboxed]
+
+def overlappingPairs(boxes, unboxed=[], chunkSize=4096):
+  """
+  Returns an (M, 2) array of index pairs (i < j) whose boxes overlap, sorted lexicographically.
+  Every unboxed index is paired with every other index.
+  """
+  boxed = np.setdiff1d(np.arange(len(boxes)), unboxed)
+  order = boxed[np.argsort(boxes[boxed, 0], kind="stable")]
+  b = boxes[order]
+  n = len(order)
+  # In X sorted order, the boxes overlapping box k in X are k+1 .. ends[k]-1
+  ends = np.searchsorted(b[:, 0], b[:, 3], side="right")
+  counts = np.maximum(ends - np.arange(n) - 1, 0)
+  found = []
+  for start in range(0, n, chunkSize):
+    c = counts[start:start+chunkSize]
+    total = int(c.sum())
+    if total == 0:
+      continue
+    i = np.repeat(np.arange(start, start+len(c)), c)
+    j = i + 1 + np.arange(total) - np.repeat(np.cumsum(c) - c, c)
+    keep = (b[i, 1] <= b[j, 4]) & (b[j, 1] <= b[i, 4]) & (b[i, 2] <= b[j, 5]) & (b[j, 2] <= b[i, 5])
+    found.append(np.stack([order[i[keep]], order[j[keep]]], axis=1))
+  for u in unboxed:
+    others = np.setdiff1d(np.arange(len(boxes)), [u])
+    found.append(np.stack([np.full(len(others), u), others], axis=1))
+  if len(found) == 0:
+    return np.zeros((0, 2), dtype=np.int64)
+  pairs = np.sort(np.concatenate(found), axis=1)
+  return np.unique(pairs, axis=0)
+
+def clashVolume(cellA, cellB):
+  """
+  Returns [volume, intersection] of the two cells. Cells that only touch have a zero volume.
+  """
+  intersection = topologic_lib.boolean(cellA, cellB, "Intersect")
+  if intersection is None:
+    return [0.0, None]
+  if intersection.Type() == topologic.Cell.Type():
+    cells = [intersection]
+  else:
+    cells = topologic_lib.getSubTopologies(intersection, topologic.Cell)
+  volume = float(sum(abs(topologic.CellUtility.Volume(cell)) for cell in cells))
+  if len(cells) == 0:
+    return [volume, None]
+  return [volume, intersection]
+
+class ClashEngine:
+  """
+  Session memo of narrow phase clash volumes keyed by the sorted pair of element BREP hashes, with
+  an LRU bound of maxPairs entries. Only the volume is stored, so the memo holds no OCCT topology.
+  """
+  def __init__(self, maxPairs=100000):
+    self.maxPairs = maxPairs
+    self.pairs = OrderedDict()
+    self.keys = set()
+
+  def pairResult(self, keyA, keyB, cellA, cellB):
+    """
+    Returns [volume, intersection, cached]. intersection is None when the volume comes from the memo.
+    """
+    key = (keyA, keyB) if keyA <= keyB else (keyB, keyA)
+    volume = self.pairs.get(key)
+    if volume is not None:
+      self.pairs.move_to_end(key)
+      return [volume, None, True]
+    volume, intersection = clashVolume(cellA, cellB)
+    self.pairs[key] = volume
+    while len(self.pairs) > self.maxPairs:
+      self.pairs.popitem(last=False)
+    return [volume, intersection, False]
+
+  def check(self, cells, tolerance=1e-4, volumeTolerance=1e-6, intersections=True):
+    """
+    Returns [clashes, stats]. clashes lists [i, j, volume, intersection] for the element pairs
+    whose intersection volume exceeds volumeTolerance. With intersections set to False the
+    intersection is None; otherwise the intersections of reused pairs are recomputed. stats
+    reports the pair counts and the time spent in each phase.
+    """
+    start = time.time()
+    keys = [elementKey(cell) for cell in cells]
+    boxes, unboxed = elementBoxes(cells, tolerance)
+    candidates = overlappingPairs(boxes, unboxed)
+    broadPhase = time.time()
+    clashes = []
+    reused = 0
+    recomputed = 0
+    for i, j in candidates.tolist():
+      volume, intersection, cached = self.pairResult(keys[i], keys[j], cells[i], cells[j])
+      if cached:
+        reused += 1
+      if volume > volumeTolerance:
+        if not intersections:
+          intersection = None
+        elif cached:
+          intersection = clashVolume(cells[i], cells[j])[1]
+          recomputed += 1
+        clashes.append([i, j, volume, intersection])
+    end = time.time()
+    stats = {
+      "elements": len(cells),
+      "changedElements": len([key for key in keys if key not in self.keys]),
+      "unboxedElements": len(unboxed),
+      "candidatePairs": len(candidates),
+      "testedPairs": len(candidates) - reused,
+      "reusedPairs": reused,
+      "recomputedIntersections": recomputed,
+      "clashes": len(clashes),
+      "broadPhaseTime": broadPhase - start,
+      "narrowPhaseTime": end - broadPhase,
+      "totalTime": end - start,
+    }
+    self.keys = set(keys)
+    return [clashes, stats]
+
+  def clear(self):
+    self.pairs.clear()
+    self.keys = set()
+
+session = ClashEngine()
+
+def elementGrid(boxes, unboxed):
+  """
+  Returns [grid, wide]: a uniform grid of the element boxes and the indices that are tested for
+  every query instead (unboxed elements and boxes spanning too many grid cells).
+  """
+  boxList = [None if np.isnan(box[0]) else box.tolist() for box in boxes]
+  grid = DictionaryTransfer.UniformGrid(DictionaryTransfer.cellSizeFromBoxes(boxList))
+  wide = set(unboxed)
+  for i, box in enumerate(boxList):
+    if box is None or grid.cellCount(box) > 64:
+      wide.add(i)
+    else:
+      grid.insertBox(i, box)
+  return [grid, wide]
+
+def containingElements(cells, boxes, grid, wide, vertex, tolerance=1e-4):
+  """
+  Returns the cells that contain the input vertex, testing only those whose box contains it.
+  """
+  point = [vertex.X(), vertex.Y(), vertex.Z()]
+  candidates = sorted(wide.union(grid.queryPoint(point)))
+  return [cells[i] for i in candidates if (np.isnan(boxes[i][0]) or DictionaryTransfer.pointInBox(point, boxes[i])) and topologic.CellUtility.Contains(cells[i], vertex, tolerance) == 0]
@@ -80,22 +80,33 @@ def removeCollinearEdges(wire, angTol):
 
   return vertices_to_keep
 
-def meshData(topology):
+def meshData(topology, as_arrays=False):
   vertices = []
   faces = []
+  connectivity = []
+  offsets = [0]
   if topology is None:
+    if as_arrays:
+      return [np.zeros((0, 3), dtype=np.float64), np.zeros(0, dtype=np.int32), np.zeros(1, dtype=np.int32)]
     return [vertices, faces]
 
+  lookup = {}
+  def vertexIndex(aVertex):
+    coords = tuple([aVertex.X(), aVertex.Y(), aVertex.Z()])
+    index = lookup.get(coords)
+    if index is None:
+      index = len(vertices)
+      vertices.append(coords)
+      lookup[coords] = index
+    return index
+
   topVerts = []
   if (topology.Type() == 1): #input is a vertex, just add it and process it
     topVerts.append(topology)
   else:
     _ = topology.Vertices(None, topVerts)
   for aVertex in topVerts:
-    try:
-      vertices.index(tuple([aVertex.X(), aVertex.Y(), aVertex.Z()])) # Vertex already in list
-    except:
-      vertices.append(tuple([aVertex.X(), aVertex.Y(), aVertex.Z()])) # Vertex not in list, add it.
+    _ = vertexIndex(aVertex)
 
   topFaces = []
   if (topology.Type() == 8): # Input is a Face, just add it and process it
@@ -115,14 +126,7 @@ def meshData(topology):
       wires.append(aFace.ExternalBoundary())
 
     for wire in wires:
-      f = []
-      for aVertex in removeCollinearEdges(wire, 0.1):
-        try:
-          fVertexIndex = vertices.index(tuple([aVertex.X(), aVertex.Y(), aVertex.Z()]))
-        except:
-          vertices.append(tuple([aVertex.X(), aVertex.Y(), aVertex.Z()]))
-          fVertexIndex = len(vertices)-1
-        f.append(fVertexIndex)
+      f = [vertexIndex(aVertex) for aVertex in removeCollinearEdges(wire, 0.1)]
 
       if len(f) < 3:
         continue
@@ -134,10 +138,22 @@ def meshData(topology):
       if (np.cross(u, v) @ [normal[0], normal[1], normal[2]]) + 1 < 1e-6:
         f.reverse()
 
-      faces.append(tuple(f))
+      if as_arrays:
+        connectivity.extend(f)
+        offsets.append(len(connectivity))
+      else:
+        faces.append(tuple(f))
 
+  if as_arrays:
+    points = np.array(vertices, dtype=np.float64).reshape(-1, 3)
+    return [points, np.array(connectivity, dtype=np.int32), np.array(offsets, dtype=np.int32)]
   return [vertices, faces]
 
+def splitFaces(connectivity, offsets):
+  if len(offsets) < 2:
+    return []
+  return np.split(connectivity, offsets[1:-1])
+
 def projectFace(face, other_face):
   normal = topologic.FaceUtility.NormalAtParameters(face, 0.5, 0.5)
   n = [normal[0], normal[1], normal[2]]
@@ -161,4 +177,57 @@ def projectFace(face, other_face):
   if not top_space_boundary:
     return [None, None]
 
-  return [dist, top_space_boundary[0]]
\ No newline at end of file
+  return [dist, top_space_boundary[0]]
+
+def faceFrames(faces):
+  """
+  Returns [normals, offsets, bases, points, centers] for the input faces: the normal and the center
+  point at parameters (0.5, 0.5) as used by projectFace, the plane offset n.p, an orthonormal
+  in-plane basis per face and the vertex coordinate arrays (None for faces with curved edges).
+  """
+  normals = np.zeros((len(faces), 3))
+  centers = np.zeros((len(faces), 3))
+  points = []
+  for i, face in enumerate(faces):
+    normal = topologic.FaceUtility.NormalAtParameters(face, 0.5, 0.5)
+    normals[i] = [normal[0], normal[1], normal[2]]
+    center = topologic.FaceUtility.VertexAtParameters(face, 0.5, 0.5)
+    centers[i] = [center.X(), center.Y(), center.Z()]
+    edges = getSubTopologies(face, topologic.Edge)
+    if all(abs(topologic.EdgeUtility.Length(e) - topologic.VertexUtility.Distance(e.StartVertex(), e.EndVertex())) <= 1e-6 for e in edges):
+      points.append(np.array([[v.X(), v.Y(), v.Z()] for v in getSubTopologies(face, topologic.Vertex)]).reshape(-1, 3))
+    else:
+      points.append(None)
+  offsets = np.einsum("ij,ij->i", normals, centers)
+  helper = np.where(np.abs(normals[:, :1]) < 0.9, [[1.0, 0.0, 0.0]], [[0.0, 1.0, 0.0]])
+  u = np.cross(normals, helper)
+  u /= np.maximum(np.linalg.norm(u, axis=1), 1e-12)[:, None]
+  v = np.cross(normals, u)
+  return [normals, offsets, np.stack([u, v], axis=2), points, centers]
+
+def projectionCandidates(frames, other_frames=None, tolerance=1e-6, padding=1e-4):
+  """
+  Returns, for every face of frames, the indices of the faces of other_frames (or of the later
+  faces of frames itself) that can give projectFace a result: anti-parallel normals, a positive
+  plane distance and overlapping bounding boxes once projected onto the plane of the face.
+  """
+  normals, offsets, bases, points, centers = frames
+  same = other_frames is None
+  other_normals, other_offsets, other_bases, other_points, other_centers = frames if same else other_frames
+  antiparallel = normals @ other_normals.T + 1 <= tolerance + 1e-9
+  dists = offsets[:, None] - normals @ other_centers.T
+  keep = antiparallel & (dists >= tolerance - 1e-9)
+  if same:
+    keep &= np.triu(np.ones(keep.shape, dtype=bool), 1)
+  candidates = []
+  for i in range(len(normals)):
+    found = []
+    for j in np.nonzero(keep[i])[0].tolist():
+      if points[i] is not None and other_points[j] is not None and len(points[i]) > 0 and len(other_points[j]) > 0:
+        a = points[i] @ bases[i]
+        b = other_points[j] @ bases[i]
+        if np.any(a.min(axis=0) > b.max(axis=0) + padding) or np.any(b.min(axis=0) > a.max(axis=0) + padding):
+          continue
+      found.append(j)
+    candidates.append(found)
+  return candidates